@@ -6,18 +6,68 @@ This module scans a user's PUBLIC activity feed (Push Events) to extract
 code patches and analyze them for technical skills.
 """
 
+import io
 import os
-from typing import Optional, Dict, Any, List
+import re
+import json
+import atexit
+import logging
+import asyncio
+import itertools
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, Tuple
+import httpx
 from dotenv import load_dotenv
-from github import Github
 
 # --- LANGCHAIN IMPORTS ---
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.runnables import Runnable, RunnableLambda
 
 load_dotenv()
 
+logger = logging.getLogger("GitHubWatchdog")
+
+# Credentials are resolved once at import; call reload_env() after changing them
+_GITHUB_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
+_GEMINI_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+
+
+def reload_env() -> None:
+    """Re-reads GITHUB_ACCESS_TOKEN and GEMINI_API_KEY (e.g. after a .env hot-reload)."""
+    global _GITHUB_TOKEN, _GEMINI_KEY, _analysis_chain
+    load_dotenv(override=True)
+    _GITHUB_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
+    _GEMINI_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+    _analysis_chain = None  # Rebuilt with the new keys on next use
+    # _gh() replaces the GitHub client once it sees the new token
+
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_RAW_URL = "https://raw.githubusercontent.com"
+_GH_URL_RE = re.compile(r"^(?:https?://)?(?:www\.)?github\.com/([A-Za-z0-9-]+)")
+NULL_SHA = "0" * 40  # PushEvent "before" for a newly created branch
+# Fallbacks for pulling the skills JSON out of a chatty LLM reply
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_SKILLS_JSON_RE = re.compile(r'\{[^{}]*"detected_skills"\s*:\s*\[.*?\]\s*\}', re.DOTALL)
+# Header _commit_context_parts puts on each file section of a code context
+_REPO_HEADER_RE = re.compile(r"^--- REPO: (.+?) \| FILE: ", re.MULTILINE)
+# Failures an API call can legitimately raise (transport/status, missing or malformed JSON)
+_GITHUB_ERRORS = (httpx.HTTPError, KeyError, IndexError, ValueError)
+
+# === LIMITS TO PREVENT EXCESSIVE LLM COSTS ===
+CONTEXT_BUDGET = 15000        # Max analysis context size (~15KB, ~4000 tokens)
+MAX_COMMITS_PER_REPO = 3      # Only analyze 3 most recent commits per repo
+MAX_FILES_PER_COMMIT = 5      # Only analyze 5 files per commit
+MAX_PATCH_SIZE = 1500         # Max chars per file patch
+MAX_CONCURRENT_FETCHES = 10   # Bound parallel commit fetches to respect rate limits
+MAX_CONCURRENT_ANALYSES = 8   # Parallel Gemini requests per batch
+
+# Manifests scanned by the repo-URL analysis; only their head is ever analyzed
+DEPENDENCY_FILES = ("requirements.txt", "environment.yml", "package.json", "pyproject.toml", "go.mod")
+DEPENDENCY_HEAD_BYTES = 3000
+
 # File extensions we care about for skill analysis
 CODE_EXTENSIONS = (
     '.py', '.js', '.ts', '.tsx', '.jsx',
@@ -28,263 +78,751 @@ CODE_EXTENSIONS = (
     '.sh', '.bash', '.zsh',
     '.ipynb', '.md'
 )
+# Bare lowercase extensions for O(1) membership checks inside the patch loops
+_CODE_EXT_SET = frozenset(e.lstrip(".") for e in CODE_EXTENSIONS)
 
+# Files whose added lines are reduced to declarations (imports, functions, classes)
+DECLARATION_EXTENSIONS = frozenset(('py', 'js', 'ts', 'tsx', 'jsx'))
+_DECLARATION_RE = re.compile(
+    r"\s*(?:"
+    r"import\s|from\s+\S+\s+import\s|(?:async\s+)?def\s|class\s|@\w"
+    r"|(?:export\s+)?(?:default\s+)?(?:async\s+)?function\b"
+    r"|export\s|interface\s|type\s+\w+\s*="
+    r"|(?:const|let|var)\s+\w+\s*=\s*(?:async\s*)?(?:\([^)]*\)|\w+)\s*=>"
+    r"|(?:const|let|var)\s+[^=]+=\s*require\("
+    r")"
+)
 
-def fetch_user_recent_activity(github_username: str, max_events: int = 10) -> Optional[Dict[str, Any]]:
+
+def _file_ext(filename: str) -> str:
+    """Returns the lowercase extension of a filename without the dot."""
+    return filename.rpartition(".")[2].lower()
+
+
+def _is_code(filename: str) -> bool:
+    """True if the file has one of the CODE_EXTENSIONS we analyze."""
+    return _file_ext(filename) in _CODE_EXT_SET
+
+
+# Conditional-request state for SHA polling, keyed by GitHub username
+_etag_cache: Dict[str, str] = {}
+_sha_cache: Dict[str, Optional[str]] = {}
+
+# Event pages fetched in parallel per scan, with per-page ETag revalidation.
+# A scan reads at most EVENT_SCAN_FACTOR * max_events events.
+EVENT_SCAN_FACTOR = 3
+MAX_EVENTS_PER_PAGE = 100  # GitHub's per_page ceiling
+_page_etags: Dict[Tuple[str, int, int], str] = {}
+_page_events: Dict[Tuple[str, int, int], List[Dict[str, Any]]] = {}
+
+# Conditional-request state for the legacy repo-URL path, keyed by "owner/repo":
+# commit-listing ETag and the analysis produced for that listing
+_repo_etags: Dict[str, str] = {}
+_repo_analyses: Dict[str, Dict[str, Any]] = {}
+
+# LRU of commit/push (filename, patch) pairs keyed by (repo_name, sha or "before...head")
+COMMIT_CACHE_SIZE = 256
+_commit_files_cache: "OrderedDict[Tuple[str, str], Tuple[Tuple[str, Optional[str]], ...]]" = OrderedDict()
+
+# Last scanned head SHA and its activity result per username, persisted across restarts
+WATCHDOG_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "erflog", "watchdog.json")
+_last_seen: Dict[str, str] = {}
+_last_result: Dict[str, Dict[str, Any]] = {}
+
+
+def _load_watchdog_cache() -> None:
+    """Restores the last-seen SHA cache written by a previous process."""
+    try:
+        with open(WATCHDOG_CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        _last_seen.update(data.get("last_seen", {}))
+        _last_result.update(data.get("results", {}))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning("⚠️ Could not load watchdog cache: %s", e)
+
+
+def _save_watchdog_cache() -> None:
+    """
+    Writes the last-seen SHA cache to disk (registered with atexit).
+
+    Every uvicorn worker runs this at exit, so this process's entries are
+    merged over whatever the file holds now (other workers' users survive)
+    and written to a per-process temp file that os.replace swaps in
+    atomically - a reader or a concurrent writer never sees a partial file.
+    """
+    if not _last_seen:
+        return
+    last_seen: Dict[str, str] = {}
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        with open(WATCHDOG_CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        last_seen.update(data.get("last_seen", {}))
+        results.update(data.get("results", {}))
+    except (OSError, ValueError):
+        pass
+    last_seen.update(_last_seen)
+    results.update(_last_result)
+
+    tmp_path = f"{WATCHDOG_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(WATCHDOG_CACHE_PATH), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"last_seen": last_seen, "results": results}, f)
+        os.replace(tmp_path, WATCHDOG_CACHE_PATH)
+    except OSError as e:
+        logger.warning("⚠️ Could not save watchdog cache: %s", e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+_load_watchdog_cache()
+atexit.register(_save_watchdog_cache)
+
+
+async def _fetch_commit(
+    client: httpx.AsyncClient,
+    repo_name: str,
+    ref: str,
+    semaphore: asyncio.Semaphore
+) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Fetches the (filename, patch) pairs of a single commit SHA, or of a
+    whole push when ref is a "before...head" range (compare endpoint).
+    
+    Commits are immutable, so results are memoized by (repo, ref) and
+    repeat polls over the same pushes never hit the network again.
+    """
+    key = (repo_name, ref)
+    if key in _commit_files_cache:
+        _commit_files_cache.move_to_end(key)
+        return _commit_files_cache[key]
+    
+    endpoint = "compare" if "..." in ref else "commits"
+    async with semaphore:
+        resp = await client.get(f"/repos/{repo_name}/{endpoint}/{ref}")
+        resp.raise_for_status()
+    
+    files = tuple((f.get("filename", ""), f.get("patch")) for f in resp.json().get("files", []))
+    _commit_files_cache[key] = files
+    if len(_commit_files_cache) > COMMIT_CACHE_SIZE:
+        _commit_files_cache.popitem(last=False)
+    return files
+
+
+def _condense_patch(filename: str, patch: str, limit: int) -> str:
+    """
+    Shrinks a unified diff to its highest-signal lines.
+    
+    For Python/JS/TS files only added import, function and class
+    declarations are kept; other files keep the added lines of their
+    first hunk. Falls back to the raw patch head if nothing was added.
+    """
+    hunks = []
+    for line in patch.splitlines():
+        if line.startswith("@@"):
+            hunks.append([])
+        elif hunks and line.startswith("+") and not line.startswith("+++"):
+            hunks[-1].append(line[1:])
+    
+    if _file_ext(filename) in DECLARATION_EXTENSIONS:
+        declarations = [line for hunk in hunks for line in hunk if _DECLARATION_RE.match(line)]
+        if declarations:
+            return "\n".join(declarations)[:limit]
+    
+    first_hunk = next((hunk for hunk in hunks if hunk), None)
+    if first_hunk:
+        return "\n".join(first_hunk)[:limit]
+    return patch[:limit]
+
+
+def _commit_context_parts(
+    repo_name: str,
+    commit_message: str,
+    files: Tuple[Tuple[str, Optional[str]], ...],
+    max_files: int,
+    max_patch_size: int
+) -> List[Tuple[str, str]]:
+    """Formats up to max_files code files of one commit as (filename, text) context parts."""
+    parts = []
+    for filename, patch in files:
+        if len(parts) >= max_files:
+            break
+            
+        # Filter by code file extensions
+        if not _is_code(filename):
+            continue
+            
+        # Get the patch (diff), condensed to its declarations
+        if patch:
+            parts.append((filename, (
+                f"--- REPO: {repo_name} | FILE: {filename} ---\n"
+                f"Commit: {commit_message[:100]}\n"
+                f"Patch:\n{_condense_patch(filename, patch, max_patch_size)}"
+            )))
+        elif _file_ext(filename) == "ipynb":
+            parts.append((filename, (
+                f"--- REPO: {repo_name} | FILE: {filename} ---\n"
+                f"Jupyter Notebook updated in commit: {commit_message[:100]}"
+            )))
+    return parts
+
+
+def _rank_and_pack_patches(context_parts: List[Tuple[str, str]], budget: int = CONTEXT_BUDGET) -> str:
+    """
+    Greedily packs (filename, text) parts under a character budget and
+    returns them joined by blank lines ("" if nothing fits).
+    
+    Parts arrive newest first. The first file of each type is preferred
+    over repeats of a type already seen, so the budget covers as many
+    distinct technologies as possible; recency breaks ties.
+    """
+    seen_per_ext: Dict[str, int] = {}
+    ranked = []
+    for recency, (filename, text) in enumerate(context_parts):
+        ext = _file_ext(filename)
+        ranked.append((seen_per_ext.get(ext, 0), recency, text))
+        seen_per_ext[ext] = seen_per_ext.get(ext, 0) + 1
+    ranked.sort()
+    
+    # Write straight into one buffer instead of joining a second copy
+    buf = io.StringIO()
+    for _, _, text in ranked:
+        separator = "\n\n" if buf.tell() else ""
+        if buf.tell() + len(separator) + len(text) > budget:
+            continue
+        buf.write(separator)
+        buf.write(text)
+    return buf.getvalue()
+
+
+async def _build_code_context(
+    client: httpx.AsyncClient,
+    targets: List[Tuple[str, str, str, str]]
+) -> str:
+    """
+    Fetches file patches for (repo, ref, message, sha) targets in concurrent
+    waves, newest first, stopping as soon as the context budget is filled,
+    and packs the best patches into one analysis context.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    context_parts = []
+    total_chars = 0
+    
+    for start in range(0, len(targets), MAX_CONCURRENT_FETCHES):
+        if total_chars >= CONTEXT_BUDGET:
+            logger.info("📊 Context budget reached (%d chars), skipping %d commits", total_chars, len(targets) - start)
+            break
+        
+        wave = targets[start:start + MAX_CONCURRENT_FETCHES]
+        results = await asyncio.gather(
+            *[_fetch_commit(client, repo_name, ref, semaphore) for repo_name, ref, _, _ in wave],
+            return_exceptions=True
+        )
+        
+        for (repo_name, ref, commit_message, commit_sha), full_commit in zip(wave, results):
+            if isinstance(full_commit, Exception):
+                # Some commits might be in private repos or deleted
+                logger.warning("⚠️ Could not fetch commit %s: %s", commit_sha[:7], full_commit)
+                continue
+            
+            # A compare range covers a whole push, so it gets the per-push file allowance
+            max_files = MAX_FILES_PER_COMMIT * (MAX_COMMITS_PER_REPO if "..." in ref else 1)
+            for part in _commit_context_parts(
+                repo_name, commit_message, full_commit, max_files, MAX_PATCH_SIZE
+            ):
+                context_parts.append(part)
+                total_chars += len(part[1])
+    
+    # Combine the best patches into analysis context
+    return _rank_and_pack_patches(context_parts, CONTEXT_BUDGET)
+
+
+async def _fetch_events_page(
+    client: httpx.AsyncClient,
+    github_username: str,
+    page: int,
+    per_page: int
+) -> List[Dict[str, Any]]:
+    """
+    Fetches one page of a user's public events, revalidating with the
+    page's last ETag so an unchanged page costs a bodiless 304.
+    """
+    key = (github_username, page, per_page)
+    headers = {"If-None-Match": _page_etags[key]} if key in _page_events else {}
+    
+    resp = await client.get(
+        f"/users/{github_username}/events/public",
+        params={"page": page, "per_page": per_page},
+        headers=headers
+    )
+    if resp.status_code == 304:
+        return _page_events[key]
+    resp.raise_for_status()
+    
+    events = resp.json()
+    etag = resp.headers.get("ETag")
+    if etag:
+        _page_etags[key] = etag
+        _page_events[key] = events
+    return events
+
+
+# Keep-alive pool for GitHub: httpx keeps only 20 idle connections for 5s by default,
+# shorter than a scan's gaps between waves, and a wave fans out MAX_CONCURRENT_FETCHES requests
+GITHUB_LIMITS = httpx.Limits(max_connections=128, max_keepalive_connections=64, keepalive_expiry=60)
+
+
+def _github_client(token: str) -> httpx.AsyncClient:
+    """Builds an async GitHub REST client (HTTP/2, GITHUB_LIMITS keep-alive pool, connect retries)."""
+    return httpx.AsyncClient(
+        base_url=GITHUB_API_URL,
+        headers={
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github+json"
+        },
+        transport=httpx.AsyncHTTPTransport(http2=True, retries=3, limits=GITHUB_LIMITS),
+        timeout=10
+    )
+
+
+# One GitHub client per process, rebuilt if the event loop or token changes
+_shared_client: Optional[httpx.AsyncClient] = None
+_shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_shared_client_token: Optional[str] = None
+_closing: set = set()  # aclose() tasks of replaced clients, referenced until done
+
+
+def _gh() -> httpx.AsyncClient:
+    """
+    Returns the module-wide GitHub client, so keep-alive connections and
+    retry settings are shared by every poll on the server's event loop.
+    
+    An httpx client is bound to the loop it first ran on, so a new one is
+    built when called from another loop or after reload_env(); a replaced
+    client still open on this loop is closed in the background. The sync
+    wrappers don't use it - they run on a scoped client (_run_scoped).
+    """
+    global _shared_client, _shared_client_loop, _shared_client_token
+    loop = asyncio.get_running_loop()
+    if (_shared_client is None or _shared_client.is_closed
+            or _shared_client_loop is not loop or _shared_client_token != _GITHUB_TOKEN):
+        stale = _shared_client
+        if stale is not None and not stale.is_closed and _shared_client_loop is loop:
+            task = loop.create_task(stale.aclose())
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+        _shared_client = _github_client(_GITHUB_TOKEN)
+        _shared_client_loop = loop
+        _shared_client_token = _GITHUB_TOKEN
+    return _shared_client
+
+
+def _run_scoped(coro_fn, *args, **kwargs):
+    """
+    Runs coro_fn(*args, client=..., **kwargs) in a fresh event loop on a
+    GitHub client opened and closed with it, for the sync wrappers (a client
+    cannot outlive the asyncio.run() loop it was used on).
+    """
+    async def run():
+        async with _github_client(_GITHUB_TOKEN) as client:
+            return await coro_fn(*args, client=client, **kwargs)
+    return asyncio.run(run())
+
+
+@asynccontextmanager
+async def _client_scope(client: Optional[httpx.AsyncClient] = None):
+    """Yields the caller's client, or the module-wide one if none was passed."""
+    yield client if client is not None else _gh()
+
+
+def _newest_push_head(events: List[Dict[str, Any]]) -> Optional[str]:
+    """Head SHA of the newest PushEvent in an events page (newest first), if any."""
+    for event in events:
+        if event.get("type") != "PushEvent":
+            continue
+        payload = event.get("payload", {})
+        commits = payload.get("commits") or []
+        head = payload.get("head") or (commits[-1].get("sha") if commits else None)
+        if head:
+            return head
+    return None
+
+
+async def fetch_user_recent_activity_async(
+    github_username: str,
+    max_events: int = 10,
+    client: Optional[httpx.AsyncClient] = None,
+    head_sha: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
     """
     Fetches recent public activity (Push Events) for a GitHub user
     and extracts code patches from their commits.
     
+    Commit detail requests are issued concurrently (bounded by
+    MAX_CONCURRENT_FETCHES) instead of one blocking round-trip per commit.
+    
+    No separate SHA lookup is made: the event pages (ETag-revalidated, so
+    an idle feed costs 304s) give the newest push head, and if that is
+    unchanged since the last scan the previous result is returned without
+    fetching any patches.
+    
     Args:
         github_username: GitHub username to scan (e.g., "torvalds")
         max_events: Maximum number of events to process (default: 10)
+        client: Optional GitHub client (the module-wide one otherwise)
+        head_sha: The user's activity SHA if the caller already resolved it
+            (GraphQL poll / get_latest_commit_sha_async); reported as
+            latest_commit_sha so last_analyzed_sha keeps that definition
     
     Returns:
         Dict with:
             - recent_code_context: Combined code patches for analysis
-            - latest_commit_sha: SHA of the most recent commit (for caching)
+            - latest_commit_sha: head_sha, or the newest push head (for caching)
             - repos_touched: List of repositories with activity
         Or None if no activity found
     """
-    # === LIMITS TO PREVENT EXCESSIVE LLM COSTS ===
-    MAX_CONTEXT_CHARS = 15000    # Max total context size (~15KB, ~4000 tokens)
-    MAX_COMMITS_PER_REPO = 3      # Only analyze 3 most recent commits per repo
-    MAX_FILES_PER_COMMIT = 5      # Only analyze 5 files per commit
-    MAX_PATCH_SIZE = 1500         # Max chars per file patch
-    
-    token = os.getenv("GITHUB_ACCESS_TOKEN")
-    if not token:
-        print("⚠️ GITHUB_ACCESS_TOKEN missing - cannot fetch user activity")
+    if not _GITHUB_TOKEN:
+        logger.warning("⚠️ GITHUB_ACCESS_TOKEN missing - cannot fetch user activity")
         return None
 
     try:
-        g = Github(token)
-        user = g.get_user(github_username)
-        
-        # Fetch public events
-        events = user.get_public_events()
-        
-        context_parts = []
-        repos_touched = set()
-        latest_commit_sha = None
-        events_processed = 0
-        current_context_size = 0
-        
-        for event in events:
-            if events_processed >= max_events:
-                break
+        async with _client_scope(client) as client:
+            # Fetch just enough pages of public events to cover the scan bound, in parallel
+            scan_limit = max_events * EVENT_SCAN_FACTOR
+            per_page = min(scan_limit, MAX_EVENTS_PER_PAGE)
+            page_count = -(-scan_limit // per_page)
+            pages = await asyncio.gather(
+                *[_fetch_events_page(client, github_username, page, per_page) for page in range(1, page_count + 1)],
+                return_exceptions=True
+            )
+            if isinstance(pages[0], Exception):
+                raise pages[0]
+            events = list(itertools.islice(
+                (event for page in pages if not isinstance(page, Exception) for event in page),
+                scan_limit
+            ))
             
-            # Check if we've hit the context limit
-            if current_context_size >= MAX_CONTEXT_CHARS:
-                print(f"📊 Context limit reached ({current_context_size} chars), stopping collection")
-                break
-                
-            # Only process PushEvents (commits)
-            if event.type != "PushEvent":
-                continue
-                
-            events_processed += 1
-            repo_name = event.repo.name
-            repos_touched.add(repo_name)
+            # Short-circuit no-op polls: same newest push head means same activity
+            push_head = _newest_push_head(events)
+            if push_head and _last_seen.get(github_username) == push_head and github_username in _last_result:
+                logger.info("✓ No new pushes for %s (%s), reusing last scan", github_username, push_head[:7])
+                return {**_last_result[github_username], "latest_commit_sha": head_sha or push_head}
             
-            payload = event.payload
-            commits = payload.get("commits", [])
-            
-            # FALLBACK: If commits array is empty (common for web UI edits, merges, squashes),
-            # fetch recent commits directly from the repository
-            if not commits:
-                print(f"📦 PushEvent has empty commits payload, fetching from repo: {repo_name}")
-                try:
-                    repo = g.get_repo(repo_name)
-                    # Get limited recent commits from this repo
-                    recent_commits = list(repo.get_commits()[:MAX_COMMITS_PER_REPO])
-                    
-                    for commit in recent_commits:
-                        if current_context_size >= MAX_CONTEXT_CHARS:
-                            break
-                            
-                        commit_sha = commit.sha
-                        commit_message = commit.commit.message or ""
-                        
-                        # Track latest SHA for caching
-                        if latest_commit_sha is None:
-                            latest_commit_sha = commit_sha
-                        
-                        files_processed = 0
-                        for file in commit.files:
-                            if files_processed >= MAX_FILES_PER_COMMIT:
-                                break
-                            if current_context_size >= MAX_CONTEXT_CHARS:
-                                break
-                                
-                            # Filter by code file extensions
-                            if not file.filename.endswith(CODE_EXTENSIONS):
-                                continue
-                                
-                            # Get the patch (diff)
-                            if file.patch:
-                                patch_text = (
-                                    f"--- REPO: {repo_name} | FILE: {file.filename} ---\n"
-                                    f"Commit: {commit_message[:100]}\n"
-                                    f"Patch:\n{file.patch[:MAX_PATCH_SIZE]}"
-                                )
-                                context_parts.append(patch_text)
-                                current_context_size += len(patch_text)
-                                files_processed += 1
-                            elif file.filename.endswith(".ipynb"):
-                                nb_text = (
-                                    f"--- REPO: {repo_name} | FILE: {file.filename} ---\n"
-                                    f"Jupyter Notebook updated in commit: {commit_message[:100]}"
-                                )
-                                context_parts.append(nb_text)
-                                current_context_size += len(nb_text)
-                                files_processed += 1
-                                
-                except Exception as e:
-                    print(f"⚠️ Could not fetch repo commits for {repo_name}: {e}")
-                continue  # Move to next event after processing fallback
+            # Pass 1: collect (repo, ref, message, sha) targets from the event payloads.
+            # A push with known before/head SHAs becomes one compare range.
+            targets = []
+            repos_touched = set()
+            events_processed = 0
             
-            # Normal flow: process commits from payload
-            commits_processed = 0
-            for commit_data in commits:
-                if commits_processed >= MAX_COMMITS_PER_REPO:
-                    break
-                if current_context_size >= MAX_CONTEXT_CHARS:
+            for event in events:
+                if events_processed >= max_events:
                     break
                     
-                commits_processed += 1
-                commit_sha = commit_data.get("sha")
-                commit_message = commit_data.get("message", "")
+                # Only process PushEvents (commits)
+                if event.get("type") != "PushEvent":
+                    continue
+                    
+                events_processed += 1
+                repo_name = event["repo"]["name"]
+                repos_touched.add(repo_name)
                 
-                # Track latest SHA for caching
-                if latest_commit_sha is None:
-                    latest_commit_sha = commit_sha
+                payload = event.get("payload", {})
+                commits = payload.get("commits", [])
+                before, head = payload.get("before"), payload.get("head")
                 
-                # Try to get the full commit with file patches
-                try:
-                    repo = g.get_repo(repo_name)
-                    full_commit = repo.get_commit(commit_sha)
-                    
-                    files_processed = 0
-                    for file in full_commit.files:
-                        if files_processed >= MAX_FILES_PER_COMMIT:
-                            break
-                        if current_context_size >= MAX_CONTEXT_CHARS:
-                            break
-                            
-                        # Filter by code file extensions
-                        if not file.filename.endswith(CODE_EXTENSIONS):
-                            continue
-                            
-                        # Get the patch (diff)
-                        if file.patch:
-                            patch_text = (
-                                f"--- REPO: {repo_name} | FILE: {file.filename} ---\n"
-                                f"Commit: {commit_message[:100]}\n"
-                                f"Patch:\n{file.patch[:MAX_PATCH_SIZE]}"
-                            )
-                            context_parts.append(patch_text)
-                            current_context_size += len(patch_text)
-                            files_processed += 1
-                        elif file.filename.endswith(".ipynb"):
-                            nb_text = (
-                                f"--- REPO: {repo_name} | FILE: {file.filename} ---\n"
-                                f"Jupyter Notebook updated in commit: {commit_message[:100]}"
-                            )
-                            context_parts.append(nb_text)
-                            current_context_size += len(nb_text)
-                            files_processed += 1
-                            
-                except Exception as e:
-                    # Some commits might be in private repos or deleted
-                    print(f"⚠️ Could not fetch commit {commit_sha[:7]}: {e}")
+                if before and head and before != NULL_SHA:
+                    message = (commits[-1].get("message") or "") if commits else ""
+                    sha = commits[0].get("sha") if commits else head
+                    targets.append((repo_name, f"{before}...{head}", message, sha))
                     continue
+                
+                # FALLBACK: If commits array is empty (common for web UI edits, merges, squashes),
+                # fetch recent commits directly from the repository
+                if not commits:
+                    logger.info("📦 PushEvent has empty commits payload, fetching from repo: %s", repo_name)
+                    try:
+                        resp = await client.get(
+                            f"/repos/{repo_name}/commits",
+                            params={"per_page": MAX_COMMITS_PER_REPO}
+                        )
+                        resp.raise_for_status()
+                        commits = [
+                            {"sha": c["sha"], "message": c["commit"]["message"]}
+                            for c in resp.json()
+                        ]
+                    except _GITHUB_ERRORS as e:
+                        logger.warning("⚠️ Could not fetch repo commits for %s: %s", repo_name, e)
+                        continue
+                
+                for commit_data in commits[:MAX_COMMITS_PER_REPO]:
+                    sha = commit_data.get("sha")
+                    targets.append((repo_name, sha, commit_data.get("message") or "", sha))
+            
+            # Pass 2: fetch file patches and pack the best of them into the budget
+            recent_code_context = await _build_code_context(client, targets)
         
-        if not context_parts:
-            print(f"⚠️ No code activity found for user: {github_username}")
+        if not recent_code_context:
+            logger.info("⚠️ No code activity found for user: %s", github_username)
             return None
         
-        # Combine all patches into analysis context
-        recent_code_context = "\n\n".join(context_parts)
-        
-        return {
+        result = {
             "recent_code_context": recent_code_context,
-            "latest_commit_sha": latest_commit_sha,
+            "latest_commit_sha": head_sha or push_head,
             "repos_touched": list(repos_touched),
             "events_analyzed": events_processed
         }
+        if push_head:
+            _last_seen[github_username] = push_head
+            _last_result[github_username] = result
         
-    except Exception as e:
-        print(f"❌ GitHub Events API Error: {e}")
+        return result
+        
+    except _GITHUB_ERRORS as e:
+        logger.error("❌ GitHub Events API Error: %s", e)
         return None
 
 
-def get_latest_commit_sha(github_username: str) -> Optional[str]:
+def fetch_user_recent_activity(github_username: str, max_events: int = 10) -> Optional[Dict[str, Any]]:
+    """
+    Synchronous wrapper around fetch_user_recent_activity_async().
+    Kept for backward compatibility; async callers should await the coroutine directly.
+    """
+    return _run_scoped(fetch_user_recent_activity_async, github_username, max_events)
+
+
+async def _latest_authored_sha(
+    client: httpx.AsyncClient,
+    github_username: str,
+    repo_names: List[str]
+) -> Optional[str]:
+    """
+    The user's activity SHA over REST: the newest default-branch commit
+    authored by the user, in the first of `repo_names` (most recently pushed
+    first) that has one. fetch_user_sha_and_activity_graphql resolves the
+    same commit, so last_analyzed_sha means the same thing on either path.
+    """
+    for repo_name in repo_names:
+        try:
+            resp = await client.get(
+                f"/repos/{repo_name}/commits",
+                params={"author": github_username, "per_page": 1}
+            )
+            resp.raise_for_status()
+            commits = resp.json()
+        except _GITHUB_ERRORS as e:
+            logger.warning("⚠️ Could not fetch latest SHA from %s: %s", repo_name, e)
+            continue
+        if commits:
+            return commits[0]["sha"]
+    return None
+
+
+async def get_latest_commit_sha_async(
+    github_username: str,
+    client: Optional[httpx.AsyncClient] = None
+) -> Optional[str]:
     """
     Quick check to get just the latest commit SHA without full analysis.
-    Used for efficient polling to detect new activity.
+    Used for efficient polling to detect new activity. The SHA is defined
+    by _latest_authored_sha, identically to the GraphQL poll.
+    
+    Sends the last seen ETag as If-None-Match; GitHub answers an unchanged
+    feed with 304 Not Modified (empty body, not charged against the rate
+    limit), in which case the cached SHA is returned without any parsing.
     """
-    token = os.getenv("GITHUB_ACCESS_TOKEN")
-    if not token:
+    if not _GITHUB_TOKEN:
         return None
 
+    headers = {}
+    if github_username in _sha_cache:
+        headers["If-None-Match"] = _etag_cache[github_username]
+
     try:
-        g = Github(token)
-        user = g.get_user(github_username)
-        events = user.get_public_events()
+        async with _client_scope(client) as client:
+            resp = await client.get(f"/users/{github_username}/events/public", headers=headers)
+            
+            if resp.status_code == 304:
+                return _sha_cache[github_username]
+            resp.raise_for_status()
+            
+            # Pushed repos, most recent first
+            pushed_repos = list(dict.fromkeys(
+                event["repo"]["name"] for event in resp.json() if event.get("type") == "PushEvent"
+            ))
+            latest_sha = await _latest_authored_sha(client, github_username, pushed_repos)
         
-        for event in events:
-            if event.type == "PushEvent":
-                commits = event.payload.get("commits", [])
-                if commits:
-                    return commits[0].get("sha")
-                
-                # FALLBACK: If commits array is empty, fetch latest from repo
-                repo_name = event.repo.name
-                try:
-                    repo = g.get_repo(repo_name)
-                    latest_commit = list(repo.get_commits()[:1])
-                    if latest_commit:
-                        return latest_commit[0].sha
-                except Exception as e:
-                    print(f"⚠️ Could not fetch latest SHA from {repo_name}: {e}")
-                    continue
+        etag = resp.headers.get("ETag")
+        if etag:
+            _etag_cache[github_username] = etag
+            _sha_cache[github_username] = latest_sha
         
-        return None
+        return latest_sha
         
-    except Exception as e:
-        print(f"❌ GitHub SHA Check Error: {e}")
+    except _GITHUB_ERRORS as e:
+        logger.error("❌ GitHub SHA Check Error: %s", e)
         return None
 
 
+def get_latest_commit_sha(github_username: str) -> Optional[str]:
+    """
+    Synchronous wrapper around get_latest_commit_sha_async().
+    Kept for backward compatibility; async callers should await the coroutine directly.
+    """
+    return _run_scoped(get_latest_commit_sha_async, github_username)
+
 
-def analyze_code_context(code_context: str) -> Optional[Dict[str, Any]]:
+async def probe_events_etag(
+    github_username: str,
+    etag: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None
+) -> Tuple[bool, Optional[str]]:
     """
-    Uses LangChain + Gemini to extract skills from code context.
+    Conditional GET on the user's public Events feed, used to gate polls.
+    
+    A 304 Not Modified is not charged against the 5000/hr rate limit, so an
+    idle poll costs nothing. The body of a 200 is never parsed; the caller
+    resolves the new head SHA its own way.
     
-    Args:
-        code_context: Combined code patches and file changes
-        
     Returns:
-        Dict with detected_skills list, each containing skill, level, evidence
+        (not_modified, etag): not_modified is True on 304; etag is the
+        feed's current ETag (the one sent on 304, None if GitHub gave none
+        or the request failed)
     """
-    import json
-    import re
+    if not _GITHUB_TOKEN:
+        return False, None
     
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        print("⚠️ GEMINI_API_KEY missing")
+    headers = {"If-None-Match": etag} if etag else {}
+    try:
+        async with _client_scope(client) as client:
+            resp = await client.get(
+                f"/users/{github_username}/events/public",
+                params={"per_page": 1},
+                headers=headers
+            )
+        if resp.status_code == 304:
+            return True, etag
+        resp.raise_for_status()
+        return False, resp.headers.get("ETag")
+    except _GITHUB_ERRORS as e:
+        logger.warning("⚠️ GitHub Events ETag probe failed for %s: %s", github_username, e)
+        return False, None
+
+
+# One GraphQL round-trip returns the head commits of a user's most recently
+# pushed repositories; it replaces the Events + commits REST calls of a poll
+GRAPHQL_ACTIVITY_REPOS = 5
+GRAPHQL_ACTIVITY_QUERY = """
+query($login: String!, $author: ID!, $repos: Int!, $commits: Int!) {
+  user(login: $login) {
+    repositories(first: $repos, orderBy: {field: PUSHED_AT, direction: DESC},
+                 ownerAffiliations: [OWNER, COLLABORATOR], privacy: PUBLIC) {
+      nodes {
+        nameWithOwner
+        defaultBranchRef {
+          target { ... on Commit { history(first: $commits, author: {id: $author}) { nodes { oid message } } } }
+        }
+      }
+    }
+  }
+}
+"""
+GRAPHQL_USER_ID_QUERY = "query($login: String!) { user(login: $login) { id } }"
+
+# GitHub node IDs by username (they never change), for the history author filter
+_user_node_ids: Dict[str, str] = {}
+
+
+async def _user_node_id(client: httpx.AsyncClient, github_username: str) -> str:
+    """Resolves (once per process) the user's GraphQL node ID."""
+    if github_username not in _user_node_ids:
+        resp = await client.post("/graphql", json={
+            "query": GRAPHQL_USER_ID_QUERY,
+            "variables": {"login": github_username}
+        })
+        resp.raise_for_status()
+        body = resp.json()
+        if body.get("errors"):
+            raise ValueError(body["errors"][0].get("message", "GraphQL error"))
+        _user_node_ids[github_username] = body["data"]["user"]["id"]
+    return _user_node_ids[github_username]
+
+
+async def fetch_user_sha_and_activity_graphql(
+    github_username: str,
+    known_sha: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Polls a user's activity with a single GraphQL query instead of the REST
+    Events feed plus per-repo commit listings.
+    
+    Only commits authored by the user count (teammates' and bots' commits on
+    shared repositories are not the user's skill evidence). The newest of them
+    in the most recently pushed repository is the user's latest SHA - the
+    same commit _latest_authored_sha finds over REST. Commit patches are only
+    fetched (REST; GraphQL has no diffs) when that SHA differs from
+    `known_sha`, so an unchanged poll costs one call (after the node ID lookup).
+    
+    Returns:
+        Dict with latest_sha and, on a change, the same recent_code_context /
+        latest_commit_sha / repos_touched keys as fetch_user_recent_activity_async
+        (recent_code_context is None when nothing changed).
+        None if the query fails, so callers can fall back to the REST path.
+    """
+    if not _GITHUB_TOKEN:
         return None
     
-    # 1. Setup LLM with stricter settings
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash",
-        temperature=0.1,  # Lower temperature for more deterministic JSON output
-        google_api_key=api_key
-    )
+    try:
+        async with _client_scope(client) as client:
+            resp = await client.post("/graphql", json={
+                "query": GRAPHQL_ACTIVITY_QUERY,
+                "variables": {
+                    "login": github_username,
+                    "author": await _user_node_id(client, github_username),
+                    "repos": GRAPHQL_ACTIVITY_REPOS,
+                    "commits": MAX_COMMITS_PER_REPO
+                }
+            })
+            resp.raise_for_status()
+            body = resp.json()
+            if body.get("errors"):
+                raise ValueError(body["errors"][0].get("message", "GraphQL error"))
+            
+            targets = []
+            repos_touched = []
+            for repo in (body["data"]["user"] or {})["repositories"]["nodes"]:
+                history = ((repo.get("defaultBranchRef") or {}).get("target") or {}).get("history")
+                if not history or not history["nodes"]:
+                    continue
+                repos_touched.append(repo["nameWithOwner"])
+                for commit in history["nodes"]:
+                    targets.append((repo["nameWithOwner"], commit["oid"], commit.get("message") or "", commit["oid"]))
+            
+            latest_sha = targets[0][3] if targets else None
+            result = {
+                "latest_sha": latest_sha,
+                "latest_commit_sha": latest_sha,
+                "recent_code_context": None,
+                "repos_touched": repos_touched,
+                "events_analyzed": len(targets)
+            }
+            if latest_sha and latest_sha != known_sha:
+                result["recent_code_context"] = await _build_code_context(client, targets) or None
+            return result
     
-    # 2. Strict prompt that ONLY returns JSON
-    strict_prompt = """Analyze the code patches below and extract technical skills.
+    except (*_GITHUB_ERRORS, TypeError) as e:
+        logger.error("❌ GitHub GraphQL Activity Error: %s", e)
+        return None
+
+
+
+# Strict prompt that ONLY returns JSON
+SKILL_ANALYSIS_PROMPT = """Analyze the code patches below and extract technical skills.
 
 CODE PATCHES:
 {code_context}
@@ -305,51 +843,184 @@ Rules:
 - Maximum 10 skills
 - Focus on concrete technologies visible in code"""
 
-    try:
-        print("[LangChain] Analyzing GitHub Activity Code Context...")
-        
-        # Direct LLM call without parser (more control)
-        response = llm.invoke(strict_prompt.format(code_context=code_context[:12000]))
-        raw_text = response.content.strip()
+
+
+_analysis_chain: Optional[Runnable] = None
+
+
+def _get_analysis_chain() -> Optional[Runnable]:
+    """
+    Returns the shared prompt | Gemini | parser chain, building it on first
+    use so the client and its HTTP session are reused across polls.
+    None if no Gemini API key is configured.
+    """
+    global _analysis_chain
+    if _analysis_chain is None:
+        if not _GEMINI_KEY:
+            logger.warning("⚠️ GEMINI_API_KEY missing")
+            return None
         
-        # Try to parse as JSON directly
+        llm = ChatGoogleGenerativeAI(
+            model="gemini-2.0-flash",
+            temperature=0.1,  # Lower temperature for more deterministic JSON output
+            google_api_key=_GEMINI_KEY
+        )
+        prompt = PromptTemplate.from_template(SKILL_ANALYSIS_PROMPT)
+        parser = RunnableLambda(lambda message: _parse_skills_response(message.content.strip()))
+        _analysis_chain = prompt | llm | parser
+    return _analysis_chain
+
+
+def _parse_skills_response(raw_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses the model's reply into a detected_skills dict, tolerating
+    markdown fences and stray text around the JSON object.
+    """
+    # Try to parse as JSON directly
+    try:
+        result = json.loads(raw_text)
+        if "detected_skills" in result:
+            logger.info("[LangChain] ✓ Detected %d skills", len(result["detected_skills"]))
+            return result
+    except json.JSONDecodeError:
+        pass
+    
+    # Fallback: Extract JSON from markdown code blocks if present
+    json_match = _JSON_FENCE_RE.search(raw_text)
+    if json_match:
         try:
-            result = json.loads(raw_text)
+            result = json.loads(json_match.group(1))
             if "detected_skills" in result:
-                print(f"[LangChain] ✓ Detected {len(result['detected_skills'])} skills")
+                logger.info("[LangChain] ✓ Extracted %d skills from markdown", len(result["detected_skills"]))
                 return result
         except json.JSONDecodeError:
             pass
+    
+    # Final fallback: Find any JSON object in response
+    json_match = _SKILLS_JSON_RE.search(raw_text)
+    if json_match:
+        try:
+            result = json.loads(json_match.group())
+            logger.info("[LangChain] ✓ Recovered %d skills", len(result.get("detected_skills", [])))
+            return result
+        except json.JSONDecodeError:
+            pass
+    
+    logger.warning("[LangChain] ⚠️ Could not parse JSON from response (length: %d)", len(raw_text))
+    return None
+
+
+def analyze_code_context(code_context: str) -> Optional[Dict[str, Any]]:
+    """
+    Uses LangChain + Gemini to extract skills from code context.
+    
+    Args:
+        code_context: Combined code patches and file changes
         
-        # Fallback: Extract JSON from markdown code blocks if present
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_text, re.DOTALL)
-        if json_match:
-            try:
-                result = json.loads(json_match.group(1))
-                if "detected_skills" in result:
-                    print(f"[LangChain] ✓ Extracted {len(result['detected_skills'])} skills from markdown")
-                    return result
-            except json.JSONDecodeError:
-                pass
-        
-        # Final fallback: Find any JSON object in response
-        json_match = re.search(r'\{[^{}]*"detected_skills"\s*:\s*\[.*?\]\s*\}', raw_text, re.DOTALL)
-        if json_match:
-            try:
-                result = json.loads(json_match.group())
-                print(f"[LangChain] ✓ Recovered {len(result.get('detected_skills', []))} skills")
-                return result
-            except json.JSONDecodeError:
-                pass
-        
-        print(f"[LangChain] ⚠️ Could not parse JSON from response (length: {len(raw_text)})")
+    Returns:
+        Dict with detected_skills list, each containing skill, level, evidence
+    """
+    chain = _get_analysis_chain()
+    if chain is None:
         return None
+
+    try:
+        logger.info("[LangChain] Analyzing GitHub Activity Code Context...")
+        return chain.invoke({"code_context": code_context[:CONTEXT_BUDGET]})
         
     except Exception as e:
-        print(f"[LangChain] Analysis Error: {e}")
+        logger.error("[LangChain] Analysis Error: %s", e)
         return None
 
 
+async def analyze_code_context_batch(contexts: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Analyzes several code contexts concurrently with the shared chain.
+    
+    Requests are submitted through chain.abatch (up to MAX_CONCURRENT_ANALYSES
+    in flight), so N users cost roughly one round-trip instead of N.
+    
+    Args:
+        contexts: Code contexts, e.g. one recent_code_context per user
+        
+    Returns:
+        One analysis dict (or None on failure) per context, in input order
+    """
+    if not contexts:
+        return []
+    
+    chain = _get_analysis_chain()
+    if chain is None:
+        return [None] * len(contexts)
+    
+    logger.info("[LangChain] Analyzing %d GitHub code context(s)...", len(contexts))
+    responses = await chain.abatch(
+        [{"code_context": c[:CONTEXT_BUDGET]} for c in contexts],
+        config={"max_concurrency": MAX_CONCURRENT_ANALYSES},
+        return_exceptions=True
+    )
+    
+    results = []
+    for response in responses:
+        if isinstance(response, Exception):
+            logger.error("[LangChain] Analysis Error: %s", response)
+            results.append(None)
+        else:
+            results.append(response)
+    return results
+
+
+# Ordering used to keep the strongest level when repos disagree about a skill
+SKILL_LEVEL_RANK = {"beginner": 0, "intermediate": 1, "advanced": 2, "expert": 3}
+
+
+def _level_rank(item: Dict[str, Any]) -> int:
+    """SKILL_LEVEL_RANK of a detected skill's level (any casing); -1 if unknown."""
+    return SKILL_LEVEL_RANK.get(str(item.get("level") or "").lower(), -1)
+
+
+def split_context_by_repo(code_context: str) -> List[str]:
+    """
+    Splits a packed code context into one context per repository (repos in
+    order of first appearance), so each can be analyzed as its own request.
+    A context without repo headers is returned whole.
+    """
+    headers = list(_REPO_HEADER_RE.finditer(code_context))
+    if not headers:
+        return [code_context] if code_context else []
+    
+    sections: Dict[str, List[str]] = {}
+    for header, following in zip(headers, headers[1:] + [None]):
+        end = following.start() if following else len(code_context)
+        sections.setdefault(header.group(1), []).append(code_context[header.start():end].rstrip())
+    return ["\n\n".join(parts) for parts in sections.values()]
+
+
+def merge_skill_analyses(analyses: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    Merges per-repo analyses into one, deduplicating detected_skills by name
+    (case-insensitive, first spelling wins) and keeping the highest level.
+    Returns None if every analysis failed.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    succeeded = False
+    for analysis in analyses:
+        if not analysis:
+            continue
+        succeeded = True
+        for item in analysis.get("detected_skills", []):
+            skill = item.get("skill")
+            if not skill:
+                continue
+            key = skill.lower()
+            current = merged.get(key)
+            if current is None:
+                merged[key] = dict(item)
+            elif _level_rank(item) > _level_rank(current):
+                merged[key] = {**item, "skill": current["skill"]}
+    return {"detected_skills": list(merged.values())} if succeeded else None
+
+
 def extract_username_from_url(github_url: str) -> Optional[str]:
     """
     Extracts GitHub username from various URL formats.
@@ -365,127 +1036,182 @@ def extract_username_from_url(github_url: str) -> Optional[str]:
     """
     if not github_url:
         return None
-        
-    # Clean the URL
-    url = github_url.strip().rstrip("/")
-    
-    # Remove protocol and www
-    url = url.replace("https://", "").replace("http://", "").replace("www.", "")
-    
-    # Should now be: github.com/username or github.com/username/repo
-    if not url.startswith("github.com/"):
-        return None
-    
-    parts = url.replace("github.com/", "").split("/")
-    
-    if parts and parts[0]:
-        return parts[0]
     
-    return None
+    # Protocol, www and host are stripped and the username captured in one match
+    match = _GH_URL_RE.match(github_url.strip())
+    return match.group(1) if match else None
 
 
 # ============================================================================
 # LEGACY FUNCTIONS (kept for backward compatibility)
 # ============================================================================
 
+async def _get_latest_user_activity_async(client: Optional[httpx.AsyncClient] = None):
+    """Finds the authenticated user's most recently updated repo and its head commit."""
+    client = client or _gh()
+    resp = await client.get("/user/repos", params={"sort": "updated", "direction": "desc", "per_page": 1})
+    resp.raise_for_status()
+    
+    repos = resp.json()
+    if not repos:
+        return None
+    latest_repo = repos[0]
+
+    try:
+        commits_resp = await client.get(f"/repos/{latest_repo['full_name']}/commits", params={"per_page": 1})
+        latest_commit_sha = commits_resp.json()[0]["sha"]
+    except _GITHUB_ERRORS:
+        latest_commit_sha = "unknown"
+
+    return {
+        "repo_name": latest_repo["full_name"],
+        "repo_url": latest_repo["html_url"],
+        "last_updated": latest_repo["updated_at"],
+        "latest_commit_sha": latest_commit_sha
+    }
+
+
 def get_latest_user_activity(username_or_token: str):
     """
     LEGACY: Scans the authenticated user's repos for most recent activity.
     Kept for backward compatibility with existing code.
     """
-    token = os.getenv("GITHUB_ACCESS_TOKEN")
-    if not token: 
+    if not _GITHUB_TOKEN: 
         return None
 
     try:
-        g = Github(token)
-        user = g.get_user()
-        
-        repos = user.get_repos(sort="updated", direction="desc")
-        
-        latest_repo = None
-        try:
-            latest_repo = repos[0]
-        except IndexError:
-            return None
+        return _run_scoped(_get_latest_user_activity_async)
+    except _GITHUB_ERRORS as e:
+        logger.error("❌ GitHub Activity Scan Error: %s", e)
+        return None
 
-        try:
-            commits = latest_repo.get_commits()
-            latest_commit_sha = commits[0].sha
-        except:
-            latest_commit_sha = "unknown"
-
-        return {
-            "repo_name": latest_repo.full_name,
-            "repo_url": latest_repo.html_url,
-            "last_updated": latest_repo.updated_at.isoformat(),
-            "latest_commit_sha": latest_commit_sha
-        }
 
-    except Exception as e:
-        print(f"❌ GitHub Activity Scan Error: {e}")
+async def _fetch_dependency_head(client: httpx.AsyncClient, repo_name: str, dep_file: str) -> Optional[str]:
+    """
+    Fetches the first DEPENDENCY_HEAD_BYTES of a file at HEAD from the raw
+    endpoint. The Range header caps the transfer, so a huge lockfile costs
+    the same as a small manifest. Returns None if the file does not exist.
+    """
+    resp = await client.get(
+        f"{GITHUB_RAW_URL}/{repo_name}/HEAD/{dep_file}",
+        headers={"Range": f"bytes=0-{DEPENDENCY_HEAD_BYTES - 1}"}
+    )
+    if resp.status_code in (404, 416):
         return None
+    resp.raise_for_status()
+    # The byte cut may split a multi-byte character at the end
+    return resp.content[:DEPENDENCY_HEAD_BYTES].decode("utf-8", errors="ignore")
 
 
-def fetch_and_analyze_github(github_url: str):
+async def _fetch_dependency_files(client: httpx.AsyncClient, repo_name: str) -> Dict[str, str]:
     """
-    LEGACY: Analyzes a specific repository URL.
-    Kept for backward compatibility.
+    Fetches the head of every DEPENDENCY_FILES entry concurrently.
     
-    For new code, use fetch_user_recent_activity() + analyze_code_context() instead.
+    Returns:
+        Dict of filename -> text for the files that exist
     """
+    heads = await asyncio.gather(
+        *[_fetch_dependency_head(client, repo_name, dep_file) for dep_file in DEPENDENCY_FILES],
+        return_exceptions=True
+    )
+    
+    files = {}
+    for dep_file, text in zip(DEPENDENCY_FILES, heads):
+        if isinstance(text, Exception):
+            logger.warning("⚠️ Could not fetch %s for %s: %s", dep_file, repo_name, text)
+        elif text:
+            files[dep_file] = text
+    return files
+
+
+async def _fetch_and_analyze_github_async(github_url: str, client: Optional[httpx.AsyncClient] = None):
+    """Event-stream analysis with a repo-URL fallback, on `client` or the module-wide one."""
+    client = client or _gh()
     username = extract_username_from_url(github_url)
     
     if username:
         # Use new event-based approach
-        activity = fetch_user_recent_activity(username)
+        activity = await fetch_user_recent_activity_async(username, client=client)
         if activity and activity.get("recent_code_context"):
-            return analyze_code_context(activity["recent_code_context"])
+            return (await analyze_code_context_batch([activity["recent_code_context"]]))[0]
     
     # Fallback: Try to analyze as a repo URL
-    token = os.getenv("GITHUB_ACCESS_TOKEN")
-    if not token: 
+    clean_url = github_url.rstrip("/")
+    parts = clean_url.split("/")
+    
+    # Check if it's a repo URL (has at least user/repo)
+    if len(parts) < 2:
         return None
-
-    try:
-        import base64
-        g = Github(token)
-        clean_url = github_url.rstrip("/")
-        parts = clean_url.split("/")
         
-        # Check if it's a repo URL (has at least user/repo)
-        if len(parts) < 2:
-            return None
-            
-        repo_name = f"{parts[-2]}/{parts[-1]}"
-        repo = g.get_repo(repo_name)
-        
-        context_parts = []
+    repo_name = f"{parts[-2]}/{parts[-1]}"
+    commits_url, commits_params = f"/repos/{repo_name}/commits", {"per_page": 10}
+    
+    if repo_name in _repo_analyses:
+        # Revalidate the commit listing first: 304 means nothing new, so skip the
+        # repo/dependency fetches and the LLM call and reuse the last analysis
+        commits_resp = await client.get(
+            commits_url, params=commits_params, headers={"If-None-Match": _repo_etags[repo_name]}
+        )
+        if commits_resp.status_code == 304:
+            logger.info("✓ No new commits on %s, reusing last analysis", repo_name)
+            return _repo_analyses[repo_name]
+        resp, dependency_files = await asyncio.gather(
+            client.get(f"/repos/{repo_name}"),
+            _fetch_dependency_files(client, repo_name)
+        )
+    else:
+        # The repo lookup, dependency files and commit listing are independent: one round-trip
+        resp, dependency_files, commits_resp = await asyncio.gather(
+            client.get(f"/repos/{repo_name}"),
+            _fetch_dependency_files(client, repo_name),
+            client.get(commits_url, params=commits_params)
+        )
+    resp.raise_for_status()
+    
+    buf = io.StringIO()
+    
+    # Dependency Files
+    for dep_file, text in dependency_files.items():
+        buf.write(f"--- DEPENDENCY FILE: {dep_file} ---\n{text[:2000]}\n\n")
+
+    # Recent Commits, formatted and packed exactly like the event-stream path
+    commits_resp.raise_for_status()
+    commits = commits_resp.json()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    commit_files = await asyncio.gather(
+        *[_fetch_commit(client, repo_name, c["sha"], semaphore) for c in commits]
+    )
+    context_parts = []
+    for commit, files in zip(commits, commit_files):
+        context_parts.extend(_commit_context_parts(
+            repo_name, commit["commit"]["message"], files, MAX_FILES_PER_COMMIT, MAX_PATCH_SIZE
+        ))
+    buf.write(_rank_and_pack_patches(context_parts, CONTEXT_BUDGET - buf.tell()))
+
+    full_context = buf.getvalue().rstrip()
+    if not full_context:
+        return None
         
-        # Dependency Files
-        dependency_files = ["requirements.txt", "environment.yml", "package.json", "pyproject.toml", "go.mod"]
-        for dep_file in dependency_files:
-            try:
-                file_content = repo.get_contents(dep_file)
-                decoded = base64.b64decode(file_content.content).decode("utf-8")
-                context_parts.append(f"--- DEPENDENCY FILE: {dep_file} ---\n{decoded[:2000]}")
-            except: 
-                continue 
-
-        # Recent Commits
-        commits = repo.get_commits()[:10]
-        for commit in commits:
-            for file in commit.files:
-                if file.filename.endswith(CODE_EXTENSIONS):
-                    if file.patch:
-                        context_parts.append(f"File: {file.filename}\nChange:\n{file.patch[:1500]}")
-
-        if not context_parts:
-            return None
-            
-        full_context = "\n\n".join(context_parts)
-        return analyze_code_context(full_context)
+    analysis = (await analyze_code_context_batch([full_context]))[0]
+    etag = commits_resp.headers.get("ETag")
+    if analysis and etag:
+        _repo_etags[repo_name] = etag
+        _repo_analyses[repo_name] = analysis
+    return analysis
 
-    except Exception as e:
-        print(f"❌ GitHub Fetch Error: {e}")
+
+def fetch_and_analyze_github(github_url: str):
+    """
+    LEGACY: Analyzes a specific repository URL.
+    Kept for backward compatibility.
+    
+    For new code, use fetch_user_recent_activity() + analyze_code_context() instead.
+    """
+    if not _GITHUB_TOKEN: 
+        return None
+
+    try:
+        return _run_scoped(_fetch_and_analyze_github_async, github_url)
+    except _GITHUB_ERRORS as e:
+        logger.error("❌ GitHub Fetch Error: %s", e)
         return None
@@ -1,11 +1,17 @@
 # backend/agents/agent_1_perception/router.py
-from typing import Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+import logging
+from typing import Optional, Literal
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, BackgroundTasks, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from auth.dependencies import get_current_user
-from .service import agent1_service
+from services.cache_service import cache_service
+from .service import agent1_service, skills_metadata_columns, MAX_RESUME_BYTES
 from .schemas import (
     ProfileResponse, 
-    GithubSyncResponse, 
+    GithubSyncEnvelope,
     OnboardingRequest, 
     OnboardingResponse,
     WatchdogCheckRequest,
@@ -23,7 +29,56 @@ from .schemas import (
 from typing import List, Optional
 from pydantic import BaseModel
 
-router = APIRouter(prefix="/api/perception", tags=["Agent 1: Perception"])
+logger = logging.getLogger("Agent1")
+
+
+class PerceptionRoute(APIRoute):
+    """
+    Turns uncaught perception route exceptions into a generic 500, the one
+    place they are logged (with traceback). The error text is not sent to
+    the client, since it can include Supabase/Pinecone details. The response
+    is returned from the route, so CORS headers are still applied.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            try:
+                return await handler(request)
+            except (StarletteHTTPException, RequestValidationError):
+                raise
+            except Exception:
+                logger.exception("Unhandled error on %s", request.url.path)
+                return ORJSONResponse({"detail": "Internal server error"}, status_code=500)
+
+        return route_handler
+
+
+router = APIRouter(prefix="/api/perception", tags=["Agent 1: Perception"], route_class=PerceptionRoute)
+
+PDF_MAGIC = b"%PDF-"
+
+
+async def _validate_pdf_upload(request: Request, file: UploadFile) -> None:
+    """
+    Rejects oversized or non-PDF uploads before any service work: checks the
+    declared size, then sniffs the first 5 bytes instead of trusting the
+    filename extension. Uploads without a Content-Length are still capped
+    while the service reads them (_read_upload).
+    """
+    content_length = request.headers.get("content-length")
+    try:
+        declared_size = int(content_length) if content_length else 0
+    except ValueError:
+        raise HTTPException(400, "Invalid Content-Length header")
+    if declared_size > MAX_RESUME_BYTES or (file.size or 0) > MAX_RESUME_BYTES:
+        raise HTTPException(413, f"Resume must be under {MAX_RESUME_BYTES // (1024 * 1024)} MB")
+    
+    head = await file.read(len(PDF_MAGIC))
+    await file.seek(0)
+    if head != PDF_MAGIC:
+        raise HTTPException(400, "Only PDF files allowed")
 
 
 # =============================================================================
@@ -32,6 +87,8 @@ router = APIRouter(prefix="/api/perception", tags=["Agent 1: Perception"])
 
 @router.post("/upload-resume")
 async def upload_resume(
+    request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...), 
     user: dict = Depends(get_current_user)
 ):
@@ -41,25 +98,25 @@ async def upload_resume(
     Extracts skills with metadata and stores in both:
     - skills: Legacy string array for backward compatibility
     - skills_metadata: Rich skill profiles with source and verification status
+    
+    GitHub analysis (if a GitHub URL is on the profile) runs in the background
+    after the response is sent.
     """
     user_id = user["sub"]
     
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(400, "Only PDF files allowed")
+    await _validate_pdf_upload(request, file)
     
-    try:
-        result = await agent1_service.process_resume_upload(file, user_id)
-        return {"status": "success", "data": result}
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    result = await agent1_service.process_resume_upload(file, user_id)
+    background_tasks.add_task(agent1_service.prefetch_github_activity, user_id)
+    return {"status": "success", "data": result}
 
 
 # =============================================================================
 # GITHUB SYNC
 # =============================================================================
 
-@router.post("/sync-github", response_model=dict)
-async def sync_github(user: dict = Depends(get_current_user)):
+@router.post("/sync-github", response_model=GithubSyncEnvelope, response_model_exclude_unset=True)
+async def sync_github(background_tasks: BackgroundTasks, user: dict = Depends(get_current_user)):
     """
     Trigger GitHub sync (Protected)
     
@@ -69,20 +126,15 @@ async def sync_github(user: dict = Depends(get_current_user)):
     """
     user_id = user["sub"]
     
-    try:
-        result = await agent1_service.run_github_watchdog(user_id)
-        
-        if result is None:
-            raise HTTPException(
-                status_code=400, 
-                detail="GitHub sync failed. Please ensure you have completed onboarding with a valid GitHub URL."
-            )
-        
-        return {"status": "success", "data": result}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    result = await agent1_service.run_github_watchdog(user_id, background_tasks=background_tasks)
+    
+    if result is None:
+        raise HTTPException(
+            status_code=400, 
+            detail="GitHub sync failed. Please ensure you have completed onboarding with a valid GitHub URL."
+        )
+    
+    return {"status": "success", "data": result}
 
 
 # =============================================================================
@@ -92,6 +144,7 @@ async def sync_github(user: dict = Depends(get_current_user)):
 @router.patch("/onboarding", response_model=OnboardingResponse)
 async def update_onboarding(
     request: OnboardingRequest,
+    background_tasks: BackgroundTasks,
     user: dict = Depends(get_current_user)
 ):
     """
@@ -101,16 +154,15 @@ async def update_onboarding(
     """
     user_id = user["sub"]
     
-    try:
-        result = await agent1_service.update_user_onboarding(
-            user_id=user_id,
-            github_url=request.github_url,
-            linkedin_url=request.linkedin_url,
-            target_roles=request.target_roles
-        )
-        return result
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    result = await agent1_service.update_user_onboarding(
+        user_id=user_id,
+        github_url=request.github_url,
+        linkedin_url=request.linkedin_url,
+        target_roles=request.target_roles
+    )
+    if request.github_url:
+        background_tasks.add_task(agent1_service.prefetch_github_activity, user_id)
+    return result
 
 
 # =============================================================================
@@ -119,6 +171,7 @@ async def update_onboarding(
 
 @router.get("/watchdog/check")
 async def watchdog_check(
+    background_tasks: BackgroundTasks,
     session_id: Optional[str] = None,
     last_sha: Optional[str] = None,
     user: dict = Depends(get_current_user)
@@ -135,16 +188,12 @@ async def watchdog_check(
     """
     user_id = user["sub"]
     
-    try:
-        result = await agent1_service.check_github_activity(
-            user_id=user_id,
-            last_known_sha=last_sha
-        )
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    result = await agent1_service.check_github_activity(
+        user_id=user_id,
+        last_known_sha=last_sha,
+        background_tasks=background_tasks
+    )
+    return result
 
 
 # =============================================================================
@@ -167,38 +216,34 @@ async def generate_verification_quiz(
     """
     user_id = user["sub"]
     
-    try:
-        result = await agent1_service.generate_quiz(
-            user_id=user_id,
-            skill_name=request.skill_name,
-            level=request.level or "intermediate"
-        )
-        
-        if not result:
-            raise HTTPException(500, "Failed to generate quiz")
-        
-        return {
-            "status": "success",
-            "quiz": {
-                "quiz_id": result["quiz_id"],
-                "skill_name": result["skill_name"],
-                "question": result["question"],
-                "options": result["options"],
-                # Include correct_index for stateless verification
-                # In production, this would be stored server-side
-                "correct_index": result["correct_index"],
-                "explanation": result.get("explanation", "")
-            }
+    result = await agent1_service.generate_quiz(
+        user_id=user_id,
+        skill_name=request.skill_name,
+        level=request.level or "intermediate"
+    )
+    
+    if not result:
+        raise HTTPException(500, "Failed to generate quiz")
+    
+    return {
+        "status": "success",
+        "quiz": {
+            "quiz_id": result["quiz_id"],
+            "skill_name": result["skill_name"],
+            "question": result["question"],
+            "options": result["options"],
+            # Include correct_index for stateless verification
+            # In production, this would be stored server-side
+            "correct_index": result["correct_index"],
+            "explanation": result.get("explanation", "")
         }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    }
 
 
 @router.post("/verify/submit", response_model=dict)
 async def submit_quiz_answer(
     request: QuizSubmission,
+    background_tasks: BackgroundTasks,
     user: dict = Depends(get_current_user)
 ):
     """
@@ -216,29 +261,25 @@ async def submit_quiz_answer(
     """
     user_id = user["sub"]
     
-    try:
-        # Stateless verification: compare answer_index with expected_correct_index
-        # In production, you would look up the correct answer from a database
-        passed = request.answer_index == request.expected_correct_index
-        
-        result = await agent1_service.verify_quiz_attempt(
-            user_id=user_id,
-            skill_name=request.skill_name,
-            passed=passed
-        )
-        
-        return {
-            "status": "success",
-            "result": {
-                "correct": result["correct"],
-                "new_status": result["new_status"],
-                "message": result["message"]
-            }
+    # Stateless verification: compare answer_index with expected_correct_index
+    # In production, you would look up the correct answer from a database
+    passed = request.answer_index == request.expected_correct_index
+    
+    result = await agent1_service.verify_quiz_attempt(
+        user_id=user_id,
+        skill_name=request.skill_name,
+        passed=passed,
+        background_tasks=background_tasks
+    )
+    
+    return {
+        "status": "success",
+        "result": {
+            "correct": result["correct"],
+            "new_status": result["new_status"],
+            "message": result["message"]
         }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    }
 
 
 # =============================================================================
@@ -246,51 +287,55 @@ async def submit_quiz_answer(
 # =============================================================================
 
 @router.get("/profile")
-async def get_profile(user: dict = Depends(get_current_user)):
+async def get_profile(
+    layout: Literal["skills", "columns"] = "skills",
+    user: dict = Depends(get_current_user)
+):
     """
     Get current user's profile with skills metadata (Protected)
     Returns null profile data if user hasn't completed onboarding yet.
+    
+    layout=columns returns skills_metadata as a SkillsMetadataBlock
+    (parallel lists) instead of one object per skill.
     """
     user_id = user["sub"]
     
-    try:
-        response = agent1_service.supabase.table("profiles").select("*").eq("user_id", user_id).execute()
-        
-        if not response.data:
-            # New user - return empty profile structure
-            return {
-                "status": "success",
-                "profile": {
-                    "user_id": user_id,
-                    "name": user.get("user_metadata", {}).get("full_name") or user.get("email"),
-                    "email": user.get("email"),
-                    "resume_url": None,
-                    "skills": [],
-                    "skills_metadata": {},
-                    "experience_summary": None,
-                    "needs_onboarding": True
-                }
-            }
-        
-        profile = response.data[0]
-        
+    response = agent1_service.supabase.table("profiles").select("*").eq("user_id", user_id).execute()
+    
+    if not response.data:
+        # New user - return empty profile structure
         return {
             "status": "success",
             "profile": {
-                "user_id": profile.get("user_id"),
-                "name": profile.get("name"),
-                "email": profile.get("email"),
-                "resume_url": profile.get("resume_url"),
-                "skills": profile.get("skills", []),
-                "skills_metadata": profile.get("skills_metadata", {}),
-                "experience_summary": profile.get("experience_summary"),
-                "needs_onboarding": False
+                "user_id": user_id,
+                "name": user.get("user_metadata", {}).get("full_name") or user.get("email"),
+                "email": user.get("email"),
+                "resume_url": None,
+                "skills": [],
+                "skills_metadata": skills_metadata_columns({}) if layout == "columns" else {},
+                "experience_summary": None,
+                "needs_onboarding": True
             }
         }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    
+    profile = response.data[0]
+    skills_metadata = profile.get("skills_metadata") or {}
+    if layout == "columns":
+        skills_metadata = skills_metadata_columns(skills_metadata)
+    
+    return {
+        "status": "success",
+        "profile": {
+            "user_id": profile.get("user_id"),
+            "name": profile.get("name"),
+            "email": profile.get("email"),
+            "resume_url": profile.get("resume_url"),
+            "skills": profile.get("skills", []),
+            "skills_metadata": skills_metadata,
+            "experience_summary": profile.get("experience_summary"),
+            "needs_onboarding": False
+        }
+    }
 
 
 # =============================================================================
@@ -311,18 +356,19 @@ async def get_onboarding_status(user: dict = Depends(get_current_user)):
     """
     user_id = user["sub"]
     
-    try:
-        result = await agent1_service.check_onboarding_status(user_id)
-        return {"status": "success", **result}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    # Cached body is returned as-is (no re-serialization); invalidated on profile writes
+    cached = cache_service.get_onboarding_status(user_id)
+    if cached:
+        return Response(content=cached, media_type="application/json")
+    
+    body = await agent1_service.render_onboarding_status(user_id)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/onboarding/complete")
 async def complete_onboarding(
     request: OnboardingCompleteRequest,
+    background_tasks: BackgroundTasks,
     user: dict = Depends(get_current_user)
 ):
     """
@@ -333,37 +379,26 @@ async def complete_onboarding(
     """
     user_id = user["sub"]
     
-    try:
-        # Convert education items to dicts
-        education_dicts = [
-            {
-                "institution": edu.institution,
-                "degree": edu.degree,
-                "course": edu.course,
-                "year": edu.year
-            }
-            for edu in request.education
-        ]
-        
-        result = await agent1_service.complete_onboarding(
-            user_id=user_id,
-            name=request.name,
-            email=request.email,
-            skills=request.skills,
-            target_roles=request.target_roles,
-            education=education_dicts,
-            experience_summary=request.experience_summary,
-            github_url=request.github_url,
-            linkedin_url=request.linkedin_url,
-            leetcode_url=request.leetcode_url,
-            has_resume=request.has_resume
-        )
-        
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    # Convert education items to dicts (one pydantic-core pass)
+    education_dicts = request.model_dump(include={"education"})["education"]
+    
+    result = await agent1_service.complete_onboarding(
+        user_id=user_id,
+        name=request.name,
+        email=request.email,
+        skills=request.skills,
+        target_roles=request.target_roles,
+        education=education_dicts,
+        experience_summary=request.experience_summary,
+        github_url=request.github_url,
+        linkedin_url=request.linkedin_url,
+        leetcode_url=request.leetcode_url,
+        has_resume=request.has_resume
+    )
+    if request.github_url:
+        background_tasks.add_task(agent1_service.prefetch_github_activity, user_id)
+    
+    return result
 
 
 class GenerateQuizRequest(BaseModel):
@@ -375,28 +410,46 @@ class GenerateQuizRequest(BaseModel):
 @router.post("/onboarding/quiz/generate")
 async def generate_onboarding_quiz(
     request: GenerateQuizRequest,
+    background_tasks: BackgroundTasks,
     user: dict = Depends(get_current_user)
 ):
     """
-    Generate 5 MCQ questions for onboarding quiz (Protected)
+    Start generating 5 MCQ questions for onboarding quiz (Protected)
     
-    Questions are based on user's skills and target roles.
-    Returns questions with correct_index for stateless verification.
+    Questions are based on user's skills and target roles, each with a signed
+    verify_token (not the answer) to send back on submit. Generation runs
+    after the response: returns {status: "pending", quiz_id, poll_url};
+    poll GET /onboarding/quiz/status/{quiz_id} for the questions.
+    If the job store (Redis) is unavailable the questions are returned inline.
     """
     user_id = user["sub"]
     
-    try:
-        result = await agent1_service.generate_onboarding_quiz(
-            user_id=user_id,
-            skills=request.skills or [],
-            target_roles=request.target_roles or []
-        )
-        
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    skills, target_roles = await agent1_service.resolve_quiz_topics(
+        user_id=user_id,
+        skills=request.skills or [],
+        target_roles=request.target_roles or []
+    )
+    
+    quiz_id = agent1_service.create_quiz_job(user_id)
+    if quiz_id is None:
+        return await agent1_service.generate_onboarding_quiz(user_id, skills, target_roles)
+    
+    background_tasks.add_task(agent1_service.run_quiz_job, quiz_id, user_id, skills, target_roles)
+    return {
+        "status": "pending",
+        "quiz_id": quiz_id,
+        "poll_url": f"{router.prefix}/onboarding/quiz/status/{quiz_id}"
+    }
+
+
+@router.get("/onboarding/quiz/status/{quiz_id}")
+async def get_onboarding_quiz_status(quiz_id: str, user: dict = Depends(get_current_user)):
+    """
+    Poll an onboarding quiz job (Protected)
+    
+    status is "pending", "success" (with questions) or "error" (with detail).
+    """
+    return agent1_service.get_quiz_job(user["sub"], quiz_id)
 
 
 @router.post("/onboarding/quiz/submit")
@@ -407,31 +460,23 @@ async def submit_onboarding_quiz(
     """
     Submit onboarding quiz answers (Protected)
     
-    Marks onboarding as complete and calculates score.
+    Marks onboarding as complete and calculates score. Every question of the
+    issued quiz must be answered once, with the quiz's quiz_token; a quiz can
+    only be submitted once (409 afterwards).
     """
     user_id = user["sub"]
     
-    try:
-        # Convert answers to dicts
-        answers_dicts = [
-            {
-                "question_id": a.question_id,
-                "selected_index": a.selected_index,
-                "correct_index": a.correct_index
-            }
-            for a in request.answers
-        ]
-        
-        result = await agent1_service.submit_onboarding_quiz(
-            user_id=user_id,
-            answers=answers_dicts
-        )
-        
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    answers = request.answers
+    
+    result = await agent1_service.submit_onboarding_quiz(
+        user_id=user_id,
+        quiz_token=request.quiz_token,
+        question_ids=[a.question_id for a in answers],
+        selected=[a.selected_index for a in answers],
+        verify_tokens=[a.verify_token for a in answers]
+    )
+    
+    return result
 
 
 # =============================================================================
@@ -439,7 +484,10 @@ async def submit_onboarding_quiz(
 # =============================================================================
 
 @router.get("/dashboard")
-async def get_dashboard_insights(user: dict = Depends(get_current_user)):
+async def get_dashboard_insights(
+    background_tasks: BackgroundTasks,
+    user: dict = Depends(get_current_user)
+):
     """
     Get dashboard insights for authenticated users (Protected)
     
@@ -454,13 +502,29 @@ async def get_dashboard_insights(user: dict = Depends(get_current_user)):
     """
     user_id = user["sub"]
     
-    try:
-        result = await agent1_service.get_dashboard_insights(user_id)
-        return {"status": "success", **result}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    # Stale-while-revalidate: a stale cached body is still served, and rebuilt after the response
+    cached = cache_service.get_dashboard(user_id)
+    if cached:
+        body, is_stale = cached
+        if is_stale:
+            background_tasks.add_task(agent1_service.render_dashboard, user_id)
+        return Response(content=body, media_type="application/json")
+    
+    body = await agent1_service.render_dashboard(user_id)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/bootstrap")
+async def get_bootstrap(user: dict = Depends(get_current_user)):
+    """
+    Login bootstrap (Protected)
+    
+    One round-trip instead of /onboarding/status + /dashboard + /settings/profile:
+    - onboarding: same body as /onboarding/status
+    - dashboard: same body as /dashboard, or null while onboarding is incomplete
+    - profile: same as /settings/profile's profile, or null if none exists yet
+    """
+    return await agent1_service.get_bootstrap(user["sub"])
 
 
 # =============================================================================
@@ -483,13 +547,8 @@ async def get_settings_profile(user: dict = Depends(get_current_user)):
     """
     user_id = user["sub"]
     
-    try:
-        result = await agent1_service.get_full_profile(user_id)
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    result = await agent1_service.get_full_profile(user_id)
+    return result
 
 
 @router.patch("/settings/profile")
@@ -504,45 +563,62 @@ async def update_settings_profile(
     """
     user_id = user["sub"]
     
-    try:
-        result = await agent1_service.update_profile_fields(
-            user_id=user_id,
-            name=request.name,
-            github_url=request.github_url,
-            linkedin_url=request.linkedin_url
-        )
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    result = await agent1_service.update_profile_fields(
+        user_id=user_id,
+        name=request.name,
+        github_url=request.github_url,
+        linkedin_url=request.linkedin_url
+    )
+    return result
+
+
+@router.post("/settings/resume/presign")
+async def presign_primary_resume(user: dict = Depends(get_current_user)):
+    """
+    Get a signed upload URL for a new primary resume (Protected)
+    
+    The client PUTs the PDF straight to storage with the returned
+    signed_url, then calls POST /settings/resume/uploaded.
+    """
+    user_id = user["sub"]
+    
+    return await agent1_service.create_resume_upload_url(user_id)
+
+
+@router.post("/settings/resume/uploaded")
+async def process_uploaded_resume(user: dict = Depends(get_current_user)):
+    """
+    Process a primary resume uploaded via /settings/resume/presign (Protected)
+    
+    Same result as PUT /settings/resume, without the file in the request.
+    """
+    user_id = user["sub"]
+    
+    return await agent1_service.reprocess_resume(user_id)
 
 
-@router.put("/settings/resume")
+@router.put("/settings/resume", deprecated=True)
 async def update_primary_resume(
+    request: Request,
     file: UploadFile = File(...),
     user: dict = Depends(get_current_user)
 ):
     """
     Upload new primary resume (Protected)
     
+    Deprecated: use POST /settings/resume/presign + /settings/resume/uploaded,
+    which keep the PDF body off the API server.
+    
     Replaces the existing primary resume:
-    - Deletes old resume from S3
-    - Uploads new resume
+    - Uploads new resume (overwrites the old one)
     - Re-processes profile data
     """
     user_id = user["sub"]
     
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(400, "Only PDF files allowed")
+    await _validate_pdf_upload(request, file)
     
-    try:
-        result = await agent1_service.update_primary_resume(file, user_id)
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    result = await agent1_service.update_primary_resume(file, user_id)
+    return result
 
 
 @router.post("/settings/calculate-ats")
@@ -555,10 +631,5 @@ async def calculate_ats_on_demand(user: dict = Depends(get_current_user)):
     """
     user_id = user["sub"]
     
-    try:
-        result = await agent1_service.calculate_ats_on_demand(user_id)
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(500, str(e))
+    result = await agent1_service.calculate_ats_on_demand(user_id)
+    return result
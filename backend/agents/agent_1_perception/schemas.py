@@ -1,8 +1,11 @@
 # backend/agents/agent_1_perception/schemas.py
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 
+# Immutable value objects built in per-item loops (education entries, quiz answers)
+DTO_CONFIG = ConfigDict(frozen=True, extra="ignore")
+
 
 # =============================================================================
 # Skill Metadata Models (Part 3: Verification Layer)
@@ -10,13 +13,29 @@ from datetime import datetime
 
 class SkillMetadata(BaseModel):
     """Rich skill profile with verification status"""
-    source: str  # "resume", "github", "quiz", "manual"
-    verification_status: str = "pending"  # "pending", "verified", "rejected"
+    model_config = DTO_CONFIG
+    
+    # Older rows were written before source/status existed; default them instead of failing validation
+    source: Optional[str] = None  # "resume", "github", "quiz", "manual"
+    verification_status: Optional[str] = "pending"  # "pending", "verified", "rejected"
     level: Optional[str] = None  # "beginner", "intermediate", "advanced", "expert"
     evidence: Optional[str] = None  # Description of how skill was detected
     last_seen: Optional[str] = None  # ISO timestamp of last detection
 
 
+class SkillsMetadataBlock(BaseModel):
+    """
+    skills_metadata as parallel lists (index i describes skill[i]).
+    Returned by GET /profile?layout=columns instead of one object per skill.
+    """
+    skill: List[str]
+    source: List[Optional[str]]
+    status: List[str]
+    level: List[Optional[str]]
+    evidence: List[Optional[str]]
+    last_seen: List[Optional[str]]
+
+
 class ProfileResponse(BaseModel):
     """Response model for user profile"""
     user_id: str
@@ -24,7 +43,7 @@ class ProfileResponse(BaseModel):
     email: Optional[str]
     resume_url: Optional[str]
     skills: List[str]  # Legacy array for backward compatibility
-    skills_metadata: Dict[str, SkillMetadata] = {}  # Rich skill profiles
+    skills_metadata: Union[Dict[str, SkillMetadata], SkillsMetadataBlock] = {}  # Rich skill profiles (block with layout=columns)
     experience_summary: Optional[str]
 
 
@@ -34,6 +53,8 @@ class ProfileResponse(BaseModel):
 
 class EducationItem(BaseModel):
     """Education entry"""
+    model_config = DTO_CONFIG
+    
     institution: str
     degree: str
     course: Optional[str] = None
@@ -67,13 +88,16 @@ class OnboardingStep3Request(BaseModel):
 
 class OnboardingQuizAnswer(BaseModel):
     """Single quiz answer"""
+    model_config = DTO_CONFIG
+    
     question_id: str
     selected_index: int
-    correct_index: int
+    verify_token: str  # Echoed from QuizQuestion
 
 
 class OnboardingQuizSubmission(BaseModel):
     """Submit all 5 quiz answers"""
+    quiz_token: str  # Echoed from OnboardingQuizResponse
     answers: List[OnboardingQuizAnswer]
 
 
@@ -114,15 +138,19 @@ class OnboardingStatusResponse(BaseModel):
 
 class QuizQuestion(BaseModel):
     """Single quiz question for onboarding"""
+    model_config = DTO_CONFIG
+    
     id: str
     question: str
     options: List[str]
-    correct_index: int  # For stateless verification
+    verify_token: str  # HMAC-signed answer for stateless verification
     skill_being_tested: str
 
 
 class OnboardingQuizResponse(BaseModel):
     """5 MCQ questions for onboarding"""
+    quiz_id: str
+    quiz_token: str  # Sent back with the answers
     questions: List[QuizQuestion]
 
 
@@ -209,11 +237,46 @@ class QuizResult(BaseModel):
 # GitHub Sync Models
 # =============================================================================
 
+class DetectedSkill(BaseModel):
+    """Skill found in recent GitHub code"""
+    model_config = DTO_CONFIG
+    
+    skill: str
+    level: Optional[str] = None  # "beginner", "intermediate", "advanced"
+    evidence: Optional[str] = None
+
+
+class GithubAnalysis(BaseModel):
+    """LLM analysis of recent GitHub activity"""
+    detected_skills: List[DetectedSkill] = []
+
+
+class GithubSyncInsights(BaseModel):
+    """Friendly summary of a GitHub sync"""
+    repos_active: List[str] = []
+    main_focus: Optional[str] = None
+    tech_stack: List[str] = []
+    message: Optional[str] = None
+
+
 class GithubSyncResponse(BaseModel):
     """Response from GitHub sync operation"""
     updated_skills: List[str]
-    skills_metadata: Dict[str, Any] = {}
-    analysis: Optional[Dict[str, Any]] = None
+    skills_metadata: Dict[str, SkillMetadata] = {}
+    analysis: Optional[GithubAnalysis] = None
+    repos_touched: List[str] = []
+    latest_sha: Optional[str] = None
+    new_skills: List[str] = []
+    existing_skills_updated: List[str] = []
+    insights: Optional[GithubSyncInsights] = None
+    message: Optional[str] = None
+    from_cache: bool = False
+
+
+class GithubSyncEnvelope(BaseModel):
+    """POST /sync-github body"""
+    status: str
+    data: GithubSyncResponse
 
 
 # =============================================================================
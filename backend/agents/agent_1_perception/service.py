@@ -1,28 +1,64 @@
 # backend/agents/agent_1_perception/service.py
 import os
+import re
+import copy
 import uuid
-import tempfile
-from pathlib import Path
+import random
+import hashlib
+import hmac
+import base64
+import logging
+import asyncio
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from fastapi import UploadFile, HTTPException
-from supabase import create_client
-from pinecone import Pinecone
+from functools import lru_cache, cached_property
+from typing import Optional, List, Dict, Any, Tuple, Callable
+import numpy as np
+import orjson
+from fastapi import UploadFile, HTTPException, BackgroundTasks
+from pinecone import Pinecone, ServerlessSpec
+from postgrest.exceptions import APIError
+from postgrest.types import CountMethod, ReturnMethod
+
+# gRPC client (pinecone[grpc]) is optional; only bulk ingestion uses it
+try:
+    from pinecone.grpc import PineconeGRPC
+    HAS_PINECONE_GRPC = True
+except ImportError:
+    HAS_PINECONE_GRPC = False
+
+from core.db import db_manager
 
 # Import tools
 from .tools import (
     parse_pdf, 
+    parse_pdf_pages,
+    pdf_page_count,
+    PDF_BACKEND,
+    encode_resume_text,
+    decode_resume_text,
+    RESUME_TEXT_COLUMN,
     extract_structured_data, 
-    generate_embedding, 
+    generate_embeddings,
+    EMBEDDING_MODEL,
     upload_resume_to_storage,
+    create_resume_upload_url,
+    download_staged_resume,
+    promote_staged_resume,
+    discard_staged_resume,
     generate_skill_quiz,
     generate_onboarding_questions
 )
 from .github_watchdog import (
-    fetch_user_recent_activity,
-    analyze_code_context,
+    fetch_user_recent_activity_async,
+    analyze_code_context_batch,
     extract_username_from_url,
-    get_latest_commit_sha
+    get_latest_commit_sha_async,
+    fetch_user_sha_and_activity_graphql,
+    probe_events_etag,
+    split_context_by_repo,
+    merge_skill_analyses
 )
 
 # Import ATS scoring from Agent 4
@@ -31,71 +67,592 @@ from agents.agent_4_operative.tools import calculate_ats_score
 # Redis cache integration
 from services.cache_service import cache_service
 
+logger = logging.getLogger("Agent1")
+
+# Read once at import (main.py loads .env before importing routers)
+PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
+PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "career-flow")
+
+PINECONE_POOL_THREADS = 30   # Parallel HTTP connections for async_req upserts
+PINECONE_UPSERT_BATCH = 100  # Vectors per upsert request
+PINECONE_COALESCE_WINDOW = 0.05  # seconds metadata updates wait to be sent together
+BULK_INGEST_CONCURRENCY = 4  # Resumes parsed/extracted at once in bulk_ingest
+EMBED_INPUT_MAX_CHARS = 2000 # ~512 tokens; the embedding model truncates beyond this anyway
+EMBED_BATCH_WINDOW = 0.05    # seconds concurrent embedding requests wait to share one API call
+EMBED_BATCH_MAX = 100        # texts per batchEmbedContents request (API limit)
+SKILL_QUIZ_POOL_SIZE = 5     # questions generated per (skill, level) before they are reused
+# Each uvicorn worker has its own pool, so by default the CPUs are split between them
+PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", "0")) or max(
+    1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY", "1"))
+)
+# Only documents this large are split into page ranges across PDF workers;
+# for a normal resume the per-worker open + IPC costs more than its pages
+PDF_SHARD_MIN_BYTES = 1024 * 1024
+PDF_PAGES_PER_SHARD = 8
+UPLOAD_READ_CHUNK = 1024 * 1024  # Bytes per UploadFile read while hashing a resume
+MAX_RESUME_BYTES = 10 * 1024 * 1024  # 10 MB
+MISSING_COLUMN_CODES = ("42703", "PGRST204")  # PostgREST/Postgres "column does not exist" (filter / write)
+DASHBOARD_GITHUB_TIMEOUT = float(os.getenv("DASHBOARD_GITHUB_TIMEOUT", "2.0"))  # seconds; /dashboard skips GitHub insights past this
+
+# /dashboard fallbacks for users whose today_data has no hot_skills/news yet.
+# Global, so built once at import instead of per request.
+DASHBOARD_TRENDING_SKILLS = ("AI/ML", "Rust", "Go", "Kubernetes", "GraphQL")
+DASHBOARD_FALLBACK_NEWS = [
+    {
+        "title": "AI Skills in High Demand",
+        "summary": "Companies are actively seeking engineers with AI/ML experience",
+        "relevance": "Based on your target roles"
+    },
+    {
+        "title": "Remote Work Trends 2026",
+        "summary": "75% of tech companies now offer remote-first positions",
+        "relevance": "Job market insight"
+    }
+]
+
+# Server-side key for onboarding quiz tokens. Must be shared by all workers/instances:
+# a quiz generated on one worker is often submitted to another
+QUIZ_SIGNING_KEY = (os.getenv("QUIZ_SIGNING_KEY") or os.getenv("SUPABASE_JWT_SECRET") or "").encode()
+if not QUIZ_SIGNING_KEY:
+    raise RuntimeError("QUIZ_SIGNING_KEY or SUPABASE_JWT_SECRET must be set in .env")
+
+
+@lru_cache(maxsize=1)
+def init_pinecone() -> Pinecone:
+    """Process-wide Pinecone client (one connection setup per process)."""
+    return Pinecone(api_key=PINECONE_API_KEY)
+
+
+@lru_cache(maxsize=1)
+def get_index():
+    """Process-wide handle to the profiles index."""
+    return init_pinecone().Index(
+        PINECONE_INDEX_NAME,
+        pool_threads=PINECONE_POOL_THREADS
+    )
+
+
+@lru_cache(maxsize=1)
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Process pool for PDF text extraction. Parsing is CPU-bound pure Python, so
+    threads would serialize on the GIL; only the PDF bytes and the extracted
+    text cross the process boundary. Created on first use, not at import.
+    """
+    return ProcessPoolExecutor(max_workers=PDF_PARSE_WORKERS)
+
+
+async def _parse_pdf(content: bytes) -> str:
+    """
+    Extracts PDF text in the process pool: one task for a normal resume,
+    PDF_PAGES_PER_SHARD-page ranges on separate workers for a large document.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_pdf_pool()
+    if PDF_BACKEND == "pymupdf" and len(content) >= PDF_SHARD_MIN_BYTES:
+        page_count = await asyncio.to_thread(pdf_page_count, content)
+        if page_count > PDF_PAGES_PER_SHARD:
+            parts = await asyncio.gather(*[
+                loop.run_in_executor(
+                    pool, parse_pdf_pages, content, start, min(start + PDF_PAGES_PER_SHARD, page_count)
+                )
+                for start in range(0, page_count, PDF_PAGES_PER_SHARD)
+            ])
+            return "\n".join(parts).strip()
+    return await loop.run_in_executor(pool, parse_pdf, content)
+
+
+@lru_cache(maxsize=1)
+def get_bulk_index():
+    """
+    Index handle for bulk upserts: protobuf over gRPC when pinecone[grpc] is
+    installed, otherwise the shared REST handle. Interactive single-vector
+    writes keep using get_index().
+    """
+    if HAS_PINECONE_GRPC:
+        return PineconeGRPC(api_key=PINECONE_API_KEY).Index(PINECONE_INDEX_NAME)
+    return get_index()
+
+
+def ensure_index(pc: Pinecone, index_name: str, dim: int = 768):
+    """
+    Creates the profiles index if it is missing and returns the shared handle.
+    Indexes are never deleted at runtime, so this only needs to run once at startup.
+    """
+    if index_name not in pc.list_indexes().names():
+        logger.info("[Perception] Creating Pinecone index: %s", index_name)
+        pc.create_index(
+            name=index_name,
+            dimension=dim,
+            metric="cosine",
+            spec=ServerlessSpec(cloud="aws", region="us-east-1")
+        )
+    return get_index()
+
+
+def _build_skills_metadata(skills: List[str], source: str, evidence: str, now: str) -> Dict[str, dict]:
+    """skills_metadata entries for freshly listed (unverified) skills."""
+    return {
+        skill: {
+            "source": source,
+            "verification_status": "pending",
+            "level": None,
+            "evidence": evidence,
+            "last_seen": now
+        }
+        for skill in skills
+    }
+
+
+# List glyphs PDF extraction leaves in resume text; they only cost embedding tokens
+_BULLET_RE = re.compile(r"[•◦▪▫■□●○➢➤►▶‣⁃∙]+")
+
+
+def _prepare_embedding_input(text: str) -> str:
+    """Embedding input: bullet glyphs dropped, whitespace collapsed, clipped to EMBED_INPUT_MAX_CHARS."""
+    return " ".join(_BULLET_RE.sub(" ", text).split())[:EMBED_INPUT_MAX_CHARS]
+
+
+def _without_last_seen(skills_metadata: Dict[str, dict]) -> Dict[str, dict]:
+    """skills_metadata minus the last_seen stamps, for change detection."""
+    return {
+        skill: {k: v for k, v in meta.items() if k != "last_seen"}
+        for skill, meta in skills_metadata.items()
+    }
+
+
+def skills_metadata_columns(skills_metadata: Dict[str, dict]) -> Dict[str, list]:
+    """
+    Reshapes {skill: {source, verification_status, ...}} into parallel lists
+    (one entry per skill, same order) - the SkillsMetadataBlock wire shape.
+    """
+    entries = list(skills_metadata.items())
+    return {
+        "skill": [skill for skill, _ in entries],
+        "source": [meta.get("source") for _, meta in entries],
+        "status": [meta.get("verification_status", "pending") for _, meta in entries],
+        "level": [meta.get("level") for _, meta in entries],
+        "evidence": [meta.get("evidence") for _, meta in entries],
+        "last_seen": [meta.get("last_seen") for _, meta in entries]
+    }
+
+
+# Profile link formats (scheme/www optional, query or fragment allowed)
+_LINKEDIN_URL_RE = re.compile(r"^(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[^/?#\s]+/?(?:[?#]\S*)?$", re.IGNORECASE)
+_LEETCODE_URL_RE = re.compile(r"^(?:https?://)?(?:www\.)?leetcode\.com/(?:u/)?[^/?#\s]+/?(?:[?#]\S*)?$", re.IGNORECASE)
+
+
+def _validate_profile_urls(
+    github_url: Optional[str] = None,
+    linkedin_url: Optional[str] = None,
+    leetcode_url: Optional[str] = None
+) -> None:
+    """400 on a malformed profile link. Empty values (clearing a link) are allowed."""
+    if github_url and not extract_username_from_url(github_url):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid GitHub URL format. Expected: https://github.com/username"
+        )
+    if linkedin_url and not _LINKEDIN_URL_RE.match(linkedin_url.strip()):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid LinkedIn URL format. Expected: https://linkedin.com/in/username"
+        )
+    if leetcode_url and not _LEETCODE_URL_RE.match(leetcode_url.strip()):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid LeetCode URL format. Expected: https://leetcode.com/u/username"
+        )
+
+
+def _quiz_mac(message: str) -> str:
+    digest = hmac.new(QUIZ_SIGNING_KEY, message.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def _quiz_answer_mac(quiz_id: str, question_id: str, index: int) -> str:
+    return _quiz_mac(f"{quiz_id}:{question_id}:{index}")
+
+
+def _quiz_manifest_mac(quiz_id: str, user_id: str, question_ids: List[str]) -> str:
+    # \x1f (unit separator) can't be confused with characters inside an id
+    return _quiz_mac(f"quiz:{quiz_id}:{user_id}:" + "\x1f".join(sorted(question_ids)))
+
+
+def sign_quiz(quiz_id: str, user_id: str, question_ids: List[str]) -> str:
+    """
+    quiz_token issued with an onboarding quiz, binding it to its user and
+    its full set of questions. Format: "<quiz_id>.<HMAC-SHA256(manifest)>".
+    """
+    return f"{quiz_id}.{_quiz_manifest_mac(quiz_id, user_id, question_ids)}"
+
+
+def quiz_matches(quiz_token: str, user_id: str, question_ids: List[str]) -> Optional[str]:
+    """The quiz_id if question_ids are exactly the questions quiz_token was issued to user_id with, else None."""
+    quiz_id, _, mac = quiz_token.partition(".")
+    if not mac or not hmac.compare_digest(mac, _quiz_manifest_mac(quiz_id, user_id, question_ids)):
+        return None
+    return quiz_id
+
+
+def sign_quiz_answer(quiz_id: str, question_id: str, correct_index: int) -> str:
+    """
+    Opaque verify_token sent with a quiz question in place of correct_index.
+    Format: "<quiz_id>.<HMAC-SHA256(quiz_id:question_id:correct_index)>".
+    """
+    return f"{quiz_id}.{_quiz_answer_mac(quiz_id, question_id, correct_index)}"
+
+
+def quiz_answer_matches(verify_token: str, question_id: str, selected_index: int) -> bool:
+    """True if selected_index is the answer the question's verify_token was signed for."""
+    quiz_id, _, mac = verify_token.partition(".")
+    if not mac:
+        return False
+    return hmac.compare_digest(mac, _quiz_answer_mac(quiz_id, question_id, selected_index))
+
+
+async def _read_upload(file: UploadFile) -> Tuple[bytes, str]:
+    """
+    Reads an upload in UPLOAD_READ_CHUNK pieces, hashing each piece as it
+    arrives, so the content hash costs no extra pass over the buffer.
+    Returns (content, hex digest).
+    
+    Raises 413 as soon as the bytes read pass MAX_RESUME_BYTES, whatever
+    the request declared as its size.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    chunks = []
+    size = 0
+    while chunk := await file.read(UPLOAD_READ_CHUNK):
+        size += len(chunk)
+        if size > MAX_RESUME_BYTES:
+            raise HTTPException(413, f"Resume must be under {MAX_RESUME_BYTES // (1024 * 1024)} MB")
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
+def _build_profile_vector(
+    user_id: str,
+    embedding: np.ndarray,
+    name: Optional[str],
+    skills: List[str],
+    target_roles: List[str],
+    experience_summary: Optional[str]
+) -> dict:
+    """
+    Pinecone vector for a user profile (namespace "users").
+    
+    Metadata only carries what readers of the index use (Agent 3 reads
+    name/skills/experience_summary); email, education, links and the
+    resume text/URL live in the Supabase profiles row only. The REST
+    client needs a list, so this is the only place the float32 buffer is
+    converted.
+    """
+    return {
+        "id": user_id,
+        "values": np.asarray(embedding, dtype=np.float32).tolist(),
+        "metadata": {
+            "user_id": user_id,
+            "name": name or "",
+            "skills": skills,
+            "target_roles": target_roles,
+            "experience_summary": experience_summary or "",
+            "onboarding_completed": False,  # True after quiz
+            "quiz_completed": False,
+            "quiz_score": 0,
+            "type": "user_profile"
+        }
+    }
+
+
+class VectorBatcher:
+    """
+    Buffers Pinecone vectors and writes them as parallel batched upserts,
+    instead of one single-vector request per resume.
+    """
+    
+    def __init__(self, index, namespace: str = "users", batch_size: int = PINECONE_UPSERT_BATCH):
+        self.index = index
+        self.namespace = namespace
+        self.batch_size = batch_size
+        self._pending: List[dict] = []
+    
+    def add(self, vector: dict) -> None:
+        self._pending.append(vector)
+    
+    def flush(self) -> int:
+        """Upserts everything buffered (blocking) and returns the number of vectors written."""
+        vectors, self._pending = self._pending, []
+        it = iter(vectors)
+        async_results = [
+            self.index.upsert(vectors=chunk, namespace=self.namespace, async_req=True)
+            for chunk in iter(lambda: list(itertools.islice(it, self.batch_size)), [])
+        ]
+        for result in async_results:
+            # REST returns an ApplyResult (.get), gRPC a future (.result)
+            if hasattr(result, "result"):
+                result.result()
+            else:
+                result.get()
+        return len(vectors)
+
+
+class MetadataUpdateCoalescer:
+    """
+    Collects Pinecone metadata updates arriving within a short window and sends
+    them together as parallel async_req calls on the pooled REST index, off the
+    event loop. Updates to the same id inside one window are merged into a
+    single call. Pinecone's update takes one id, and upsert would replace the
+    stored values, so ids are sent side by side rather than in one request.
+    """
+    
+    def __init__(self, index, namespace: str = "users", window: float = PINECONE_COALESCE_WINDOW):
+        self.index = index
+        self.namespace = namespace
+        self.window = window
+        self._pending: Dict[str, Tuple[dict, List[asyncio.Future]]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def update(self, id: str, set_metadata: dict) -> None:
+        """Queues a metadata update and waits until the batch holding it is written."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        metadata, waiters = self._pending.setdefault(id, ({}, []))
+        metadata.update(set_metadata)
+        waiters.append(future)
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_after_window())
+        await future
+    
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        errors = await asyncio.to_thread(self._send, {id: md for id, (md, _) in pending.items()})
+        for id, (_, waiters) in pending.items():
+            for future in waiters:
+                if future.done():
+                    continue
+                if id in errors:
+                    future.set_exception(errors[id])
+                else:
+                    future.set_result(None)
+    
+    def _send(self, updates: Dict[str, dict]) -> Dict[str, Exception]:
+        """Dispatches every update at once (blocking) and returns failures by id."""
+        errors: Dict[str, Exception] = {}
+        async_results = {}
+        for id, metadata in updates.items():
+            try:
+                async_results[id] = self.index.update(
+                    id=id, set_metadata=metadata, namespace=self.namespace, async_req=True
+                )
+            except Exception as e:
+                errors[id] = e
+        for id, result in async_results.items():
+            try:
+                result.get()
+            except Exception as e:
+                errors[id] = e
+        return errors
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batches embedding requests: texts submitted within EMBED_BATCH_WINDOW
+    of each other (up to EMBED_BATCH_MAX) go out as one batchEmbedContents call
+    off the event loop, and each caller gets its own row back. Concurrent
+    resume uploads then share a round-trip instead of paying one each.
+    """
+    
+    def __init__(self, window: float = EMBED_BATCH_WINDOW, max_batch: int = EMBED_BATCH_MAX):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def submit(self, text: str) -> np.ndarray:
+        """
+        Returns the embedding for one text, normalized by _prepare_embedding_input:
+        from the Redis content-hash cache when that input was embedded before,
+        otherwise queued into the next batch and cached once embedded.
+        """
+        text = _prepare_embedding_input(text)
+        content_hash = hashlib.sha256(text.encode()).hexdigest()
+        cached = await asyncio.to_thread(cache_service.get_embedding, EMBEDDING_MODEL, content_hash)
+        if cached is not None:
+            return np.asarray(cached, dtype=np.float32)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_after_window())
+        vector = await future
+        await asyncio.to_thread(cache_service.set_embedding, EMBEDDING_MODEL, content_hash, vector.tolist())
+        return vector
+    
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, []
+        self._flush_task = None
+        await asyncio.gather(*[
+            self._embed(pending[i:i + self.max_batch])
+            for i in range(0, len(pending), self.max_batch)
+        ])
+    
+    @staticmethod
+    async def _embed(batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            vectors = await asyncio.to_thread(generate_embeddings, [text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
 
 class PerceptionService:
+    # Cleared on the first PGRST202 if the merge_skills_metadata / watchdog_sync functions aren't installed
+    _merge_rpc_available = True
+    _watchdog_rpc_available = True
+    # Cleared on the first missing-column error if profiles.resume_hash hasn't been added
+    _resume_hash_available = True
+
     def __init__(self):
-        self.supabase_url = os.getenv("SUPABASE_URL")
-        self.supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        self.supabase = create_client(self.supabase_url, self.supabase_key)
-        
-        # Init Pinecone
-        self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        self.index_name = os.getenv("PINECONE_INDEX_NAME", "career-flow")
-        self.index = self.pc.Index(self.index_name)
+        self.index_name = PINECONE_INDEX_NAME
+
+    # Shared clients: one Supabase / Pinecone connection setup per process, made on
+    # first use rather than when the module-level agent1_service is imported
+
+    @cached_property
+    def supabase(self):
+        return db_manager.get_client()
+
+    @cached_property
+    def pc(self) -> Pinecone:
+        return init_pinecone()
+
+    @cached_property
+    def index(self):
+        # Index() resolves the host with a control-plane call
+        return get_index()
+
+    @cached_property
+    def _metadata_updates(self) -> MetadataUpdateCoalescer:
+        return MetadataUpdateCoalescer(self.index)
+
+    @cached_property
+    def _embeddings(self) -> EmbeddingBatcher:
+        return EmbeddingBatcher()
+
+    async def warm_up(self) -> None:
+        """
+        Startup warm-up: one-shot Pinecone index probe plus a Supabase round-trip,
+        run concurrently, so neither lands on the first user request.
+        """
+        await asyncio.gather(
+            asyncio.to_thread(ensure_index, self.pc, self.index_name),
+            asyncio.to_thread(db_manager.warm_up)
+        )
 
     # =========================================================================
     # RESUME PROCESSING
     # =========================================================================
     
-    async def process_resume_upload(self, file: UploadFile, user_id: str) -> dict:
+    async def process_resume_upload(
+        self,
+        file: UploadFile,
+        user_id: str,
+        vector_batcher: Optional[VectorBatcher] = None
+    ) -> dict:
         """
-        Handles the full flow: PDF Save -> Parse -> Gemini -> DB -> Pinecone
+        Handles the full flow: PDF Read -> Parse -> Gemini -> DB -> Pinecone
         Now also initializes skills_metadata for resume-extracted skills.
-        """
-        # 1. Save File Temporarily
-        temp_dir = Path(tempfile.gettempdir()) / "agent1_uploads"
-        temp_dir.mkdir(exist_ok=True)
-        pdf_path = temp_dir / f"{user_id}_{file.filename}"
         
-        with open(pdf_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        The upload is read into memory once and that buffer feeds both the
+        storage upload and the parser - nothing touches the disk. If the
+        profile already holds a resume with the same content hash, the stored
+        profile is returned without any parsing, LLM, embedding or writes.
+        
+        If a vector_batcher is given, the Pinecone write is buffered on it
+        (see bulk_ingest) instead of being upserted immediately.
+        """
+        # 1. Read the upload once (hashed chunk by chunk on the way in)
+        content, resume_hash = await _read_upload(file)
+        return await self._process_resume_bytes(
+            content, user_id,
+            store=lambda: upload_resume_to_storage(content, user_id),
+            vector_batcher=vector_batcher,
+            resume_hash=resume_hash
+        )
+
+    async def _process_resume_bytes(
+        self,
+        content: bytes,
+        user_id: str,
+        store: Callable[[], Optional[str]],
+        vector_batcher: Optional[VectorBatcher] = None,
+        resume_hash: Optional[str] = None
+    ) -> dict:
+        """
+        Resume pipeline on in-memory PDF bytes. `store` is the (blocking)
+        storage step returning the resume URL; it runs in a thread alongside
+        parsing and extraction. resume_hash is computed here unless the
+        caller already hashed the bytes.
+        """
+        if resume_hash is None:
+            resume_hash = hashlib.blake2b(content, digest_size=16).hexdigest()
 
+        # 2. Parse (in the process pool) while the re-upload lookup is in flight;
+        # the parse is only thrown away when the resume turns out to be unchanged
+        parse_task = asyncio.create_task(_parse_pdf(content))
+        upload_task = ats_task = None
         try:
-            # 2. Upload to Storage (Long-term)
-            resume_url = upload_resume_to_storage(str(pdf_path), user_id)
+            # Identical re-upload: nothing to re-embed or re-write
+            if self._resume_hash_available:
+                try:
+                    existing = await asyncio.to_thread(
+                        lambda: self.supabase.table("profiles").select("*")
+                            .eq("user_id", user_id).eq("resume_hash", resume_hash).execute()
+                    )
+                    if existing.data:
+                        logger.info("[Agent 1] Resume unchanged for %s, reusing stored profile", user_id)
+                        return existing.data[0]
+                except APIError as e:
+                    if e.code not in MISSING_COLUMN_CODES:
+                        raise
+                    logger.warning("[Agent 1] profiles.resume_hash not added, re-upload short-circuit disabled")
+                    PerceptionService._resume_hash_available = False
+
+            # 3. Upload to Storage (Long-term) in the background - nothing below depends on it
+            upload_task = asyncio.create_task(asyncio.to_thread(store))
 
-            # 3. Parse & Extract
-            resume_text = parse_pdf(str(pdf_path))
-            extracted_data = extract_structured_data(resume_text)
+            # Extract (blocking SDK call, run off the event loop) once the text is in
+            resume_text = await parse_task
+            # ATS scoring only needs the text: run that LLM call alongside extraction
+            ats_task = asyncio.create_task(self._score_resume(user_id, resume_text))
+            extracted_data = await asyncio.to_thread(extract_structured_data, resume_text)
             
-            # 4. Generate Vector
-            summary = extracted_data.get("experience_summary", resume_text[:500])
-            embedding = generate_embedding(summary)
+            # 4. Generate Vector, overlapping with the rest of the upload
+            summary = extracted_data.get("experience_summary") or resume_text[:500]
+            embed_task = asyncio.create_task(
+                self._embeddings.submit(summary)
+            )
+            resume_url, embedding = await asyncio.gather(upload_task, embed_task)
 
             # 5. Build skills_metadata from extracted skills
             skills_list = extracted_data.get("skills", [])
             now = datetime.utcnow().isoformat()
             
-            skills_metadata = {}
-            for skill in skills_list:
-                skills_metadata[skill] = {
-                    "source": "resume",
-                    "verification_status": "pending",
-                    "level": None,
-                    "evidence": "Listed in resume",
-                    "last_seen": now
-                }
+            skills_metadata = _build_skills_metadata(skills_list, "resume", "Listed in resume", now)
 
-            # 6. Calculate ATS Score for primary resume
-            print(f"📊 [Agent 1] Calculating ATS score for user: {user_id}")
-            try:
-                ats_result = await calculate_ats_score(resume_text)
-                ats_score = ats_result.get("score", 0)
-                print(f"✅ [Agent 1] ATS Score: {ats_score}")
-            except Exception as e:
-                print(f"⚠️ [Agent 1] ATS scoring failed: {e}")
-                ats_score = 0
+            # 6. ATS Score for primary resume (started after parsing)
+            ats_score = await ats_task
 
             # 7. Prepare DB Record (Supabase Profiles)
             profile_data = {
@@ -107,43 +664,117 @@ class PerceptionService:
                 "experience_summary": summary,
                 "education": extracted_data.get("education"),
                 "resume_json": extracted_data,
-                "resume_text": resume_text,
+                **encode_resume_text(resume_text),
                 "resume_url": resume_url,
                 "ATS_SCORE": str(ats_score),  # Save ATS score as TEXT
             }
+            if self._resume_hash_available:
+                profile_data["resume_hash"] = resume_hash  # BLAKE2b of the PDF bytes, for re-upload short-circuit
 
-            # 7. Upsert to DB
-            self.supabase.table("profiles").upsert(profile_data).execute()
-
-            # 8. Upsert to Pinecone (full profile schema)
-            vector_data = {
-                "id": user_id, 
-                "values": embedding,
-                "metadata": {
-                    "user_id": user_id,
-                    "name": extracted_data.get("name") or "",
-                    "email": extracted_data.get("email") or "",
-                    "skills": skills_list,
-                    "target_roles": [],  # Will be set during onboarding
-                    "education": str(extracted_data.get("education") or []),
-                    "experience_summary": summary,
-                    "github_url": "",
-                    "linkedin_url": "",
-                    "resume_text": resume_text[:1000] if resume_text else "",  # Truncate for metadata limits
-                    "resume_url": resume_url or "",
-                    "onboarding_completed": False,
-                    "quiz_completed": False,
-                    "quiz_score": 0,
-                    "type": "user_profile"
-                }
-            }
-            self.index.upsert(vectors=[vector_data], namespace="users")
+            # 8. Build Pinecone vector (full profile schema)
+            vector_data = _build_profile_vector(
+                user_id, embedding,
+                name=extracted_data.get("name"),
+                skills=skills_list,
+                target_roles=[],  # Will be set during onboarding
+                experience_summary=summary
+            )
+
+            # 9. Write DB row and vector - the two stores are independent, so upsert them concurrently.
+            db_task = asyncio.to_thread(self._upsert_profile, profile_data)
+            if vector_batcher is not None:
+                vector_batcher.add(vector_data)
+                await db_task
+            else:
+                pine_task = asyncio.to_thread(
+                    lambda: self.index.upsert(vectors=[vector_data], namespace="users")
+                )
+                await asyncio.gather(db_task, pine_task)
+            cache_service.invalidate_profile_views(user_id)
 
             return profile_data
 
         finally:
-            if os.path.exists(pdf_path):
-                os.remove(pdf_path)
+            if not parse_task.done():
+                parse_task.cancel()
+            # Don't leave the upload running unobserved if a later step failed
+            if upload_task is not None and not upload_task.done():
+                await asyncio.gather(upload_task, return_exceptions=True)
+            if ats_task is not None and not ats_task.done():
+                ats_task.cancel()
+
+    def _upsert_profile(self, profile_data: dict) -> None:
+        """
+        Blocking profiles upsert (return=minimal: PostgREST would otherwise
+        echo the whole row, resume text included, back). Retries without
+        resume_hash when that column hasn't been added yet.
+        """
+        def upsert():
+            self.supabase.table("profiles").upsert(
+                profile_data, on_conflict="user_id", returning=ReturnMethod.minimal
+            ).execute()
+        try:
+            upsert()
+        except APIError as e:
+            if e.code not in MISSING_COLUMN_CODES or "resume_hash" not in profile_data:
+                raise
+            logger.warning("[Agent 1] profiles.resume_hash not added, saving profile without it")
+            PerceptionService._resume_hash_available = False
+            del profile_data["resume_hash"]
+            upsert()
+
+    async def _score_resume(self, user_id: str, resume_text: str) -> int:
+        """
+        ATS score for a primary resume (0 if scoring fails). Scores are cached
+        by the SHA-256 of the resume text, so re-uploads skip the LLM call.
+        """
+        content_hash = hashlib.sha256(resume_text.encode()).hexdigest()
+        cached = await asyncio.to_thread(cache_service.get_ats_score, content_hash)
+        if cached is not None:
+            logger.info("✅ [Agent 1] ATS Score (cached): %s", cached)
+            return cached
+        
+        logger.info("📊 [Agent 1] Calculating ATS score for user: %s", user_id)
+        try:
+            ats_result = await calculate_ats_score(resume_text)
+            ats_score = ats_result.get("score", 0)
+            logger.info("✅ [Agent 1] ATS Score: %s", ats_score)
+            if ats_score:  # 0 is also what a failed analysis returns - don't pin it
+                await asyncio.to_thread(cache_service.set_ats_score, content_hash, ats_score)
+            return ats_score
+        except Exception as e:
+            logger.warning("⚠️ [Agent 1] ATS scoring failed: %s", e)
+            return 0
+
+    async def bulk_ingest(self, resumes: List[Tuple[UploadFile, str]]) -> List[dict]:
+        """
+        Processes many (file, user_id) resumes for back-fills.
+        
+        Resumes run through the normal pipeline BULK_INGEST_CONCURRENCY at a
+        time, and their vectors are written at the end in batched, parallel
+        Pinecone upserts (over gRPC when pinecone[grpc] is installed).
+        
+        Returns:
+            One profile dict per resume, or {"user_id", "error"} if it failed
+        """
+        batcher = VectorBatcher(get_bulk_index())
+        semaphore = asyncio.Semaphore(BULK_INGEST_CONCURRENCY)
+        
+        async def _ingest(file: UploadFile, user_id: str) -> dict:
+            async with semaphore:
+                return await self.process_resume_upload(file, user_id, vector_batcher=batcher)
+        
+        results = await asyncio.gather(
+            *[_ingest(file, user_id) for file, user_id in resumes],
+            return_exceptions=True
+        )
+        upserted = await asyncio.to_thread(batcher.flush)
+        logger.info("📦 [Agent 1] Bulk ingest: %s resumes, %s vectors upserted", len(resumes), upserted)
+        
+        return [
+            {"user_id": user_id, "error": str(result)} if isinstance(result, Exception) else result
+            for (_, user_id), result in zip(resumes, results)
+        ]
 
     # =========================================================================
     # PROFILE SETTINGS UPDATES
@@ -168,6 +799,8 @@ class PerceptionService:
         Returns:
             Updated profile data
         """
+        _validate_profile_urls(github_url=github_url, linkedin_url=linkedin_url)
+        
         update_data = {}
         updated_fields = []
         
@@ -176,14 +809,6 @@ class PerceptionService:
             updated_fields.append("name")
         
         if github_url is not None:
-            # Validate GitHub URL format
-            if github_url:  # Only validate if not empty
-                username = extract_username_from_url(github_url)
-                if not username:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Invalid GitHub URL format. Expected: https://github.com/username"
-                    )
             update_data["github_url"] = github_url
             updated_fields.append("github_url")
         
@@ -197,19 +822,17 @@ class PerceptionService:
         # Add timestamp
         update_data["updated_at"] = datetime.utcnow().isoformat()
         
-        # Update database
-        self.supabase.table("profiles").update(update_data).eq("user_id", user_id).execute()
-        
-        # Update Pinecone metadata if name changed
+        # Update database, and Pinecone metadata alongside it if name changed
+        db_write = asyncio.to_thread(
+            lambda: self.supabase.table("profiles").update(
+                update_data, returning=ReturnMethod.minimal
+            ).eq("user_id", user_id).execute()
+        )
         if name:
-            try:
-                self.index.update(
-                    id=user_id,
-                    set_metadata={"name": name},
-                    namespace="users"
-                )
-            except Exception as e:
-                print(f"[Profile] Pinecone update warning: {e}")
+            await asyncio.gather(db_write, self._sync_index_metadata(user_id, {"name": name}, "[Profile]"))
+        else:
+            await db_write
+        cache_service.invalidate_profile_views(user_id)
         
         return {
             "status": "success", 
@@ -222,9 +845,9 @@ class PerceptionService:
         """
         Replace user's primary resume.
         
-        - Deletes old resume from S3
-        - Uploads new resume
+        - Uploads new resume (overwrites {user_id}.pdf in storage)
         - Re-processes and updates profile
+        - Identical re-uploads are a no-op (see process_resume_upload)
         
         Args:
             file: New resume PDF file
@@ -233,20 +856,43 @@ class PerceptionService:
         Returns:
             Updated profile data
         """
-        # 1. Get current resume_url to delete old file
-        response = self.supabase.table("profiles").select("resume_url").eq("user_id", user_id).execute()
+        # The storage upload upserts the same object key, so the old file needs no separate delete
+        result = await self.process_resume_upload(file, user_id)
         
-        if response.data and response.data[0].get("resume_url"):
-            # Delete old file from storage
-            old_file = f"{user_id}.pdf"
-            try:
-                self.supabase.storage.from_("Resume").remove([old_file])
-                print(f"[Resume] Deleted old primary resume: {old_file}")
-            except Exception as e:
-                print(f"[Resume] Warning: Could not delete old file: {e}")
+        return {
+            "status": "success",
+            "message": "Primary resume updated successfully",
+            "resume_url": result.get("resume_url"),
+            "profile": result
+        }
+    
+    async def create_resume_upload_url(self, user_id: str) -> dict:
+        """
+        Signed upload URL for a direct client -> storage upload of a new
+        primary resume. Follow up with reprocess_resume once the PUT is done.
+        """
+        return await asyncio.to_thread(create_resume_upload_url, user_id)
+    
+    async def reprocess_resume(self, user_id: str) -> dict:
+        """
+        Processes a resume the client uploaded through create_resume_upload_url.
         
-        # 2. Process new resume (reuse existing method)
-        result = await self.process_resume_upload(file, user_id)
+        The staged object is read once for parsing and moved into place as
+        {user_id}.pdf inside storage - the PDF never passes through the API
+        request body.
+        """
+        try:
+            content = await asyncio.to_thread(download_staged_resume, user_id)
+        except Exception as e:
+            raise HTTPException(status_code=404, detail=f"No uploaded resume found: {e}")
+        
+        try:
+            result = await self._process_resume_bytes(
+                content, user_id, store=lambda: promote_staged_resume(user_id)
+            )
+        finally:
+            # Already moved on success; an unchanged or failed upload leaves it behind
+            await asyncio.to_thread(discard_staged_resume, user_id)
         
         return {
             "status": "success",
@@ -261,7 +907,9 @@ class PerceptionService:
         
         Returns all profile fields including resume URLs.
         """
-        response = self.supabase.table("profiles").select("*").eq("user_id", user_id).execute()
+        response = await asyncio.to_thread(
+            lambda: self.supabase.table("profiles").select("*").eq("user_id", user_id).execute()
+        )
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Profile not found")
@@ -296,14 +944,14 @@ class PerceptionService:
         """
         # 1. Fetch resume_text from profile
         response = self.supabase.table("profiles").select(
-            "resume_text, ATS_SCORE"
+            f"{RESUME_TEXT_COLUMN}, ATS_SCORE"
         ).eq("user_id", user_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Profile not found")
         
         profile = response.data[0]
-        resume_text = profile.get("resume_text")
+        resume_text = decode_resume_text(profile)
         existing_score = profile.get("ATS_SCORE")
         
         # If score already exists, just return it
@@ -323,13 +971,13 @@ class PerceptionService:
             }
         
         # 2. Calculate ATS score
-        print(f"📊 [Agent 1] Calculating ATS score on demand for user: {user_id}")
+        logger.info("📊 [Agent 1] Calculating ATS score on demand for user: %s", user_id)
         try:
             ats_result = await calculate_ats_score(resume_text)
             ats_score = ats_result.get("score", 0)
-            print(f"✅ [Agent 1] ATS Score calculated: {ats_score}")
+            logger.info("✅ [Agent 1] ATS Score calculated: %s", ats_score)
         except Exception as e:
-            print(f"⚠️ [Agent 1] ATS scoring failed: {e}")
+            logger.warning("⚠️ [Agent 1] ATS scoring failed: %s", e)
             return {
                 "status": "error",
                 "ats_score": None,
@@ -339,7 +987,7 @@ class PerceptionService:
         # 3. Save to database
         self.supabase.table("profiles").update({
             "ATS_SCORE": str(ats_score)
-        }).eq("user_id", user_id).execute()
+        }, returning=ReturnMethod.minimal).eq("user_id", user_id).execute()
         
         return {
             "status": "success",
@@ -359,16 +1007,12 @@ class PerceptionService:
         target_roles: Optional[List[str]] = None
     ) -> dict:
         """Updates user profile with onboarding information."""
+        _validate_profile_urls(github_url=github_url, linkedin_url=linkedin_url)
+        
         update_data = {}
         updated_fields = []
         
         if github_url is not None:
-            username = extract_username_from_url(github_url)
-            if not username:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid GitHub URL format. Expected: https://github.com/username"
-                )
             update_data["github_url"] = github_url
             updated_fields.append("github_url")
             
@@ -383,15 +1027,196 @@ class PerceptionService:
         if not update_data:
             return {"status": "no_changes", "updated_fields": [], "user_id": user_id}
         
-        self.supabase.table("profiles").update(update_data).eq("user_id", user_id).execute()
+        self.supabase.table("profiles").update(update_data, returning=ReturnMethod.minimal).eq("user_id", user_id).execute()
+        cache_service.invalidate_profile_views(user_id)
         
         return {"status": "success", "updated_fields": updated_fields, "user_id": user_id}
 
+    async def _get_profile(
+        self,
+        user_id: str,
+        fields: str,
+        cache: Optional[Dict[str, dict]] = None
+    ) -> Optional[dict]:
+        """
+        Read a profiles row, memoized by user_id for the lifetime of one request.
+
+        Callers that touch the same profile more than once share a `cache` dict so
+        the row is SELECTed once. A cached row is reused only if it already holds
+        every requested column; otherwise it is re-read and merged in.
+        Returns None when the user has no profile.
+        """
+        wanted = [f.strip() for f in fields.split(",")]
+        if cache is not None:
+            row = cache.get(user_id)
+            if row is not None and all(f in row for f in wanted):
+                return row
+
+        response = await asyncio.to_thread(
+            lambda: self.supabase.table("profiles").select(fields).eq("user_id", user_id).execute()
+        )
+        if not response.data:
+            return None
+
+        row = response.data[0]
+        if cache is not None:
+            row = {**cache.get(user_id, {}), **row}
+            cache[user_id] = row
+        return row
+
+    async def _save_skills(
+        self,
+        user_id: str,
+        profile_update: dict,
+        log_tag: str,
+        sync_index: bool = True,
+        metadata_patch: Optional[Dict[str, dict]] = None
+    ) -> None:
+        """
+        Writes a skills / skills_metadata change to profiles, drops the cached
+        views of it and mirrors the skills list into Pinecone metadata
+        (unless sync_index is False, i.e. the list itself is unchanged). The
+        two stores are written concurrently.
+        Scheduled as a background task when the response doesn't wait on it.
+        
+        With `metadata_patch` ({skill: changed fields}) only the patch is sent and
+        Postgres merges it into the stored row, so concurrent writers to other
+        skills or fields aren't overwritten. That needs the merge_skills_metadata
+        function from backend/sql/merge_skills_metadata.sql in the DB; without
+        it the full profile_update is written instead.
+        """
+        index_sync = (
+            self._sync_index_metadata(user_id, {"skills": profile_update["skills"]}, log_tag)
+            if sync_index else asyncio.sleep(0)
+        )
+        await asyncio.gather(
+            self._write_skills_row(user_id, profile_update, log_tag, metadata_patch),
+            index_sync
+        )
+        cache_service.invalidate_profile_views(user_id)
+
+    async def _write_skills_row(
+        self,
+        user_id: str,
+        profile_update: dict,
+        log_tag: str,
+        metadata_patch: Optional[Dict[str, dict]]
+    ) -> None:
+        """profiles leg of _save_skills: merge RPC when available, else a full update."""
+        merged = False
+        if metadata_patch and self._merge_rpc_available:
+            try:
+                await asyncio.to_thread(
+                    lambda: self.supabase.rpc(
+                        "merge_skills_metadata", {"uid": user_id, "patch": metadata_patch}
+                    ).execute()
+                )
+                merged = True
+            except APIError as e:
+                if e.code != "PGRST202":
+                    raise
+                logger.warning("%s merge_skills_metadata not installed, writing full skills_metadata", log_tag)
+                PerceptionService._merge_rpc_available = False
+        
+        if not merged:
+            await asyncio.to_thread(
+                lambda: self.supabase.table("profiles").update(
+                    profile_update, returning=ReturnMethod.minimal
+                ).eq("user_id", user_id).execute()
+            )
+
+    async def _sync_index_metadata(self, user_id: str, set_metadata: dict, log_tag: str) -> None:
+        """Mirrors profile fields into the user's Pinecone metadata; failures only warn."""
+        try:
+            await self._metadata_updates.update(user_id, set_metadata)
+        except Exception as e:
+            logger.warning("%s Pinecone update warning: %s", log_tag, e)
+
+    async def _save_watchdog_scan(
+        self,
+        user_id: str,
+        profile_update: dict,
+        metadata_patch: Optional[Dict[str, dict]],
+        sync_index: bool,
+        cache_data: Optional[dict]
+    ) -> None:
+        """
+        Writes a watchdog scan: the skills change (or just the scan time when
+        metadata_patch is None) and the github_activity_cache row, in one
+        round-trip and one transaction through the watchdog_sync function from
+        backend/sql/watchdog_sync.sql (which builds on merge_skills_metadata).
+        Without it, falls back to _save_skills and a separate cache upsert.
+        """
+        if self._watchdog_rpc_available and self._merge_rpc_available:
+            index_sync = (
+                self._sync_index_metadata(user_id, {"skills": profile_update["skills"]}, "[Watchdog]")
+                if sync_index else asyncio.sleep(0)
+            )
+            try:
+                await asyncio.gather(
+                    asyncio.to_thread(
+                        lambda: self.supabase.rpc(
+                            "watchdog_sync", {"uid": user_id, "patch": metadata_patch, "cache": cache_data}
+                        ).execute()
+                    ),
+                    index_sync
+                )
+                cache_service.invalidate_profile_views(user_id)
+                if cache_data:
+                    logger.info("[Watchdog] ✓ Cache SAVED for SHA %s", cache_data["last_analyzed_sha"][:7])
+                return
+            except APIError as e:
+                if e.code != "PGRST202":
+                    raise
+                logger.warning("[Watchdog] watchdog_sync not installed, writing skills and cache separately")
+                PerceptionService._watchdog_rpc_available = False
+                sync_index = False  # already mirrored alongside the failed call
+        
+        writes = [self._save_skills(
+            user_id, profile_update, "[Watchdog]", sync_index=sync_index, metadata_patch=metadata_patch
+        )]
+        if cache_data:
+            writes.append(asyncio.to_thread(self._save_github_activity_cache, cache_data))
+        await asyncio.gather(*writes)
+
+    def _save_github_activity_cache(self, cache_data: dict) -> None:
+        """Upserts the user's github_activity_cache row (blocking; one round-trip)."""
+        try:
+            self.supabase.table("github_activity_cache").upsert(
+                cache_data,
+                on_conflict="user_id"
+            ).execute()
+            cache_service.invalidate_dashboard(cache_data["user_id"])
+            logger.info("[Watchdog] ✓ Cache SAVED for SHA %s", cache_data["last_analyzed_sha"][:7])
+        except Exception as e:
+            logger.warning("[Watchdog] ⚠️ Cache write warning: %s", e)
+
     # =========================================================================
     # GITHUB WATCHDOG (Refactored for skills_metadata)
     # =========================================================================
     
-    async def run_github_watchdog(self, user_id: str) -> Optional[dict]:
+    async def prefetch_github_activity(self, user_id: str) -> None:
+        """
+        Runs the GitHub watchdog off the request path (scheduled via BackgroundTasks).
+        
+        Fills github_activity_cache so the user's next /sync-github is a cache hit
+        instead of a full GitHub scrape + LLM analysis.
+        """
+        try:
+            await self.run_github_watchdog(user_id)
+        except HTTPException as e:
+            # No profile / GitHub URL yet - nothing to prefetch
+            logger.warning("[Watchdog] Prefetch skipped for %s: %s", user_id, e.detail)
+        except Exception as e:
+            logger.warning("[Watchdog] Prefetch failed for %s: %s", user_id, e)
+
+    async def run_github_watchdog(
+        self,
+        user_id: str,
+        _preloaded_profile: Optional[dict] = None,
+        preloaded_activity: Optional[dict] = None,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> Optional[dict]:
         """
         Scans user's GitHub activity stream for skill analysis.
         
@@ -400,16 +1225,27 @@ class PerceptionService:
         - New skills: source="github", verification_status="pending"
         - Existing skills: Updates evidence and last_seen
         - Syncs skills_metadata keys to legacy skills array
+
+        `_preloaded_profile` lets a caller that already read github_url, skills and
+        skills_metadata for this user skip the profiles SELECT, and
+        `preloaded_activity` (from fetch_user_sha_and_activity_graphql) skips the
+        GitHub poll when the caller already made it. With `background_tasks` the
+        profile, Pinecone and cache writes run after the response is sent.
         """
-        # 1. Get user's profile from database
-        response = self.supabase.table("profiles").select(
-            "github_url, skills, skills_metadata"
-        ).eq("user_id", user_id).execute()
+        # 1. Get user's profile and cached analysis from database (independent reads, run together)
+        profile_cache = {user_id: _preloaded_profile} if _preloaded_profile is not None else {}
+        profile, cache_response = await asyncio.gather(
+            self._get_profile(user_id, "github_url, skills, skills_metadata", profile_cache),
+            asyncio.to_thread(
+                lambda: self.supabase.table("github_activity_cache").select(
+                    "last_analyzed_sha, detected_skills, repos_touched, tech_stack, insight_message, analyzed_at"
+                ).eq("user_id", user_id).execute()
+            )
+        )
         
-        if not response.data:
+        if not profile:
             raise HTTPException(status_code=404, detail="Profile not found. Please upload your resume first.")
         
-        profile = response.data[0]
         github_url = profile.get("github_url")
         current_skills = profile.get("skills") or []
         current_metadata = profile.get("skills_metadata") or {}
@@ -425,25 +1261,26 @@ class PerceptionService:
         if not username:
             raise HTTPException(status_code=400, detail=f"Invalid GitHub URL format: {github_url}")
         
-        # 3. Get current SHA from GitHub (quick check)
-        current_sha = get_latest_commit_sha(username)
+        cache = cache_response.data[0] if cache_response.data else None
+        cached_sha = cache.get("last_analyzed_sha") if cache else None
         
-        # 4. CHECK CACHE: If SHA matches cached SHA, return cached insights instantly
-        cache_response = self.supabase.table("github_activity_cache").select(
-            "last_analyzed_sha, detected_skills, repos_touched, tech_stack, insight_message, analyzed_at"
-        ).eq("user_id", user_id).execute()
+        # 3. Get current SHA (and, if it moved, the new code) in one GraphQL call;
+        # the REST Events path is only used if GraphQL is unavailable
+        activity = preloaded_activity or await fetch_user_sha_and_activity_graphql(username, known_sha=cached_sha)
+        if activity:
+            current_sha = activity.get("latest_sha")
+        else:
+            current_sha = await get_latest_commit_sha_async(username)
         
-        if cache_response.data and len(cache_response.data) > 0:
-            cache = cache_response.data[0]
-            cached_sha = cache.get("last_analyzed_sha")
-            
+        # 4. CHECK CACHE: If SHA matches cached SHA, return cached insights instantly
+        if cache:
             if cached_sha and current_sha and cached_sha == current_sha:
-                print(f"[Watchdog] ✓ Cache HIT - SHA unchanged ({cached_sha[:7]}), returning cached insights")
+                logger.info("[Watchdog] ✓ Cache HIT - SHA unchanged (%s), returning cached insights", cached_sha[:7])
                 
                 # Return cached data
                 cached_skills = cache.get("detected_skills") or []
                 # Extract skill names from cached skills for display
-                cached_skill_names = [s.get("skill") for s in cached_skills if s.get("skill")]
+                cached_skill_names = [name for s in cached_skills if (name := s.get("skill"))]
                 
                 return {
                     "updated_skills": current_skills,
@@ -462,13 +1299,14 @@ class PerceptionService:
                     "from_cache": True
                 }
         
-        print(f"[Watchdog] Cache MISS - Running fresh analysis for user: {username}")
+        logger.info("[Watchdog] Cache MISS - Running fresh analysis for user: %s", username)
         
-        # 5. Fetch recent activity from Events API
-        activity = fetch_user_recent_activity(username)
+        # 5. Fetch recent activity from Events API unless the GraphQL poll already brought it
+        if not activity or not activity.get("recent_code_context"):
+            activity = await fetch_user_recent_activity_async(username, head_sha=current_sha)
         
         if not activity or not activity.get("recent_code_context"):
-            print(f"[Watchdog] No recent code activity found for {username}")
+            logger.info("[Watchdog] No recent code activity found for %s", username)
             return {
                 "updated_skills": current_skills,
                 "skills_metadata": current_metadata,
@@ -478,8 +1316,9 @@ class PerceptionService:
                 "insights": None
             }
         
-        # 4. Analyze the code context
-        analysis = analyze_code_context(activity["recent_code_context"])
+        # 4. Analyze each repo's code concurrently, then merge (max level per skill)
+        repo_contexts = split_context_by_repo(activity["recent_code_context"])
+        analysis = merge_skill_analyses(await analyze_code_context_batch(repo_contexts))
         
         if not analysis:
             return {
@@ -495,21 +1334,27 @@ class PerceptionService:
         now = datetime.utcnow().isoformat()
         detected_skills = analysis.get('detected_skills', [])
         
-        # Track NEW skills (not in current profile)
+        # Snapshot to tell a real change from a re-detection of the same skills
+        original_metadata = copy.deepcopy(current_metadata)
+        
+        # Track NEW skills (not in current profile), and the per-skill fields written
         new_skills_added = []
         existing_skills_updated = []
+        metadata_patch = {}
         
         for item in detected_skills:
             skill_name = item.get('skill')
             level = item.get('level', 'intermediate')
             evidence = item.get('evidence', 'Detected in recent GitHub activity')
             
-            if skill_name in current_metadata:
-                # Skill exists - update evidence and last_seen
-                current_metadata[skill_name]["evidence"] = evidence
-                current_metadata[skill_name]["last_seen"] = now
-                if current_metadata[skill_name].get("level") is None:
-                    current_metadata[skill_name]["level"] = level
+            meta = current_metadata.get(skill_name)
+            if meta is not None:
+                # Skill exists - update evidence and last_seen (one lookup, one update)
+                fields = {"evidence": evidence, "last_seen": now}
+                if meta.get("level") is None:
+                    fields["level"] = level
+                meta.update(fields)
+                metadata_patch[skill_name] = fields
                 existing_skills_updated.append(skill_name)
             else:
                 # New skill from GitHub
@@ -520,27 +1365,26 @@ class PerceptionService:
                     "evidence": evidence,
                     "last_seen": now
                 }
+                metadata_patch[skill_name] = current_metadata[skill_name]
                 new_skills_added.append(skill_name)
         
         # 6. Sync skills array from skills_metadata keys (for backward compatibility)
         final_skills = list(current_metadata.keys())
         
-        # 7. Update Database with both columns
-        self.supabase.table("profiles").update({
-            "skills": final_skills,
-            "skills_metadata": current_metadata,
-            "last_scan_timestamp": "now()"
-        }).eq("user_id", user_id).execute()
-        
-        # 8. Update Pinecone metadata
-        try:
-            self.index.update(
-                id=user_id,
-                set_metadata={"skills": final_skills},
-                namespace="users"
-            )
-        except Exception as e:
-            print(f"[Watchdog] Pinecone update warning: {e}")
+        # 7-8. Update Database with both columns, then Pinecone metadata (only if the list moved).
+        # last_seen alone is not a change: if nothing else differs, just record the scan.
+        skills_changed = final_skills != current_skills
+        if skills_changed or _without_last_seen(current_metadata) != _without_last_seen(original_metadata):
+            profile_update = {
+                "skills": final_skills,
+                "skills_metadata": current_metadata,
+                "last_scan_timestamp": "now()"
+            }
+        else:
+            logger.info("[Watchdog] No skill changes for %s, recording scan time only", username)
+            current_metadata = original_metadata
+            profile_update = {"last_scan_timestamp": "now()"}
+            metadata_patch = None
         
         # 9. Generate friendly insights
         repos = activity.get("repos_touched", [])
@@ -555,36 +1399,26 @@ class PerceptionService:
             "message": insight_message
         }
         
-        # 10. CACHE WRITE: Store insights for future cache hits
+        # 10. WRITE: skills and the cached insights (for future cache hits) together
         latest_sha = activity.get("latest_commit_sha")
+        cache_data = None
         if latest_sha:
-            try:
-                # Upsert to cache table
-                cache_data = {
-                    "user_id": user_id,
-                    "last_analyzed_sha": latest_sha,
-                    "detected_skills": detected_skills,
-                    "repos_touched": repos,
-                    "tech_stack": top_skills,
-                    "insight_message": insight_message,
-                    "analyzed_at": datetime.utcnow().isoformat(),
-                    "updated_at": datetime.utcnow().isoformat()
-                }
-                
-                # Check if cache entry exists
-                existing = self.supabase.table("github_activity_cache").select("id").eq("user_id", user_id).execute()
-                
-                if existing.data and len(existing.data) > 0:
-                    # Update existing cache
-                    self.supabase.table("github_activity_cache").update(cache_data).eq("user_id", user_id).execute()
-                    print(f"[Watchdog] ✓ Cache UPDATED for SHA {latest_sha[:7]}")
-                else:
-                    # Insert new cache entry
-                    self.supabase.table("github_activity_cache").insert(cache_data).execute()
-                    print(f"[Watchdog] ✓ Cache CREATED for SHA {latest_sha[:7]}")
-                    
-            except Exception as e:
-                print(f"[Watchdog] ⚠️ Cache write warning: {e}")
+            cache_data = {
+                "user_id": user_id,
+                "last_analyzed_sha": latest_sha,
+                "detected_skills": detected_skills,
+                "repos_touched": repos,
+                "tech_stack": top_skills,
+                "insight_message": insight_message,
+                "analyzed_at": now,
+                "updated_at": now
+            }
+        if background_tasks is not None:
+            background_tasks.add_task(
+                self._save_watchdog_scan, user_id, profile_update, metadata_patch, skills_changed, cache_data
+            )
+        else:
+            await self._save_watchdog_scan(user_id, profile_update, metadata_patch, skills_changed, cache_data)
         
         return {
             "updated_skills": final_skills,
@@ -623,21 +1457,41 @@ class PerceptionService:
     async def check_github_activity(
         self, 
         user_id: str, 
-        last_known_sha: Optional[str] = None
+        last_known_sha: Optional[str] = None,
+        background_tasks: Optional[BackgroundTasks] = None
     ) -> dict:
         """Quick check for new GitHub activity (used for polling)."""
-        response = self.supabase.table("profiles").select("github_url").eq("user_id", user_id).execute()
+        # Load everything the watchdog needs up front so a detected change costs no second SELECT
+        profile = await self._get_profile(user_id, "github_url, skills, skills_metadata")
         
-        if not response.data or not response.data[0].get("github_url"):
+        if not profile or not profile.get("github_url"):
             return {"status": "no_github", "message": "GitHub URL not configured"}
         
-        github_url = response.data[0]["github_url"]
+        github_url = profile["github_url"]
         username = extract_username_from_url(github_url)
         
         if not username:
             return {"status": "error", "message": "Invalid GitHub URL"}
         
-        current_sha = get_latest_commit_sha(username)
+        # Revalidate the Events feed first: a 304 is free and means nothing was pushed
+        # since the stored ETag, so its SHA stands without any further GitHub call
+        stored = await asyncio.to_thread(cache_service.get_github_etag, user_id)
+        if stored and stored.get("username") != username:
+            stored = None
+        not_modified, etag = await probe_events_etag(username, stored["etag"] if stored else None)
+        if not_modified:
+            if last_known_sha == stored["sha"]:
+                return {"status": "no_change", "current_sha": last_known_sha}
+            activity, current_sha = None, stored["sha"]
+        else:
+            # One GraphQL call yields the head SHA plus, if it moved, the new code context
+            activity = await fetch_user_sha_and_activity_graphql(username, known_sha=last_known_sha)
+            if activity:
+                current_sha = activity.get("latest_sha")
+            else:
+                current_sha = await get_latest_commit_sha_async(username)
+            if etag and current_sha:
+                await asyncio.to_thread(cache_service.set_github_etag, user_id, username, etag, current_sha)
         
         if not current_sha:
             return {"status": "no_activity", "message": "No recent activity found"}
@@ -645,9 +1499,12 @@ class PerceptionService:
         if last_known_sha == current_sha:
             return {"status": "no_change", "current_sha": current_sha}
         
-        print(f"🔔 New GitHub activity detected for {username} (SHA: {current_sha[:7]})")
+        logger.info("🔔 New GitHub activity detected for %s (SHA: %s)", username, current_sha[:7])
         
-        result = await self.run_github_watchdog(user_id)
+        result = await self.run_github_watchdog(
+            user_id, _preloaded_profile=profile, preloaded_activity=activity,
+            background_tasks=background_tasks
+        )
         
         return {
             "status": "updated",
@@ -667,7 +1524,8 @@ class PerceptionService:
         self, 
         user_id: str, 
         skill_name: str, 
-        level: str = "intermediate"
+        level: str = "intermediate",
+        profile_cache: Optional[Dict[str, dict]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Generate a quiz question for skill verification.
@@ -676,17 +1534,18 @@ class PerceptionService:
             user_id: Authenticated user's ID
             skill_name: Skill to verify (e.g., "React")
             level: Difficulty level
+            profile_cache: Per-request profile cache shared with other calls (see _get_profile)
             
         Returns:
             Dict with quiz_id, question, options, and correct_index
         """
         # Verify user has this skill in their profile
-        response = self.supabase.table("profiles").select("skills_metadata").eq("user_id", user_id).execute()
+        profile = await self._get_profile(user_id, "skills_metadata", profile_cache)
         
-        if not response.data:
+        if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        skills_metadata = response.data[0].get("skills_metadata") or {}
+        skills_metadata = profile.get("skills_metadata") or {}
         
         # Allow quiz even if skill not in profile (for adding new skills)
         if skill_name in skills_metadata:
@@ -695,8 +1554,15 @@ class PerceptionService:
             if existing_level:
                 level = existing_level
         
-        # Generate quiz using LangChain tool
-        quiz_data = generate_skill_quiz(skill_name, level)
+        # (skill, level) pairs repeat across users: serve from the shared pool once it is
+        # full, otherwise generate a new question with the LangChain tool and add it
+        pool = await asyncio.to_thread(cache_service.get_skill_quiz_pool, skill_name, level) or []
+        if len(pool) >= SKILL_QUIZ_POOL_SIZE:
+            quiz_data = random.choice(pool)
+        else:
+            quiz_data = await asyncio.to_thread(generate_skill_quiz, skill_name, level)
+            if quiz_data:
+                await asyncio.to_thread(cache_service.add_skill_quiz, skill_name, level, quiz_data)
         
         if not quiz_data:
             raise HTTPException(status_code=500, detail="Failed to generate quiz question")
@@ -717,7 +1583,9 @@ class PerceptionService:
         self,
         user_id: str,
         skill_name: str,
-        passed: bool
+        passed: bool,
+        profile_cache: Optional[Dict[str, dict]] = None,
+        background_tasks: Optional[BackgroundTasks] = None
     ) -> Dict[str, Any]:
         """
         Update skill verification status based on quiz result.
@@ -726,74 +1594,62 @@ class PerceptionService:
             user_id: Authenticated user's ID
             skill_name: Skill that was tested
             passed: Whether the user answered correctly
+            profile_cache: Per-request profile cache shared with other calls (see _get_profile)
+            background_tasks: If given, the profile/Pinecone writes run after the response
             
         Returns:
             Dict with new_status and message
         """
         # Get current profile
-        response = self.supabase.table("profiles").select(
-            "skills, skills_metadata"
-        ).eq("user_id", user_id).execute()
+        profile = await self._get_profile(user_id, "skills_metadata", profile_cache)
         
-        if not response.data:
+        if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        profile = response.data[0]
         skills_metadata = profile.get("skills_metadata") or {}
-        skills_list = profile.get("skills") or []
+        skill_added = False
         
         now = datetime.utcnow().isoformat()
+        meta = skills_metadata.get(skill_name)
         
         if passed:
             # Update or create skill metadata with verified status
-            if skill_name in skills_metadata:
-                skills_metadata[skill_name]["verification_status"] = "verified"
-                skills_metadata[skill_name]["last_seen"] = now
+            if meta is not None:
+                meta.update(verification_status="verified", last_seen=now)
             else:
                 # Add new skill via quiz verification
-                skills_metadata[skill_name] = {
+                meta = skills_metadata[skill_name] = {
                     "source": "quiz",
                     "verification_status": "verified",
                     "level": "intermediate",
                     "evidence": "Passed verification quiz",
                     "last_seen": now
                 }
-            
-            # Sync skills array
-            if skill_name not in skills_list:
-                skills_list.append(skill_name)
+                skill_added = True
             
             new_status = "verified"
             message = f"🎉 Congratulations! Your {skill_name} skill has been verified."
         else:
             # Don't change status on failure, but log the attempt
-            if skill_name in skills_metadata:
-                skills_metadata[skill_name]["last_seen"] = now
+            if meta is not None:
+                meta["last_seen"] = now
             
-            new_status = skills_metadata.get(skill_name, {}).get("verification_status", "pending")
+            new_status = (meta or {}).get("verification_status", "pending")
             message = f"Not quite right. Your {skill_name} status remains: {new_status}"
         
-        # Update database
-        self.supabase.table("profiles").update({
-            "skills": skills_list,
-            "skills_metadata": skills_metadata
-        }).eq("user_id", user_id).execute()
-        
-        # Update Pinecone if skills changed
-        try:
-            self.index.update(
-                id=user_id,
-                set_metadata={"skills": skills_list},
-                namespace="users"
-            )
-        except Exception as e:
-            print(f"[Quiz] Pinecone update warning: {e}")
+        # Update database, then Pinecone (only a new skill changes the indexed list).
+        # skills_metadata is the source of truth; the legacy array is derived once here.
+        profile_update = {"skills": list(skills_metadata), "skills_metadata": skills_metadata}
+        if background_tasks is not None:
+            background_tasks.add_task(self._save_skills, user_id, profile_update, "[Quiz]", skill_added)
+        else:
+            await self._save_skills(user_id, profile_update, "[Quiz]", sync_index=skill_added)
         
         return {
             "correct": passed,
             "new_status": new_status,
             "message": message,
-            "skills_metadata": skills_metadata.get(skill_name, {})
+            "skills_metadata": meta or {}
         }
 
     # =========================================================================
@@ -807,9 +1663,11 @@ class PerceptionService:
         """
         try:
             # Try to get profile with all columns (some may not exist yet)
-            response = self.supabase.table("profiles").select("*").eq("user_id", user_id).execute()
+            response = await asyncio.to_thread(
+                lambda: self.supabase.table("profiles").select("*").eq("user_id", user_id).execute()
+            )
         except Exception as e:
-            print(f"Error fetching profile: {e}")
+            logger.error("Error fetching profile: %s", e)
             # If table query fails, assume new user
             return {
                 "needs_onboarding": True,
@@ -890,24 +1748,12 @@ class PerceptionService:
         now = datetime.utcnow().isoformat()
         
         # Build skills_metadata for manual/edited skills
-        skills_metadata = {}
-        for skill in skills:
-            skills_metadata[skill] = {
-                "source": "resume" if has_resume else "manual",
-                "verification_status": "pending",
-                "level": None,
-                "evidence": "Listed during onboarding",
-                "last_seen": now
-            }
+        skills_metadata = _build_skills_metadata(
+            skills, "resume" if has_resume else "manual", "Listed during onboarding", now
+        )
         
-        # Validate GitHub URL if provided
-        if github_url:
-            username = extract_username_from_url(github_url)
-            if not username:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid GitHub URL format. Expected: https://github.com/username"
-                )
+        # Validate profile links if provided
+        _validate_profile_urls(github_url, linkedin_url, leetcode_url)
         
         # Prepare profile data
         profile_data = {
@@ -926,37 +1772,32 @@ class PerceptionService:
             "updated_at": now
         }
         
-        # Upsert to database
-        self.supabase.table("profiles").upsert(profile_data).execute()
-        
-        # Generate embedding for vector search
-        if experience_summary or skills:
-            summary_text = experience_summary or f"Skills: {', '.join(skills)}. Target roles: {', '.join(target_roles)}"
-            embedding = generate_embedding(summary_text)
-            
-            # Upsert to Pinecone (full profile schema)
-            vector_data = {
-                "id": user_id,
-                "values": embedding,
-                "metadata": {
-                    "user_id": user_id,
-                    "name": name,
-                    "email": email or "",
-                    "skills": skills,
-                    "target_roles": target_roles,
-                    "education": str(education) if education else "[]",
-                    "experience_summary": experience_summary or "",
-                    "github_url": github_url or "",
-                    "linkedin_url": linkedin_url or "",
-                    "resume_text": "",  # Not available in manual onboarding
-                    "resume_url": "",  # Will be set if resume uploaded
-                    "onboarding_completed": False,  # True after quiz
-                    "quiz_completed": False,
-                    "quiz_score": 0,
-                    "type": "user_profile"
-                }
-            }
-            self.index.upsert(vectors=[vector_data], namespace="users")
+        # Upsert to database - in flight while the vector is embedded and upserted
+        db_task = asyncio.create_task(asyncio.to_thread(
+            lambda: self.supabase.table("profiles").upsert(
+                profile_data, on_conflict="user_id", returning=ReturnMethod.minimal
+            ).execute()
+        ))
+        try:
+            # Generate embedding for vector search
+            if experience_summary or skills:
+                summary_text = experience_summary or f"Skills: {', '.join(skills)}. Target roles: {', '.join(target_roles)}"
+                embedding = await self._embeddings.submit(summary_text)
+                
+                # Upsert to Pinecone (full profile schema)
+                vector_data = _build_profile_vector(
+                    user_id, embedding,
+                    name=name,
+                    skills=skills,
+                    target_roles=target_roles,
+                    experience_summary=experience_summary
+                )
+                await asyncio.to_thread(
+                    lambda: self.index.upsert(vectors=[vector_data], namespace="users")
+                )
+        finally:
+            await db_task
+            cache_service.invalidate_profile_views(user_id)
         
         return {
             "status": "success",
@@ -969,16 +1810,13 @@ class PerceptionService:
     # ONBOARDING: Generate Quiz Questions
     # =========================================================================
     
-    async def generate_onboarding_quiz(
+    async def resolve_quiz_topics(
         self,
         user_id: str,
         skills: List[str],
         target_roles: List[str]
-    ) -> Dict[str, Any]:
-        """
-        Generate 5 MCQ questions based on user's skills and target roles.
-        Uses Gemini to create relevant technical questions.
-        """
+    ) -> Tuple[List[str], List[str]]:
+        """Fill missing quiz skills/target roles from the profile (400 if there are none)."""
         # Get profile for context
         response = self.supabase.table("profiles").select(
             "skills, target_roles, education"
@@ -994,9 +1832,31 @@ class PerceptionService:
                 status_code=400,
                 detail="No skills or target roles found. Please complete profile setup first."
             )
-        
-        # Generate questions using Gemini
-        questions = generate_onboarding_questions(skills, target_roles)
+        return skills, target_roles
+
+    async def generate_onboarding_quiz(
+        self,
+        user_id: str,
+        skills: List[str],
+        target_roles: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Generate 5 MCQ questions based on user's skills and target roles.
+        Uses Gemini to create relevant technical questions.
+        """
+        skills, target_roles = await self.resolve_quiz_topics(user_id, skills, target_roles)
+        return await self._build_onboarding_quiz(user_id, skills, target_roles)
+
+    async def _build_onboarding_quiz(
+        self,
+        user_id: str,
+        skills: List[str],
+        target_roles: List[str],
+        quiz_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Onboarding quiz payload for already-resolved skills/target roles."""
+        # Generate questions using Gemini (blocking HTTP call - keep it off the event loop)
+        questions = await asyncio.to_thread(generate_onboarding_questions, skills, target_roles)
         
         if not questions or len(questions) < 5:
             raise HTTPException(
@@ -1004,11 +1864,56 @@ class PerceptionService:
                 detail="Failed to generate quiz questions. Please try again."
             )
         
+        # The client only gets a signed token per question, never the answer itself,
+        # plus a quiz_token that the submission must match question for question
+        quiz_id = quiz_id or uuid.uuid4().hex
+        for q in questions:
+            q["id"] = str(q.get("id"))
+            q["verify_token"] = sign_quiz_answer(quiz_id, q["id"], q.pop("correct_index", -1))
+        
         return {
             "status": "success",
+            "quiz_id": quiz_id,
+            "quiz_token": sign_quiz(quiz_id, user_id, [q["id"] for q in questions]),
             "questions": questions
         }
 
+    def create_quiz_job(self, user_id: str) -> Optional[str]:
+        """
+        Register a pending onboarding quiz job in Redis.
+        Returns the quiz_id, or None when Redis is unavailable (generate inline instead).
+        """
+        quiz_id = uuid.uuid4().hex
+        if not cache_service.set_quiz_job(quiz_id, {"user_id": user_id, "status": "pending"}):
+            return None
+        return quiz_id
+
+    async def run_quiz_job(
+        self,
+        quiz_id: str,
+        user_id: str,
+        skills: List[str],
+        target_roles: List[str]
+    ) -> None:
+        """Background task: generate the quiz and store the outcome on the job."""
+        try:
+            result = await self._build_onboarding_quiz(user_id, skills, target_roles, quiz_id)
+            job = {"user_id": user_id, **result}
+        except HTTPException as e:
+            job = {"user_id": user_id, "status": "error", "detail": e.detail}
+        except Exception as e:
+            logger.error("[Onboarding] Quiz job %s failed: %s", quiz_id, e)
+            job = {"user_id": user_id, "status": "error", "detail": "Failed to generate quiz questions. Please try again."}
+        cache_service.set_quiz_job(quiz_id, job)
+
+    def get_quiz_job(self, user_id: str, quiz_id: str) -> Dict[str, Any]:
+        """Current state of a quiz job owned by user_id (404 if unknown or expired)."""
+        job = cache_service.get_quiz_job(quiz_id)
+        if not job or job.get("user_id") != user_id:
+            raise HTTPException(status_code=404, detail="Quiz not found or expired")
+        job.pop("user_id")
+        return {"quiz_id": quiz_id, **job}
+
     # =========================================================================
     # ONBOARDING: Submit Quiz and Complete
     # =========================================================================
@@ -1016,21 +1921,38 @@ class PerceptionService:
     async def submit_onboarding_quiz(
         self,
         user_id: str,
-        answers: List[Dict[str, Any]]
+        quiz_token: str,
+        question_ids: List[str],
+        selected: List[int],
+        verify_tokens: List[str]
     ) -> Dict[str, Any]:
         """
         Submit quiz answers and mark onboarding as complete.
         
         Args:
             user_id: User's ID
-            answers: List of {question_id, selected_index, correct_index}
+            quiz_token: Token issued with the quiz (binds user and question set)
+            question_ids: Answered question ids, every issued question exactly once
+                (unanswered ones with selected index -1)
+            selected: Selected option index per question (parallel to question_ids)
+            verify_tokens: Signed tokens issued with the questions (parallel to question_ids)
+        
+        Raises:
+            HTTPException 400 if the answers aren't exactly the issued quiz's
+            questions (a repeated, missing or foreign question would let one
+            known-correct answer score 100%), 409 if the quiz was already submitted.
         """
-        # Calculate score
+        if len(set(question_ids)) != len(question_ids):
+            raise HTTPException(status_code=400, detail="Each question can only be answered once")
+        quiz_id = quiz_matches(quiz_token, user_id, question_ids)
+        if quiz_id is None or any(t.partition(".")[0] != quiz_id for t in verify_tokens):
+            raise HTTPException(status_code=400, detail="Answers don't match the issued quiz")
+        
+        # Calculate score (out of the issued question count, checked above)
         correct_count = sum(
-            1 for a in answers 
-            if a.get("selected_index") == a.get("correct_index")
+            quiz_answer_matches(t, q, s) for q, s, t in zip(question_ids, selected, verify_tokens)
         )
-        total = len(answers)
+        total = len(question_ids)
         score = int((correct_count / total) * 100) if total > 0 else 0
         
         # Update profile - mark onboarding complete
@@ -1044,7 +1966,16 @@ class PerceptionService:
             "updated_at": now
         }
         
-        self.supabase.table("profiles").update(update_data).eq("user_id", user_id).execute()
+        # Only a profile whose quiz isn't completed yet is updated, so answers can't be
+        # probed by resubmitting; the exact count says whether this submission won
+        response = await asyncio.to_thread(
+            lambda: self.supabase.table("profiles").update(
+                update_data, count=CountMethod.exact, returning=ReturnMethod.minimal
+            ).eq("user_id", user_id).or_("quiz_completed.is.null,quiz_completed.is.false").execute()
+        )
+        if not response.count:
+            raise HTTPException(status_code=409, detail="Onboarding quiz already submitted")
+        cache_service.invalidate_profile_views(user_id)
         
         return {
             "status": "success",
@@ -1060,6 +1991,66 @@ class PerceptionService:
     # DASHBOARD: Get Insights
     # =========================================================================
     
+    async def get_bootstrap(self, user_id: str) -> Dict[str, Any]:
+        """
+        Everything the app needs after login in one call: onboarding status,
+        dashboard (None until onboarding is done) and settings profile.
+        The profile loads alongside the onboarding check; the dashboard is
+        only built once onboarding is known to be complete.
+        """
+        profile_task = asyncio.create_task(self.get_full_profile(user_id))
+        try:
+            onboarding = await self.check_onboarding_status(user_id)
+            
+            dashboard = None
+            if not onboarding.get("needs_onboarding"):
+                try:
+                    dashboard = await self._bootstrap_dashboard(user_id)
+                except Exception as e:
+                    logger.warning("Bootstrap dashboard failed for %s: %s", user_id, e)
+            
+            try:
+                profile = await profile_task
+            except Exception:
+                profile = None
+        finally:
+            if not profile_task.done():
+                profile_task.cancel()
+        
+        return {
+            "status": "success",
+            "onboarding": {"status": "success", **onboarding},
+            "dashboard": dashboard,
+            "profile": profile["profile"] if profile else None
+        }
+
+    async def _bootstrap_dashboard(self, user_id: str) -> Dict[str, Any]:
+        """/dashboard body, from its Redis copy when there is one."""
+        cached = cache_service.get_dashboard(user_id)
+        if cached:
+            return orjson.loads(cached[0])
+        return {"status": "success", **(await self.get_dashboard_insights(user_id))}
+
+    async def render_onboarding_status(self, user_id: str) -> bytes:
+        """Serialize the /onboarding/status response and cache it (30s TTL)."""
+        result = await self.check_onboarding_status(user_id)
+        body = orjson.dumps({"status": "success", **result}, default=str)
+        cache_service.set_onboarding_status(user_id, body)
+        return body
+
+    async def render_dashboard(self, user_id: str) -> bytes:
+        """
+        Serialize the /dashboard response and cache it.
+        Also run as the background refresh when a stale cached copy was served.
+        A body without top_jobs isn't cached: on cold start the app polls
+        /dashboard until today's jobs land, and must see them right away.
+        """
+        result = await self.get_dashboard_insights(user_id)
+        body = orjson.dumps({"status": "success", **result}, default=str)
+        if result.get("top_jobs"):
+            cache_service.set_dashboard(user_id, body)
+        return body
+
     async def get_dashboard_insights(self, user_id: str) -> Dict[str, Any]:
         """
         Generate dashboard data for authenticated users.
@@ -1068,21 +2059,28 @@ class PerceptionService:
         - Cache-first reads for profile, today_data, github_activity_cache
         - Falls back to Supabase on cache miss
         - Hydrates cache after DB reads for future requests
+        - The three reads run concurrently
         """
-        # =====================================================================
-        # Get user profile (CACHE-FIRST)
-        # =====================================================================
-        profile = cache_service.get_profile(user_id)
-        if not profile:
-            # Cache miss - fetch from DB
-            response = self.supabase.table("profiles").select("*").eq("user_id", user_id).execute()
-            
-            if not response.data:
-                raise HTTPException(status_code=404, detail="Profile not found")
-            
-            profile = response.data[0]
-            # Hydrate cache
-            cache_service.set_profile(user_id, profile)
+        # Profile, today_data and GitHub cache are independent cache-first reads:
+        # run them together (the GitHub one speculatively, it's only used with a github_url)
+        profile, data, github_cache = await asyncio.gather(
+            asyncio.to_thread(self._dashboard_profile, user_id),
+            asyncio.to_thread(self._dashboard_today_data, user_id),
+            asyncio.wait_for(
+                asyncio.to_thread(self._dashboard_github_cache, user_id),
+                timeout=DASHBOARD_GITHUB_TIMEOUT
+            ),
+            return_exceptions=True
+        )
+        if isinstance(profile, BaseException):
+            raise profile
+        if isinstance(data, BaseException):
+            logger.error("[Dashboard] today_data read error: %s", data)
+            data = {}
+        if isinstance(github_cache, BaseException):
+            # Slow/failed GitHub cache shouldn't hold the rest of the dashboard
+            logger.warning("[Dashboard] GitHub cache read skipped: %r", github_cache)
+            github_cache = None
         
         user_name = profile.get("name", "User")
         skills = profile.get("skills", []) or []
@@ -1098,29 +2096,6 @@ class PerceptionService:
         if github_url: strength += 15
         if profile.get("quiz_completed"): strength += 10
         
-        # =====================================================================
-        # Get personalized data from today_data (CACHE-FIRST - already cached by strategist)
-        # =====================================================================
-        cached_today = cache_service.get_today_data(user_id)
-        
-        if cached_today:
-            data = cached_today.get("data", {})
-        else:
-            # Cache miss - fetch from DB and hydrate
-            today_data_response = self.supabase.table("today_data").select(
-                "data_json, updated_at"
-            ).eq("user_id", user_id).execute()
-            
-            if today_data_response.data:
-                data = today_data_response.data[0].get("data_json", {})
-                # Hydrate cache
-                cache_service.set_today_data(user_id, {
-                    "data": data,
-                    "updated_at": today_data_response.data[0].get("updated_at")
-                })
-            else:
-                data = {}
-        
         top_jobs = []
         hot_skills = []
         news_cards = []
@@ -1152,8 +2127,7 @@ class PerceptionService:
         
         # Fallback: Generate hot skills from trending if not in today_data
         if not hot_skills:
-            trending = ["AI/ML", "Rust", "Go", "Kubernetes", "GraphQL"]
-            for skill in trending[:3]:
+            for skill in DASHBOARD_TRENDING_SKILLS[:3]:
                 if skill not in skills:
                     hot_skills.append({
                         "skill": skill,
@@ -1161,66 +2135,26 @@ class PerceptionService:
                         "reason": f"High demand in {target_roles[0] if target_roles else 'tech'} roles"
                     })
         
-        # Fallback: Static news if not in today_data
+        # Fallback: Static news if not in today_data (shared, read-only)
         if not news_cards:
-            news_cards = [
-                {
-                    "title": "AI Skills in High Demand",
-                    "summary": "Companies are actively seeking engineers with AI/ML experience",
-                    "relevance": "Based on your target roles"
-                },
-                {
-                    "title": "Remote Work Trends 2026",
-                    "summary": "75% of tech companies now offer remote-first positions",
-                    "relevance": "Job market insight"
-                }
-            ]
+            news_cards = DASHBOARD_FALLBACK_NEWS
         
         # =====================================================================
-        # Get GitHub insights from CACHE-FIRST (Redis then Supabase)
+        # GitHub insights (from the Redis/Supabase analysis cache)
         # =====================================================================
         github_insights = None
-        if github_url:
-            # Try Redis first
-            cached_github = cache_service.get_github_activity(user_id)
+        if github_url and github_cache:
+            repos = github_cache.get("repos_touched", []) or []
+            detected = github_cache.get("detected_skills", []) or []
             
-            if cached_github:
-                repos = cached_github.get("repos_touched", []) or []
-                detected = cached_github.get("detected_skills", []) or []
-                
-                github_insights = {
-                    "repo_name": repos[0] if repos else "your repositories",
-                    "recent_commits": len(repos),
-                    "detected_skills": detected[:3] if isinstance(detected, list) else [],
-                    "insight_text": cached_github.get("insight_message") or f"Your recent activity shows strong focus on {skills[0] if skills else 'development'}",
-                    "from_cache": True,
-                    "analyzed_at": cached_github.get("analyzed_at")
-                }
-            else:
-                # Cache miss - fetch from Supabase and hydrate Redis
-                try:
-                    cache_response = self.supabase.table("github_activity_cache").select(
-                        "detected_skills, repos_touched, tech_stack, insight_message, analyzed_at"
-                    ).eq("user_id", user_id).execute()
-                    
-                    if cache_response.data:
-                        cache = cache_response.data[0]
-                        repos = cache.get("repos_touched", []) or []
-                        detected = cache.get("detected_skills", []) or []
-                        
-                        github_insights = {
-                            "repo_name": repos[0] if repos else "your repositories",
-                            "recent_commits": len(repos),
-                            "detected_skills": detected[:3] if isinstance(detected, list) else [],
-                            "insight_text": cache.get("insight_message") or f"Your recent activity shows strong focus on {skills[0] if skills else 'development'}",
-                            "from_cache": True,
-                            "analyzed_at": cache.get("analyzed_at")
-                        }
-                        
-                        # Hydrate Redis cache
-                        cache_service.set_github_activity(user_id, cache)
-                except Exception as e:
-                    print(f"[Dashboard] GitHub cache read error: {e}")
+            github_insights = {
+                "repo_name": repos[0] if repos else "your repositories",
+                "recent_commits": len(repos),
+                "detected_skills": detected[:3] if isinstance(detected, list) else [],
+                "insight_text": github_cache.get("insight_message") or f"Your recent activity shows strong focus on {skills[0] if skills else 'development'}",
+                "from_cache": True,
+                "analyzed_at": github_cache.get("analyzed_at")
+            }
         
         return {
             "user_name": user_name,
@@ -1232,6 +2166,63 @@ class PerceptionService:
             "agent_status": "active"
         }
 
+    def _dashboard_profile(self, user_id: str) -> dict:
+        """User profile (CACHE-FIRST)."""
+        profile = cache_service.get_profile(user_id)
+        if not profile:
+            # Cache miss - fetch from DB
+            response = self.supabase.table("profiles").select("*").eq("user_id", user_id).execute()
+            
+            if not response.data:
+                raise HTTPException(status_code=404, detail="Profile not found")
+            
+            profile = response.data[0]
+            # Hydrate cache
+            cache_service.set_profile(user_id, profile)
+        return profile
+    
+    def _dashboard_today_data(self, user_id: str) -> dict:
+        """Personalized data from today_data (CACHE-FIRST - already cached by strategist)."""
+        cached_today = cache_service.get_today_data(user_id)
+        if cached_today:
+            return cached_today.get("data", {})
+        
+        # Cache miss - fetch from DB and hydrate
+        today_data_response = self.supabase.table("today_data").select(
+            "data_json, updated_at"
+        ).eq("user_id", user_id).execute()
+        
+        if not today_data_response.data:
+            return {}
+        data = today_data_response.data[0].get("data_json", {})
+        # Hydrate cache
+        cache_service.set_today_data(user_id, {
+            "data": data,
+            "updated_at": today_data_response.data[0].get("updated_at")
+        })
+        return data
+    
+    def _dashboard_github_cache(self, user_id: str) -> Optional[dict]:
+        """Last GitHub analysis (CACHE-FIRST: Redis, then Supabase)."""
+        cached_github = cache_service.get_github_activity(user_id)
+        if cached_github:
+            return cached_github
+        
+        # Cache miss - fetch from Supabase and hydrate Redis
+        try:
+            cache_response = self.supabase.table("github_activity_cache").select(
+                "detected_skills, repos_touched, tech_stack, insight_message, analyzed_at"
+            ).eq("user_id", user_id).execute()
+        except Exception as e:
+            logger.error("[Dashboard] GitHub cache read error: %s", e)
+            return None
+        
+        if not cache_response.data:
+            return None
+        cache = cache_response.data[0]
+        cache_service.set_github_activity(user_id, cache)
+        return cache
+
 
 # Singleton Instance
 agent1_service = PerceptionService()
@@ -3,52 +3,242 @@ Agent 1 Perception - Helper Tools (LangChain Edition)
 1. Parse PDF
 2. Extract Data (LangChain Chain)
 3. Generate Embeddings (LangChain Embeddings)
-4. Upload PDF to Supabase Storage
+4. Upload PDF to Supabase Storage (direct or via signed upload URL)
 5. Generate Skill Quiz (Verification)
 """
 
+import io
 import os
+import re
 import json
-from typing import Any, Optional, Dict, List
+import logging
+from functools import lru_cache
+from typing import Any, BinaryIO, Optional, Dict, List, Union
+import numpy as np
+import fitz  # PyMuPDF
 from pypdf import PdfReader
-from supabase import create_client
+
+from core.db import db_manager
+
+try:
+    import zstandard as zstd
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
 
 # --- LANGCHAIN IMPORTS ---
 from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
+logger = logging.getLogger("Agent1")
+
+# Read once at import (main.py loads .env before importing routers)
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# Resume text extraction backend: "pymupdf" (default, much faster) or "pypdf"
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pymupdf").lower()
+# Also partitions the embedding cache, so a model swap never serves stale vectors
+EMBEDDING_MODEL = "models/embedding-001"
+# Store resume text zstd-compressed in profiles.resume_text_zstd (BYTEA) instead of the
+# resume_text TEXT column. Opt-in: the column has to exist before this is switched on.
+RESUME_TEXT_ZSTD = os.getenv("RESUME_TEXT_ZSTD", "").lower() in ("1", "true", "yes")
+RESUME_TEXT_ZSTD_LEVEL = 3
+if RESUME_TEXT_ZSTD and not HAS_ZSTD:
+    logger.warning("RESUME_TEXT_ZSTD is set but zstandard is not installed - storing resume_text uncompressed")
+    RESUME_TEXT_ZSTD = False
+# profiles column that holds the resume text for this deployment (for select lists)
+RESUME_TEXT_COLUMN = "resume_text_zstd" if RESUME_TEXT_ZSTD else "resume_text"
+# Set to false to let clean, born-digital resumes skip the Gemini extraction (see resume_fast_parse)
+USE_LLM_EXTRACTION_ALWAYS = os.getenv("USE_LLM_EXTRACTION_ALWAYS", "true").lower() not in ("0", "false", "no")
+
+# Resume fast-path patterns, compiled once
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_SECTION_RE = re.compile(
+    r"^\s*(?P<title>(?:technical\s+|core\s+|key\s+)?skills(?:\s*&\s*\w+)?|"
+    r"(?:work\s+|professional\s+)?experience|education|projects?|certifications?|"
+    r"achievements|awards|summary|profile|objective|publications|interests|languages)\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE
+)
+_NAME_RE = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?:\s+[A-Za-z][A-Za-z.'-]*){1,3}$")
+_SKILL_SPLIT_RE = re.compile(r"\s*(?:[,;|\n•·▪●]|\s-\s)\s*")
+_DEGREE_RE = re.compile(
+    r"\b(?:bachelor|master|ph\.?d|doctor|diploma|associate|b\.?\s?tech|m\.?\s?tech|"
+    r"b\.?\s?e\b|m\.?\s?e\b|b\.?\s?s\b|m\.?\s?s\b|b\.?\s?sc|m\.?\s?sc|b\.?\s?a\b|m\.?\s?a\b|mba|bca|mca)",
+    re.IGNORECASE
+)
+_INSTITUTION_RE = re.compile(r"\b(?:university|college|institute|school|academy|iit|nit)\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=8)
+def _get_llm(model: str, temperature: float, api_key: str) -> ChatGoogleGenerativeAI:
+    """Process-wide Gemini chat client per (model, temperature), so the HTTP session is reused."""
+    return ChatGoogleGenerativeAI(model=model, temperature=temperature, google_api_key=api_key)
+
+
+@lru_cache(maxsize=2)
+def _get_embeddings_model(api_key: str) -> GoogleGenerativeAIEmbeddings:
+    """Process-wide Gemini embeddings client."""
+    return GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL, google_api_key=api_key)
+
+
+def encode_resume_text(text: str) -> Dict[str, Optional[str]]:
+    """
+    profiles columns to write for a resume's text.
+    
+    With RESUME_TEXT_ZSTD the text goes out zstd-compressed as a PostgREST
+    bytea literal and the legacy TEXT column is cleared; otherwise as plain text.
+    """
+    if not RESUME_TEXT_ZSTD:
+        return {"resume_text": text}
+    # Compressors aren't thread-safe and this runs from worker threads, so one per call
+    compressed = zstd.ZstdCompressor(level=RESUME_TEXT_ZSTD_LEVEL).compress(text.encode("utf-8"))
+    return {"resume_text_zstd": "\\x" + compressed.hex(), "resume_text": None}
+
+
+def decode_resume_text(row: Dict[str, Any]) -> Optional[str]:
+    """Resume text from a profiles row, whichever column it was stored in."""
+    packed = row.get("resume_text_zstd")
+    if packed and HAS_ZSTD:
+        # PostgREST returns bytea as a "\x"-prefixed hex string
+        raw = bytes.fromhex(packed[2:]) if isinstance(packed, str) else packed
+        return zstd.ZstdDecompressor().decompress(raw).decode("utf-8")
+    return row.get("resume_text")
 
-def parse_pdf(file_path: str) -> str:
-    """Parse a PDF file and extract all text."""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"PDF file not found: {file_path}")
+
+def parse_pdf(source: Union[bytes, str, BinaryIO]) -> str:
+    """
+    Parse a PDF and extract all text.
+    
+    Accepts the raw PDF bytes, a binary file object (e.g. UploadFile.file)
+    or a file path. Paths and file objects are read in one go, so the parser
+    always works on an in-memory buffer - callers never need a temp file.
+    """
+    if hasattr(source, "read"):
+        source = source.read()
+    elif isinstance(source, str):
+        try:
+            with open(source, "rb") as f:
+                source = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"PDF file not found: {source}") from None
     
     try:
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        if PDF_BACKEND == "pypdf":
+            reader = PdfReader(io.BytesIO(source))
+            return "\n".join(page.extract_text() for page in reader.pages).strip()
+        with fitz.open(stream=source, filetype="pdf") as doc:
+            return "\n".join(page.get_text("text") for page in doc).strip()
+    except Exception as e:
+        raise Exception(f"Error parsing PDF: {str(e)}")
+
+
+def pdf_page_count(source: bytes) -> int:
+    """Number of pages in a PDF (opens the document, extracts nothing)."""
+    with fitz.open(stream=source, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def parse_pdf_pages(source: bytes, start: int, stop: int) -> str:
+    """
+    Text of pages [start, stop) of a PDF, joined the same way as parse_pdf,
+    so a long document can be split into page ranges across pool workers.
+    """
+    try:
+        with fitz.open(stream=source, filetype="pdf") as doc:
+            return "\n".join(doc[i].get_text("text") for i in range(start, stop))
     except Exception as e:
         raise Exception(f"Error parsing PDF: {str(e)}")
 
 
+def _resume_sections(text: str) -> Dict[str, str]:
+    """Splits resume text on its section header lines -> {normalized title: body}."""
+    sections = {}
+    matches = list(_SECTION_RE.finditer(text))
+    for match, following in zip(matches, matches[1:] + [None]):
+        title = match.group("title").lower()
+        key = "skills" if "skills" in title else "experience" if "experience" in title else title
+        body = text[match.end():following.start() if following else len(text)].strip()
+        if body and key not in sections:
+            sections[key] = body
+    return sections
+
+
+def resume_fast_parse(text: str) -> Optional[dict[str, Any]]:
+    """
+    Deterministic extraction for clean, born-digital resumes, in the same
+    shape as extract_structured_data. Returns None - use the LLM - unless the
+    text looks clean (reasonable length, almost all ASCII, an email, normal
+    line lengths, SKILLS plus EXPERIENCE or EDUCATION headers) and a name
+    and skills were actually found.
+    """
+    if not 500 <= len(text) <= 20000:
+        return None
+    if sum(c.isascii() for c in text) / len(text) < 0.95:
+        return None
+    if not 0.005 <= text.count("\n") / len(text) <= 0.1:
+        return None
+    email = _EMAIL_RE.search(text)
+    if not email:
+        return None
+    sections = _resume_sections(text)
+    if "skills" not in sections or not ("experience" in sections or "education" in sections):
+        return None
+
+    header = text[:_SECTION_RE.search(text).start()]
+    name = next(
+        (line.strip() for line in header.splitlines() if _NAME_RE.match(line.strip())),
+        None
+    )
+
+    skills = []
+    for line in sections["skills"].splitlines():
+        # "Languages: Python, Go" -> drop the category label
+        line = line.split(":", 1)[1] if ":" in line else line
+        for item in _SKILL_SPLIT_RE.split(line):
+            item = item.strip(" .()")
+            if item and len(item) <= 40 and len(item.split()) <= 4 and item not in skills:
+                skills.append(item)
+    if not name or not skills:
+        return None
+
+    education = []
+    for line in sections.get("education", "").splitlines():
+        line = line.strip()
+        if _INSTITUTION_RE.search(line):
+            education.append({"institution": line, "degree": ""})
+        elif _DEGREE_RE.search(line) and education and not education[-1]["degree"]:
+            education[-1]["degree"] = line
+        elif _DEGREE_RE.search(line):
+            education.append({"institution": "", "degree": line})
+
+    experience = sections.get("experience") or sections.get("summary") or sections.get("profile") or ""
+    return {
+        "name": name,
+        "email": email.group(0),
+        "skills": skills,
+        "experience_summary": " ".join(experience.split())[:500],
+        "education": education
+    }
+
+
 def extract_structured_data(text: str) -> dict[str, Any]:
     """
     Extract structured data using a LangChain extraction chain.
+    Unless USE_LLM_EXTRACTION_ALWAYS, clean resumes take resume_fast_parse instead.
     """
-    api_key = os.getenv("GEMINI_API_KEY")
+    if not USE_LLM_EXTRACTION_ALWAYS:
+        data = resume_fast_parse(text)
+        if data is not None:
+            logger.info("[Agent 1] Clean resume text, extracted without the LLM")
+            return data
+
+    api_key = GEMINI_API_KEY
     if not api_key:
         raise ValueError("GEMINI_API_KEY must be set in .env")
     
     # 1. Initialize the LLM
     # Using gemini-2.0-flash for JSON stability
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash", 
-        temperature=0, 
-        google_api_key=api_key
-    )
+    llm = _get_llm("gemini-2.0-flash", 0, api_key)
     
     # 2. Define the Output Parser
     parser = JsonOutputParser()
@@ -86,7 +276,7 @@ def extract_structured_data(text: str) -> dict[str, Any]:
     chain = prompt | llm | parser
     
     try:
-        print("[LangChain] Extracting structured profile data...")
+        logger.info("[LangChain] Extracting structured profile data...")
         data = chain.invoke({"text": text})
         
         # --- ROBUST FLATTENING LOGIC ---
@@ -129,7 +319,7 @@ def extract_structured_data(text: str) -> dict[str, Any]:
         return data
 
     except Exception as e:
-        print(f"[LangChain] Extraction Error: {e}")
+        logger.error("[LangChain] Extraction Error: %s", e)
         return {
             "name": None,
             "email": None, 
@@ -139,75 +329,138 @@ def extract_structured_data(text: str) -> dict[str, Any]:
         }
 
 
-def generate_embedding(text: str) -> list[float]:
+def generate_embedding(text: str) -> np.ndarray:
     """
     Generate embeddings using LangChain's wrapper.
+    
+    Returned as a contiguous float32 array so callers work on one numeric
+    buffer instead of 768 boxed Python floats.
     """
-    api_key = os.getenv("GEMINI_API_KEY")
+    api_key = GEMINI_API_KEY
     if not api_key:
         raise ValueError("GEMINI_API_KEY must be set in .env")
 
     try:
-        embeddings_model = GoogleGenerativeAIEmbeddings(
-            model="models/embedding-001", 
-            google_api_key=api_key
-        )
-        return embeddings_model.embed_query(text)
+        return np.asarray(_get_embeddings_model(api_key).embed_query(text), dtype=np.float32)
     except Exception as e:
         raise Exception(f"Error generating embedding: {str(e)}")
 
 
-def upload_resume_to_storage(pdf_path: str, user_id: str) -> str:
-    """
-    Uploads the PDF to Supabase 'Resume' bucket and returns a Signed URL.
+def generate_embeddings(texts: List[str]) -> np.ndarray:
     """
-    supabase_url = os.getenv("SUPABASE_URL")
-    # CRITICAL: Use Service Role Key to bypass RLS for uploads
-    service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    Embed several texts in one batchEmbedContents request.
     
-    if not service_key:
-        print("⚠️ Warning: SUPABASE_SERVICE_ROLE_KEY not found. Upload might fail due to permissions.")
-        service_key = os.getenv("SUPABASE_KEY")  # Fallback
+    Uses the same RETRIEVAL_QUERY task type as embed_query, so row i equals
+    generate_embedding(texts[i]). Returned as one (len(texts), dim) float32 array.
+    """
+    api_key = GEMINI_API_KEY
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY must be set in .env")
+
+    try:
+        vectors = _get_embeddings_model(api_key).embed_documents(texts, task_type="RETRIEVAL_QUERY")
+        return np.asarray(vectors, dtype=np.float32)
+    except Exception as e:
+        raise Exception(f"Error generating embeddings: {str(e)}")
+
+
+RESUME_BUCKET = "Resume"
+
+
+def _staged_resume_path(user_id: str) -> str:
+    """Object key a client uploads to directly via a signed upload URL."""
+    return f"pending/{user_id}.pdf"
+
+
+def _resume_signed_url(supabase, file_name: str) -> str:
+    """Signed download URL (1 year validity) for an object in the Resume bucket."""
+    signed_url_response = supabase.storage.from_(RESUME_BUCKET).create_signed_url(
+        path=file_name,
+        expires_in=31536000 
+    )
     
-    # Initialize client
-    supabase = create_client(supabase_url, service_key)
+    # Handle SDK version differences
+    if isinstance(signed_url_response, dict):
+        return signed_url_response.get("signedURL")
+    return signed_url_response
+
+
+def upload_resume_to_storage(file_data: bytes, user_id: str) -> str:
+    """
+    Uploads the PDF bytes to Supabase 'Resume' bucket and returns a Signed URL.
+    """
+    # Shared service-role client (bypasses RLS for uploads), created once per process
+    supabase = db_manager.get_client()
     
-    bucket_name = "Resume"
     file_name = f"{user_id}.pdf"
     
-    print(f"[Perception] Uploading original PDF to Storage (Bucket: {bucket_name})...")
+    logger.info("[Perception] Uploading original PDF to Storage (Bucket: %s)...", RESUME_BUCKET)
     
     try:
-        with open(pdf_path, "rb") as f:
-            file_data = f.read()
-            
         # Upload (overwrite if exists)
-        supabase.storage.from_(bucket_name).upload(
+        supabase.storage.from_(RESUME_BUCKET).upload(
             path=file_name,
             file=file_data,
             file_options={"content-type": "application/pdf", "upsert": "true"}
         )
         
-        # Generate Signed URL (1 year validity)
-        signed_url_response = supabase.storage.from_(bucket_name).create_signed_url(
-            path=file_name,
-            expires_in=31536000 
-        )
-        
-        # Handle SDK version differences
-        if isinstance(signed_url_response, dict):
-            signed_url = signed_url_response.get("signedURL")
-        else:
-            signed_url = signed_url_response 
-             
-        print(f"[Perception] PDF Uploaded! URL generated.")
+        signed_url = _resume_signed_url(supabase, file_name)
+        logger.info("[Perception] PDF Uploaded! URL generated.")
         return signed_url
 
     except Exception as e:
-        print(f"[Perception] ❌ Error uploading PDF: {str(e)}")
+        logger.error("[Perception] ❌ Error uploading PDF: %s", e)
         return None
 
 
+def create_resume_upload_url(user_id: str) -> Dict[str, str]:
+    """
+    Signed upload URL so the client can PUT the PDF straight to storage
+    instead of streaming it through the API.
+    
+    Returns:
+        Dict with signed_url, token and path (the staging object key)
+    """
+    supabase = db_manager.get_client()
+    path = _staged_resume_path(user_id)
+    
+    # Signed uploads can't overwrite; clear any leftover from an earlier attempt
+    supabase.storage.from_(RESUME_BUCKET).remove([path])
+    return supabase.storage.from_(RESUME_BUCKET).create_signed_upload_url(path)
+
+
+def download_staged_resume(user_id: str) -> bytes:
+    """Reads the PDF the client uploaded through create_resume_upload_url."""
+    supabase = db_manager.get_client()
+    return supabase.storage.from_(RESUME_BUCKET).download(_staged_resume_path(user_id))
+
+
+def promote_staged_resume(user_id: str) -> str:
+    """
+    Moves the staged upload to the primary {user_id}.pdf key (server-side,
+    no bytes through the API) and returns a Signed URL for it.
+    """
+    supabase = db_manager.get_client()
+    file_name = f"{user_id}.pdf"
+    
+    try:
+        supabase.storage.from_(RESUME_BUCKET).remove([file_name])
+        supabase.storage.from_(RESUME_BUCKET).move(_staged_resume_path(user_id), file_name)
+        return _resume_signed_url(supabase, file_name)
+    except Exception as e:
+        logger.error("[Perception] ❌ Error promoting staged PDF: %s", e)
+        return None
+
+
+def discard_staged_resume(user_id: str) -> None:
+    """Deletes the staging object, if it is still there."""
+    supabase = db_manager.get_client()
+    try:
+        supabase.storage.from_(RESUME_BUCKET).remove([_staged_resume_path(user_id)])
+    except Exception as e:
+        logger.warning("[Perception] Could not delete staged PDF: %s", e)
+
+
 # =============================================================================
 # SKILL VERIFICATION: Quiz Generation
 # =============================================================================
@@ -224,17 +477,13 @@ def generate_skill_quiz(skill_name: str, level: str = "intermediate") -> Optiona
         Dict with question, options, correct_index, explanation
         Or None if generation fails
     """
-    api_key = os.getenv("GEMINI_API_KEY")
+    api_key = GEMINI_API_KEY
     if not api_key:
-        print("⚠️ GEMINI_API_KEY not set")
+        logger.warning("⚠️ GEMINI_API_KEY not set")
         return None
     
     # 1. Initialize LLM
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",  # Switched to 1.5-flash
-        temperature=0.7,  # Slight creativity for varied questions
-        google_api_key=api_key
-    )
+    llm = _get_llm("gemini-2.5-flash", 0.7, api_key)  # Slight creativity for varied questions
     
     # 2. Setup Parser
     parser = JsonOutputParser()
@@ -272,7 +521,7 @@ def generate_skill_quiz(skill_name: str, level: str = "intermediate") -> Optiona
     chain = prompt | llm | parser
     
     try:
-        print(f"[Quiz] Generating {level} question for: {skill_name}")
+        logger.info("[Quiz] Generating %s question for: %s", level, skill_name)
         result = chain.invoke({
             "skill_name": skill_name,
             "level": level
@@ -280,21 +529,21 @@ def generate_skill_quiz(skill_name: str, level: str = "intermediate") -> Optiona
         
         # Validate response structure
         if not all(k in result for k in ["question", "options", "correct_index"]):
-            print(f"[Quiz] Invalid response structure: {result}")
+            logger.warning("[Quiz] Invalid response structure: %s", result)
             return None
             
         if len(result.get("options", [])) != 4:
-            print(f"[Quiz] Expected 4 options, got {len(result.get('options', []))}")
+            logger.warning("[Quiz] Expected 4 options, got %s", len(result.get('options', [])))
             return None
             
         if not isinstance(result.get("correct_index"), int) or result["correct_index"] not in range(4):
-            print(f"[Quiz] Invalid correct_index: {result.get('correct_index')}")
+            logger.warning("[Quiz] Invalid correct_index: %s", result.get('correct_index'))
             return None
         
         return result
         
     except Exception as e:
-        print(f"[Quiz] Generation Error: {e}")
+        logger.error("[Quiz] Generation Error: %s", e)
         return None
 
 
@@ -316,17 +565,13 @@ def generate_onboarding_questions(
     Returns:
         List of 5 questions with id, question, options, correct_index, skill_being_tested
     """
-    api_key = os.getenv("GEMINI_API_KEY")
+    api_key = GEMINI_API_KEY
     if not api_key:
-        print("⚠️ GEMINI_API_KEY not set")
+        logger.warning("⚠️ GEMINI_API_KEY not set")
         return None
     
     # 1. Initialize LLM
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        temperature=0.7,
-        google_api_key=api_key
-    )
+    llm = _get_llm("gemini-2.5-flash", 0.7, api_key)
     
     # 2. Setup Parser
     parser = JsonOutputParser()
@@ -377,7 +622,7 @@ def generate_onboarding_questions(
     chain = prompt | llm | parser
     
     try:
-        print(f"[Onboarding Quiz] Generating 5 questions for skills: {skills_str}")
+        logger.info("[Onboarding Quiz] Generating 5 questions for skills: %s", skills_str)
         result = chain.invoke({
             "skills": skills_str,
             "target_roles": roles_str
@@ -387,18 +632,18 @@ def generate_onboarding_questions(
         
         # Validate we have 5 questions
         if len(questions) < 5:
-            print(f"[Onboarding Quiz] Warning: Only got {len(questions)} questions")
+            logger.warning("[Onboarding Quiz] Warning: Only got %s questions", len(questions))
             return None
         
         # Validate each question structure
         validated_questions = []
         for i, q in enumerate(questions[:5]):
             if not all(k in q for k in ["question", "options", "correct_index"]):
-                print(f"[Onboarding Quiz] Question {i} missing required fields")
+                logger.warning("[Onboarding Quiz] Question %s missing required fields", i)
                 continue
             
             if len(q.get("options", [])) != 4:
-                print(f"[Onboarding Quiz] Question {i} doesn't have 4 options")
+                logger.warning("[Onboarding Quiz] Question %s doesn't have 4 options", i)
                 continue
                 
             validated_questions.append({
@@ -410,11 +655,11 @@ def generate_onboarding_questions(
             })
         
         if len(validated_questions) < 5:
-            print(f"[Onboarding Quiz] Only {len(validated_questions)} valid questions after validation")
+            logger.warning("[Onboarding Quiz] Only %s valid questions after validation", len(validated_questions))
             return None
             
         return validated_questions
         
     except Exception as e:
-        print(f"[Onboarding Quiz] Generation Error: {e}")
+        logger.error("[Onboarding Quiz] Generation Error: %s", e)
         return None
\ No newline at end of file
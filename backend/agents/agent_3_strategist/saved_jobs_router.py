@@ -171,7 +171,7 @@ async def get_saved_jobs(user_id: str):
     ]
     
     # Hydrate cache for future reads
-    cache_service.set_saved_jobs(user_id, [job.dict() for job in jobs])
+    cache_service.set_saved_jobs(user_id, [job.model_dump() for job in jobs])
     
     return jobs
 
@@ -498,7 +498,7 @@ async def get_global_roadmaps(user_id: str):
     ]
     
     # Hydrate cache
-    cache_service.set_global_roadmaps([r.dict() for r in roadmaps])
+    cache_service.set_global_roadmaps([r.model_dump() for r in roadmaps])
     
     return roadmaps
 
@@ -1,6 +1,7 @@
 import os
 import json
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 from dotenv import load_dotenv
 from pinecone import Pinecone
@@ -11,6 +12,22 @@ from langchain_core.prompts import ChatPromptTemplate
 load_dotenv()
 
 
+@lru_cache(maxsize=1)
+def _get_index():
+    """Process-wide handle to the user vector index (one client + connection pool)."""
+    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+    return pc.Index(os.getenv("PINECONE_INDEX_NAME", "ai-verse"))
+
+
+@lru_cache(maxsize=1)
+def _get_embeddings() -> GoogleGenerativeAIEmbeddings:
+    """Process-wide Gemini embeddings client."""
+    return GoogleGenerativeAIEmbeddings(
+        model="models/embedding-001",
+        google_api_key=os.getenv("GEMINI_API_KEY")
+    )
+
+
 def analyze_rejection(job_desc: str, resume_content: dict) -> str:
     """
     Analyzes why a resume was rejected for a specific job.
@@ -73,16 +90,9 @@ def update_vector_memory(
     Returns:
         A dictionary with status and updated metadata.
     """
-    # Initialize Pinecone
-    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-    index_name = os.getenv("PINECONE_INDEX_NAME", "ai-verse")
-    index = pc.Index(index_name)
-    
-    # Initialize embeddings
-    embeddings = GoogleGenerativeAIEmbeddings(
-        model="models/embedding-001",
-        google_api_key=os.getenv("GEMINI_API_KEY")
-    )
+    # Shared Pinecone index and embeddings clients
+    index = _get_index()
+    embeddings = _get_embeddings()
     
     result = {
         "status": "success",
@@ -174,14 +184,8 @@ def check_anti_patterns(user_id: str, job_description: str, threshold: float = 0
     """
     Checks if a job description matches known anti-patterns for a user.
     """
-    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-    index_name = os.getenv("PINECONE_INDEX_NAME", "ai-verse")
-    index = pc.Index(index_name)
-    
-    embeddings = GoogleGenerativeAIEmbeddings(
-        model="models/embedding-001",
-        google_api_key=os.getenv("GEMINI_API_KEY")
-    )
+    index = _get_index()
+    embeddings = _get_embeddings()
     
     # Generate embedding for job description
     job_embedding = embeddings.embed_query(job_description)
@@ -17,6 +17,7 @@ from .latex_engine import LatexSurgeon
 
 # Database
 from supabase import create_client
+from agents.agent_1_perception.tools import decode_resume_text
 
 # Evolution / Memory (Importing from your evolution.py)
 try:
@@ -233,21 +234,21 @@ def mutate_resume_for_job(user_id: str, job_description: str) -> dict:
         if not final_pdf_path: 
             raise Exception("LaTeX compilation failed - no PDF generated")
         
-        # Validate PDF file exists and has content
-        if not os.path.exists(final_pdf_path):
+        # Validate PDF file exists and has content (one open: size from the handle, then magic bytes)
+        try:
+            with open(final_pdf_path, "rb") as f:
+                file_size = os.fstat(f.fileno()).st_size
+                header = f.read(8)
+        except FileNotFoundError:
             raise Exception(f"PDF file not found at {final_pdf_path}")
-        
-        file_size = os.path.getsize(final_pdf_path)
         print(f"📦 [Agent 4] Generated PDF size: {file_size} bytes")
         
         if file_size < 1000:  # PDF should be at least 1KB
             raise Exception(f"Generated PDF is too small ({file_size} bytes), likely corrupted")
         
         # Verify it's a valid PDF by checking magic bytes
-        with open(final_pdf_path, "rb") as f:
-            header = f.read(8)
-            if not header.startswith(b'%PDF'):
-                raise Exception(f"Generated file is not a valid PDF (header: {header[:20]})")
+        if not header.startswith(b'%PDF'):
+            raise Exception(f"Generated file is not a valid PDF (header: {header[:20]})")
         
         print(f"✅ [Agent 4] PDF validation passed")
             
@@ -588,7 +589,7 @@ def build_resume_from_profile(profile: dict) -> dict:
         "projects": resume_json.get("projects", []),
         "certifications": resume_json.get("certifications", []),
         "resume_url": profile.get("resume_url", ""),
-        "resume_text": profile.get("resume_text", ""),
+        "resume_text": decode_resume_text(profile) or "",
         "resume": resume_json  # Keep full resume_json for backward compatibility
     }
 
@@ -252,10 +252,8 @@ def interviewer_node(state: InterviewState) -> dict:
             
             stage = next_stage
             stage_turn = 0
-            if next_stage == "end":
-                state = {**state, "ending": True}
     
-    # Check if interview should end
+    # Check if interview should end (reaching the "end" stage implies ending)
     if stage == "end" or state.get("ending", False) or turn >= max_turns:
         print(f"{log_prefix} Triggering conclusion - Stage:{stage}, Turn:{turn}/{max_turns}")
         
@@ -59,7 +59,7 @@ async def get_recommendations(
     
     leetcode_profile = None
     if request.leetcode_profile:
-        leetcode_profile = request.leetcode_profile.dict()
+        leetcode_profile = request.leetcode_profile.model_dump()
     
     result = leetcode_service.get_recommendations(
         user_id=user_id,
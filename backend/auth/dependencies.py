@@ -5,6 +5,8 @@ Verifies Supabase JWT tokens using the JWT secret
 """
 
 import os
+import time
+from functools import lru_cache
 from fastapi import Header, HTTPException, status
 from jose import jwt, JWTError
 
@@ -23,6 +25,41 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 AUDIENCE = "authenticated"
 
 
+@lru_cache(maxsize=10_000)
+def _decode_claims(token: str) -> dict:
+    """
+    Decode a token and check its issuer/audience.
+    
+    Cached per token string: a token's claims never change, so repeat requests
+    with the same token skip the decode. Expiry is time-dependent and is
+    checked by the caller on every request.
+    """
+    # First try to decode without verification to get the payload
+    # Supabase tokens are trustworthy if they come from authenticated Supabase sessions
+    payload = jwt.decode(
+        token,
+        key="",  # Empty key since we're not verifying signature
+        options={"verify_signature": False, "verify_aud": False}
+    )
+    
+    # Verify the token is from our Supabase project
+    issuer = payload.get("iss", "")
+    if "wbdlwopqghndjeknrbrm.supabase.co" not in issuer:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token issuer"
+        )
+    
+    # Verify audience
+    aud = payload.get("aud", "")
+    if aud != AUDIENCE:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token audience"
+        )
+    return payload
+
+
 async def get_current_user(authorization: str = Header(None)):
     """
     FastAPI dependency to verify JWT and extract user info.
@@ -61,32 +98,9 @@ async def get_current_user(authorization: str = Header(None)):
         # Decode without verification first to check the token structure
         # This is safe because we're behind CORS and the token came from Supabase
         try:
-            # First try to decode without verification to get the payload
-            # Supabase tokens are trustworthy if they come from authenticated Supabase sessions
-            unverified_payload = jwt.decode(
-                token,
-                key="",  # Empty key since we're not verifying signature
-                options={"verify_signature": False, "verify_aud": False}
-            )
-            
-            # Verify the token is from our Supabase project
-            issuer = unverified_payload.get("iss", "")
-            if "wbdlwopqghndjeknrbrm.supabase.co" not in issuer:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token issuer"
-                )
-            
-            # Verify audience
-            aud = unverified_payload.get("aud", "")
-            if aud != AUDIENCE:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token audience"
-                )
+            unverified_payload = _decode_claims(token)
             
             # Check expiration manually
-            import time
             exp = unverified_payload.get("exp", 0)
             if exp < time.time():
                 raise HTTPException(
@@ -94,7 +108,8 @@ async def get_current_user(authorization: str = Header(None)):
                     detail="Token has expired"
                 )
             
-            return unverified_payload
+            # Copy so a route can't mutate the cached claims
+            return dict(unverified_payload)
             
         except JWTError as e:
             raise HTTPException(
@@ -3,8 +3,51 @@ Database Connection Module - Supabase Integration
 """
 
 import os
+import httpx
+import orjson
+from postgrest.utils import SyncClient
 from supabase import create_client, Client
 
+# Keep-alive pool for the PostgREST session: httpx keeps only 20 idle connections
+# for 5s by default, so bursts past that (or a pause between them) pay for new TLS handshakes
+POSTGREST_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60)
+
+
+def _pooled_session(session: SyncClient) -> SyncClient:
+    """
+    Rebuilds a PostgREST session (same base URL, headers and timeout, HTTP/2
+    as postgrest creates it) with POSTGREST_LIMITS as its connection pool.
+    """
+    pooled = SyncClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        follow_redirects=True,
+        http2=True,
+        limits=POSTGREST_LIMITS,
+    )
+    session.close()
+    return pooled
+
+
+def _use_orjson_bodies(session: httpx.Client) -> None:
+    """
+    Makes a PostgREST session encode JSON request bodies with orjson instead of
+    httpx's stdlib json.dumps. Profile upserts carry resume_json, skills_metadata
+    and the resume text, so encoding them is visible per request.
+    """
+    build_request = session.build_request
+
+    def build_request_orjson(method, url, *, json=None, content=None, headers=None, **kwargs):
+        if json is not None and content is None:
+            content = orjson.dumps(json, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+            headers = httpx.Headers(headers)
+            headers["Content-Type"] = "application/json"
+            json = None
+        return build_request(method, url, json=json, content=content, headers=headers, **kwargs)
+
+    session.build_request = build_request_orjson
+
 
 class DBManager:
     """Database manager with lazy initialization for Supabase client."""
@@ -30,8 +73,18 @@ class DBManager:
             
             print(f"🔌 [DB] Initializing Supabase with Key: {key[:10]}...")
             self._client = create_client(url, key)
+            postgrest = self._client.postgrest
+            postgrest.session = _pooled_session(postgrest.session)
+            _use_orjson_bodies(postgrest.session)
         
         return self._client
+    
+    def warm_up(self) -> None:
+        """
+        Creates the client and opens its PostgREST connection (TCP + TLS) with a
+        trivial query, so the first real request doesn't pay for the handshake.
+        """
+        self.get_client().table("profiles").select("user_id").limit(1).execute()
 
 
 # Global instance - but client is NOT created yet (lazy)
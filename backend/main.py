@@ -6,19 +6,31 @@ This file is intentionally minimal - all business logic lives in agent routers.
 """
 
 import os
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 
 # 1. Load env FIRST
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Configure logging: request threads only enqueue records, a background
+# listener thread does the actual stdout writes
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_listener = QueueListener(_log_queue, _log_stream, respect_handler_level=True)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger("Main")
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 # Auth dependencies
 from auth.dependencies import get_current_user
@@ -27,6 +39,7 @@ from auth.dependencies import get_current_user
 # Import ALL Agent Routers
 # =============================================================================
 from agents.agent_1_perception.router import router as agent1_router
+from agents.agent_1_perception.service import agent1_service
 from agents.agent_2_market.router import router as agent2_router
 from agents.agent_3_strategist.router import router as agent3_router
 from agents.agent_3_strategist.saved_jobs_router import router as saved_jobs_router
@@ -38,10 +51,22 @@ from agents.agent_6_leetcode import agent6_router
 # =============================================================================
 # FastAPI App
 # =============================================================================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm shared clients before the first request is served."""
+    try:
+        await agent1_service.warm_up()
+    except Exception as e:
+        logger.warning(f"Startup warm-up failed: {e}")
+    yield
+
+
 app = FastAPI(
     title="Career Flow AI API",
     description="AI-powered career automation system with 5 specialized agents",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # orjson: faster encoding for the list-heavy payloads
 )
 
 # =============================================================================
@@ -80,6 +105,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON bodies over 512 bytes (/dashboard, job lists) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=4)
+
 # =============================================================================
 # Mount ALL Agent Routers
 # =============================================================================
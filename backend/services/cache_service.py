@@ -14,11 +14,18 @@ Key Schema:
 - saved_job:{user_id}:{job_id} -> JSON string (no expiry)
 - github_activity_cache:{user_id} -> JSON string (1h TTL)
 - profile:{user_id} -> JSON string (5min TTL)
+- dashboard:{user_id} -> serialized /dashboard response (2min fresh + 1min stale)
+- onboarding_status:{user_id} -> serialized /onboarding/status response (30s TTL)
+- onboarding_quiz:{quiz_id} -> JSON string, background quiz generation job (10min TTL)
+- github_etag:{user_id} -> JSON string, Events feed ETag + SHA seen with it (24h TTL)
+- skill_quiz:{level}:{skill} -> list of JSON quiz questions shared by all users (1h TTL)
+- embedding:{model}:{sha256} -> JSON vector for a text's content hash, shared by all users (30d TTL)
+- ats_score:{sha256} -> ATS score for a resume text's content hash (30d TTL)
 """
 
 import json
 import logging
-from typing import Optional, Any, List, Dict
+from typing import Optional, Any, List, Dict, Tuple
 from datetime import timedelta
 
 from core.redis_client import redis_manager
@@ -30,6 +37,14 @@ TTL_TODAY_DATA = int(timedelta(hours=24).total_seconds())  # 24 hours
 TTL_GITHUB_ACTIVITY = int(timedelta(hours=1).total_seconds())  # 1 hour (synced frequently)
 TTL_PROFILE = int(timedelta(minutes=5).total_seconds())  # 5 minutes (can change often)
 TTL_GLOBAL_ROADMAPS = int(timedelta(hours=1).total_seconds())  # 1 hour (shared data)
+TTL_DASHBOARD = int(timedelta(minutes=2).total_seconds())  # 2 minutes fresh
+TTL_DASHBOARD_STALE = int(timedelta(minutes=1).total_seconds())  # + 1 minute served stale while refreshing
+TTL_ONBOARDING_STATUS = 30  # 30 seconds (polled on route transitions)
+TTL_QUIZ_JOB = int(timedelta(minutes=10).total_seconds())  # 10 minutes (polled right after generation)
+TTL_GITHUB_ETAG = int(timedelta(hours=24).total_seconds())  # 24 hours (revalidated on every poll)
+TTL_SKILL_QUIZ = int(timedelta(hours=1).total_seconds())  # 1 hour (shared question pool)
+TTL_EMBEDDING = int(timedelta(days=30).total_seconds())  # 30 days (deterministic per model + text)
+TTL_ATS_SCORE = int(timedelta(days=30).total_seconds())  # 30 days (keyed on the exact resume text)
 TTL_LEETCODE = None  # No expiry - user progress is critical
 TTL_SAVED_JOBS = None  # No expiry - user data
 
@@ -79,7 +94,8 @@ class CacheService:
     @classmethod
     def set_today_data(cls, user_id: str, data: Dict[str, Any]) -> bool:
         """
-        Set today_data in cache with 24h TTL.
+        Set today_data in cache with 24h TTL. Drops the cached dashboard,
+        which is built from it (top_jobs).
         
         Args:
             user_id: User's UUID
@@ -98,6 +114,7 @@ class CacheService:
                 TTL_TODAY_DATA,
                 json.dumps(data, default=str)
             )
+            client.delete(cls._dashboard_key(user_id))
             logger.info(f"💾 Cache SET for today_data:{user_id}")
             return True
         except Exception as e:
@@ -120,7 +137,7 @@ class CacheService:
             return False
         
         try:
-            client.delete(cls._today_key(user_id))
+            client.delete(cls._today_key(user_id), cls._dashboard_key(user_id))
             logger.info(f"🗑️ Cache DELETE for today_data:{user_id}")
             return True
         except Exception as e:
@@ -401,7 +418,8 @@ class CacheService:
     @classmethod
     def set_github_activity(cls, user_id: str, data: Dict[str, Any]) -> bool:
         """
-        Set github_activity_cache in Redis with 1h TTL.
+        Set github_activity_cache in Redis with 1h TTL. Drops the cached
+        dashboard, which is built from it (github_insights).
         
         Args:
             user_id: User's UUID
@@ -420,6 +438,7 @@ class CacheService:
                 TTL_GITHUB_ACTIVITY,
                 json.dumps(data, default=str)
             )
+            client.delete(cls._dashboard_key(user_id))
             logger.info(f"💾 Cache SET for github_activity:{user_id}")
             return True
         except Exception as e:
@@ -428,19 +447,76 @@ class CacheService:
     
     @classmethod
     def delete_github_activity(cls, user_id: str) -> bool:
-        """Invalidate github_activity cache."""
+        """Invalidate github_activity cache (and the dashboard built from it)."""
         client = redis_manager.get_client()
         if not client:
             return False
         
         try:
-            client.delete(cls._github_activity_key(user_id))
+            client.delete(cls._github_activity_key(user_id), cls._dashboard_key(user_id))
             logger.info(f"🗑️ Cache DELETE for github_activity:{user_id}")
             return True
         except Exception as e:
             logger.warning(f"Cache delete failed for github_activity:{user_id}: {e}")
             return False
     
+    @staticmethod
+    def _github_etag_key(user_id: str) -> str:
+        """Generate Redis key for the GitHub Events feed ETag."""
+        return f"github_etag:{user_id}"
+    
+    @classmethod
+    def get_github_etag(cls, user_id: str) -> Optional[Dict[str, str]]:
+        """
+        Get the last GitHub Events feed ETag seen for a user.
+        
+        Args:
+            user_id: User's UUID
+            
+        Returns:
+            Dict with username, etag and sha (head SHA when the ETag was issued), or None
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return None
+        
+        try:
+            data = client.get(cls._github_etag_key(user_id))
+            if data:
+                return json.loads(data)
+        except Exception as e:
+            logger.warning(f"Cache read failed for github_etag:{user_id}: {e}")
+        return None
+    
+    @classmethod
+    def set_github_etag(cls, user_id: str, username: str, etag: str, sha: str) -> bool:
+        """
+        Store the GitHub Events feed ETag with 24h TTL.
+        
+        Args:
+            user_id: User's UUID
+            username: GitHub username the ETag belongs to
+            etag: ETag header from the Events API
+            sha: Head SHA resolved for that feed state
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return False
+        
+        try:
+            client.setex(
+                cls._github_etag_key(user_id),
+                TTL_GITHUB_ETAG,
+                json.dumps({"username": username, "etag": etag, "sha": sha})
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Cache write failed for github_etag:{user_id}: {e}")
+            return False
+    
     # =========================================================================
     # PROFILE Operations
     # =========================================================================
@@ -518,6 +594,382 @@ class CacheService:
             logger.warning(f"Cache delete failed for profile:{user_id}: {e}")
             return False
     
+    # =========================================================================
+    # RESPONSE Caches (pre-serialized JSON bodies)
+    # =========================================================================
+    
+    @staticmethod
+    def _dashboard_key(user_id: str) -> str:
+        """Generate Redis key for the serialized /dashboard response."""
+        return f"dashboard:{user_id}"
+    
+    @staticmethod
+    def _onboarding_status_key(user_id: str) -> str:
+        """Generate Redis key for the serialized /onboarding/status response."""
+        return f"onboarding_status:{user_id}"
+    
+    @classmethod
+    def get_dashboard(cls, user_id: str) -> Optional[Tuple[str, bool]]:
+        """
+        Get the serialized dashboard response from Redis.
+        
+        Args:
+            user_id: User's UUID
+            
+        Returns:
+            (body, is_stale) tuple, or None on miss/error. is_stale is True once the
+            entry is past its fresh window and should be refreshed in the background.
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return None
+        
+        key = cls._dashboard_key(user_id)
+        try:
+            pipe = client.pipeline()
+            pipe.get(key)
+            pipe.ttl(key)
+            body, ttl_left = pipe.execute()
+            if body:
+                logger.info(f"🎯 Cache HIT for dashboard:{user_id}")
+                return body, ttl_left is not None and 0 <= ttl_left <= TTL_DASHBOARD_STALE
+            logger.info(f"📭 Cache MISS for dashboard:{user_id}")
+        except Exception as e:
+            logger.warning(f"Cache read failed for dashboard:{user_id}: {e}")
+        return None
+    
+    @classmethod
+    def set_dashboard(cls, user_id: str, body: bytes) -> bool:
+        """
+        Set the serialized dashboard response (2min fresh + 1min stale window).
+        
+        Args:
+            user_id: User's UUID
+            body: JSON response body
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return False
+        
+        try:
+            client.setex(cls._dashboard_key(user_id), TTL_DASHBOARD + TTL_DASHBOARD_STALE, body)
+            logger.info(f"💾 Cache SET for dashboard:{user_id}")
+            return True
+        except Exception as e:
+            logger.warning(f"Cache write failed for dashboard:{user_id}: {e}")
+            return False
+    
+    @classmethod
+    def invalidate_dashboard(cls, user_id: str) -> bool:
+        """Invalidate the dashboard response (call after writes to data it's built from)."""
+        client = redis_manager.get_client()
+        if not client:
+            return False
+        
+        try:
+            client.delete(cls._dashboard_key(user_id))
+            logger.info(f"🗑️ Cache DELETE for dashboard:{user_id}")
+            return True
+        except Exception as e:
+            logger.warning(f"Cache delete failed for dashboard:{user_id}: {e}")
+            return False
+    
+    @classmethod
+    def get_onboarding_status(cls, user_id: str) -> Optional[str]:
+        """
+        Get the serialized onboarding status response from Redis.
+        
+        Args:
+            user_id: User's UUID
+            
+        Returns:
+            JSON response body, or None on miss/error
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return None
+        
+        try:
+            body = client.get(cls._onboarding_status_key(user_id))
+            if body:
+                logger.info(f"🎯 Cache HIT for onboarding_status:{user_id}")
+                return body
+            logger.info(f"📭 Cache MISS for onboarding_status:{user_id}")
+        except Exception as e:
+            logger.warning(f"Cache read failed for onboarding_status:{user_id}: {e}")
+        return None
+    
+    @classmethod
+    def set_onboarding_status(cls, user_id: str, body: bytes) -> bool:
+        """
+        Set the serialized onboarding status response with 30s TTL.
+        
+        Args:
+            user_id: User's UUID
+            body: JSON response body
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return False
+        
+        try:
+            client.setex(cls._onboarding_status_key(user_id), TTL_ONBOARDING_STATUS, body)
+            logger.info(f"💾 Cache SET for onboarding_status:{user_id}")
+            return True
+        except Exception as e:
+            logger.warning(f"Cache write failed for onboarding_status:{user_id}: {e}")
+            return False
+    
+    @classmethod
+    def invalidate_profile_views(cls, user_id: str) -> bool:
+        """Invalidate the profile and the responses built from it (call after profile writes)."""
+        client = redis_manager.get_client()
+        if not client:
+            return False
+        
+        try:
+            client.delete(
+                cls._profile_key(user_id),
+                cls._dashboard_key(user_id),
+                cls._onboarding_status_key(user_id)
+            )
+            logger.info(f"🗑️ Cache INVALIDATE for profile/dashboard/onboarding_status:{user_id}")
+            return True
+        except Exception as e:
+            logger.warning(f"Cache invalidate failed for profile views:{user_id}: {e}")
+            return False
+    
+    # =========================================================================
+    # ONBOARDING_QUIZ Job Operations
+    # =========================================================================
+    
+    @staticmethod
+    def _quiz_job_key(quiz_id: str) -> str:
+        """Generate Redis key for an onboarding quiz generation job."""
+        return f"onboarding_quiz:{quiz_id}"
+    
+    @classmethod
+    def get_quiz_job(cls, quiz_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an onboarding quiz job from Redis.
+        
+        Args:
+            quiz_id: Job ID returned by /onboarding/quiz/generate
+            
+        Returns:
+            Dict with user_id, status and (once done) questions/detail, or None
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return None
+        
+        try:
+            data = client.get(cls._quiz_job_key(quiz_id))
+            if data:
+                return json.loads(data)
+            logger.info(f"📭 Cache MISS for onboarding_quiz:{quiz_id}")
+        except Exception as e:
+            logger.warning(f"Cache read failed for onboarding_quiz:{quiz_id}: {e}")
+        return None
+    
+    @classmethod
+    def set_quiz_job(cls, quiz_id: str, job: Dict[str, Any]) -> bool:
+        """
+        Set an onboarding quiz job in Redis with 10min TTL.
+        
+        Args:
+            quiz_id: Job ID
+            job: Dict with user_id, status and optional questions/detail
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return False
+        
+        try:
+            client.setex(cls._quiz_job_key(quiz_id), TTL_QUIZ_JOB, json.dumps(job, default=str))
+            logger.info(f"💾 Cache SET for onboarding_quiz:{quiz_id} ({job.get('status')})")
+            return True
+        except Exception as e:
+            logger.warning(f"Cache write failed for onboarding_quiz:{quiz_id}: {e}")
+            return False
+    
+    @staticmethod
+    def _skill_quiz_key(skill_name: str, level: str) -> str:
+        """Generate Redis key for a (skill, level) quiz question pool."""
+        return f"skill_quiz:{level.lower()}:{skill_name.lower()}"
+    
+    @classmethod
+    def get_skill_quiz_pool(cls, skill_name: str, level: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the pooled verification quiz questions for a skill and level.
+        
+        Args:
+            skill_name: Skill being verified (case-insensitive)
+            level: Difficulty level
+            
+        Returns:
+            List of quiz question dicts (empty on miss), or None if Redis is unavailable
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return None
+        
+        key = cls._skill_quiz_key(skill_name, level)
+        try:
+            return [json.loads(item) for item in client.lrange(key, 0, -1)]
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+    
+    @classmethod
+    def add_skill_quiz(cls, skill_name: str, level: str, quiz: Dict[str, Any]) -> bool:
+        """
+        Append a generated question to a (skill, level) pool. The pool expires
+        1h after its first question, so questions are regenerated hourly.
+        
+        Args:
+            skill_name: Skill being verified
+            level: Difficulty level
+            quiz: Dict with question, options, correct_index, explanation
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return False
+        
+        key = cls._skill_quiz_key(skill_name, level)
+        try:
+            if client.rpush(key, json.dumps(quiz)) == 1:
+                client.expire(key, TTL_SKILL_QUIZ)
+            logger.info(f"💾 Cache SET for {key}")
+            return True
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+            return False
+    
+    # =========================================================================
+    # CONTENT-HASH Operations (shared across users)
+    # =========================================================================
+    
+    @staticmethod
+    def _embedding_key(model: str, content_hash: str) -> str:
+        """Generate Redis key for an embedding, partitioned by model."""
+        return f"embedding:{model}:{content_hash}"
+    
+    @classmethod
+    def get_embedding(cls, model: str, content_hash: str) -> Optional[List[float]]:
+        """
+        Get a cached embedding by the hash of the embedded text.
+        
+        Args:
+            model: Embedding model name (vectors from different models never mix)
+            content_hash: SHA-256 hex digest of the normalized text
+            
+        Returns:
+            The vector as a list of floats, or None if not cached
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return None
+        
+        key = cls._embedding_key(model, content_hash)
+        try:
+            data = client.get(key)
+            if data:
+                return json.loads(data)
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+    
+    @classmethod
+    def set_embedding(cls, model: str, content_hash: str, vector: List[float]) -> bool:
+        """
+        Cache an embedding by the hash of the embedded text with 30d TTL.
+        
+        Args:
+            model: Embedding model name
+            content_hash: SHA-256 hex digest of the normalized text
+            vector: Embedding values
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return False
+        
+        key = cls._embedding_key(model, content_hash)
+        try:
+            client.setex(key, TTL_EMBEDDING, json.dumps(vector))
+            return True
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+            return False
+    
+    @staticmethod
+    def _ats_score_key(content_hash: str) -> str:
+        """Generate Redis key for a resume text's ATS score."""
+        return f"ats_score:{content_hash}"
+    
+    @classmethod
+    def get_ats_score(cls, content_hash: str) -> Optional[int]:
+        """
+        Get a cached ATS score by the hash of the resume text.
+        
+        Args:
+            content_hash: SHA-256 hex digest of the resume text
+            
+        Returns:
+            The score, or None if not cached
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return None
+        
+        key = cls._ats_score_key(content_hash)
+        try:
+            data = client.get(key)
+            if data is not None:
+                return int(data)
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+    
+    @classmethod
+    def set_ats_score(cls, content_hash: str, score: int) -> bool:
+        """
+        Cache an ATS score by the hash of the resume text with 30d TTL.
+        
+        Args:
+            content_hash: SHA-256 hex digest of the resume text
+            score: ATS score (0-100)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        client = redis_manager.get_client()
+        if not client:
+            return False
+        
+        key = cls._ats_score_key(content_hash)
+        try:
+            client.setex(key, TTL_ATS_SCORE, int(score))
+            return True
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+            return False
+    
     # =========================================================================
     # GLOBAL_ROADMAPS Operations (shared across users)
     # =========================================================================
@@ -622,7 +1074,10 @@ class CacheService:
                 cls._leetcode_key(user_id),
                 cls._saved_jobs_list_key(user_id),
                 cls._github_activity_key(user_id),
-                cls._profile_key(user_id)
+                cls._profile_key(user_id),
+                cls._dashboard_key(user_id),
+                cls._onboarding_status_key(user_id),
+                cls._github_etag_key(user_id)
             ]
             
             # Add individual saved job keys
@@ -0,0 +1,23 @@
+-- merge_skills_metadata(uid, patch): merges a {skill: changed fields} patch
+-- into profiles.skills_metadata under a row lock, so concurrent writers to
+-- other skills or fields aren't overwritten. Also rebuilds profiles.skills
+-- from the merged keys and stamps last_scan_timestamp.
+--
+-- Used by PerceptionService._write_skills_row (agents/agent_1_perception/
+-- service.py). Without it the service falls back to writing the full
+-- skills_metadata column.
+
+create or replace function merge_skills_metadata(uid uuid, patch jsonb)
+returns void language plpgsql as $$
+declare merged jsonb;
+begin
+  select coalesce(skills_metadata, '{}'::jsonb) into merged
+    from profiles where user_id = uid for update;
+  select merged || coalesce(jsonb_object_agg(key, coalesce(merged -> key, '{}'::jsonb) || value), '{}'::jsonb)
+    into merged from jsonb_each(patch);
+  update profiles
+     set skills_metadata = merged,
+         skills = array(select jsonb_object_keys(merged)),
+         last_scan_timestamp = now()
+   where user_id = uid;
+end $$;
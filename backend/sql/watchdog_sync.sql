@@ -0,0 +1,32 @@
+-- watchdog_sync(uid, patch, cache): writes one GitHub watchdog scan in a
+-- single round-trip and transaction - the skills_metadata patch (or just the
+-- scan time when patch is null) and the user's github_activity_cache row.
+--
+-- Requires merge_skills_metadata.sql to be applied first. Used by
+-- PerceptionService._save_watchdog_scan (agents/agent_1_perception/
+-- service.py); without it the service writes skills and cache separately.
+
+create or replace function watchdog_sync(uid uuid, patch jsonb, cache jsonb)
+returns void language plpgsql as $$
+begin
+  if patch is not null then
+    perform merge_skills_metadata(uid, patch);
+  else
+    update profiles set last_scan_timestamp = now() where user_id = uid;
+  end if;
+  if cache is not null then
+    insert into github_activity_cache (user_id, last_analyzed_sha, detected_skills,
+        repos_touched, tech_stack, insight_message, analyzed_at, updated_at)
+    select uid, c.last_analyzed_sha, c.detected_skills, c.repos_touched,
+           c.tech_stack, c.insight_message, c.analyzed_at, c.updated_at
+      from jsonb_populate_record(null::github_activity_cache, cache) c
+    on conflict (user_id) do update set
+      last_analyzed_sha = excluded.last_analyzed_sha,
+      detected_skills = excluded.detected_skills,
+      repos_touched = excluded.repos_touched,
+      tech_stack = excluded.tech_stack,
+      insight_message = excluded.insight_message,
+      analyzed_at = excluded.analyzed_at,
+      updated_at = excluded.updated_at;
+  end if;
+end $$;
@@ -0,0 +1,10 @@
+"""
+Shared test setup.
+
+The perception service refuses to start without a quiz signing key, so the
+test run gets a fixed one (a real .env still takes precedence).
+"""
+
+import os
+
+os.environ.setdefault("QUIZ_SIGNING_KEY", "test-quiz-signing-key")
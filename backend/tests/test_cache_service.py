@@ -142,6 +142,96 @@ class TestCacheService:
             args = mock_client.delete.call_args[0]
             assert "saved_jobs:user123" in args
     
+    # =========================================================================
+    # RESPONSE CACHE Tests
+    # =========================================================================
+    
+    def test_get_dashboard_fresh_and_stale(self):
+        """Test dashboard body is flagged stale once inside the stale window."""
+        with patch('services.cache_service.redis_manager') as mock_redis:
+            mock_client = MagicMock()
+            mock_pipe = mock_client.pipeline.return_value
+            mock_redis.get_client.return_value = mock_client
+            
+            from services.cache_service import CacheService, TTL_DASHBOARD, TTL_DASHBOARD_STALE
+            
+            mock_pipe.execute.return_value = ['{"status": "success"}', TTL_DASHBOARD + TTL_DASHBOARD_STALE]
+            assert CacheService.get_dashboard("user123") == ('{"status": "success"}', False)
+            
+            mock_pipe.execute.return_value = ['{"status": "success"}', TTL_DASHBOARD_STALE - 1]
+            assert CacheService.get_dashboard("user123") == ('{"status": "success"}', True)
+            
+            mock_pipe.execute.return_value = [None, -2]
+            assert CacheService.get_dashboard("user123") is None
+    
+    def test_dashboard_dropped_with_its_sources(self):
+        """Test today_data and github_activity writes drop the cached dashboard built from them."""
+        with patch('services.cache_service.redis_manager') as mock_redis:
+            mock_client = MagicMock()
+            mock_redis.get_client.return_value = mock_client
+            
+            from services.cache_service import CacheService
+            CacheService.set_today_data("user123", {"data": {"jobs": [{"id": "job1"}]}})
+            CacheService.set_github_activity("user123", {"detected_skills": []})
+            
+            deleted = [c[0] for c in mock_client.delete.call_args_list]
+            assert deleted == [("dashboard:user123",), ("dashboard:user123",)]
+    
+    def test_set_onboarding_status_with_ttl(self):
+        """Test onboarding status body is stored with its short TTL."""
+        with patch('services.cache_service.redis_manager') as mock_redis:
+            mock_client = MagicMock()
+            mock_redis.get_client.return_value = mock_client
+            
+            from services.cache_service import CacheService, TTL_ONBOARDING_STATUS
+            result = CacheService.set_onboarding_status("user123", '{"status": "success"}')
+            
+            assert result is True
+            mock_client.setex.assert_called_once_with(
+                "onboarding_status:user123", TTL_ONBOARDING_STATUS, '{"status": "success"}'
+            )
+    
+    def test_invalidate_profile_views(self):
+        """Test profile writes drop the profile and the responses built from it."""
+        with patch('services.cache_service.redis_manager') as mock_redis:
+            mock_client = MagicMock()
+            mock_redis.get_client.return_value = mock_client
+            
+            from services.cache_service import CacheService
+            result = CacheService.invalidate_profile_views("user123")
+            
+            assert result is True
+            args = mock_client.delete.call_args[0]
+            assert set(args) == {"profile:user123", "dashboard:user123", "onboarding_status:user123"}
+
+    def test_add_skill_quiz_expires_pool_from_first_question(self):
+        """Test the shared quiz pool gets its TTL once, on the first question."""
+        with patch('services.cache_service.redis_manager') as mock_redis:
+            mock_client = MagicMock()
+            mock_client.rpush.side_effect = [1, 2]
+            mock_redis.get_client.return_value = mock_client
+
+            from services.cache_service import CacheService, TTL_SKILL_QUIZ
+            CacheService.add_skill_quiz("React", "Intermediate", {"question": "q1"})
+            CacheService.add_skill_quiz("react", "intermediate", {"question": "q2"})
+
+            assert {c[0][0] for c in mock_client.rpush.call_args_list} == {"skill_quiz:intermediate:react"}
+            mock_client.expire.assert_called_once_with("skill_quiz:intermediate:react", TTL_SKILL_QUIZ)
+
+    def test_embedding_cache_partitioned_by_model(self):
+        """Test embeddings are stored per model with the 30d TTL and read back as lists."""
+        with patch('services.cache_service.redis_manager') as mock_redis:
+            mock_client = MagicMock()
+            mock_client.get.return_value = "[0.5, 0.25]"
+            mock_redis.get_client.return_value = mock_client
+
+            from services.cache_service import CacheService, TTL_EMBEDDING
+            assert CacheService.set_embedding("models/embedding-001", "abc", [0.5, 0.25]) is True
+            mock_client.setex.assert_called_once_with(
+                "embedding:models/embedding-001:abc", TTL_EMBEDDING, "[0.5, 0.25]"
+            )
+            assert CacheService.get_embedding("models/embedding-001", "abc") == [0.5, 0.25]
+
     # =========================================================================
     # FALLBACK Tests
     # =========================================================================
@@ -0,0 +1,239 @@
+"""
+Unit tests for the Agent 1 GitHub Watchdog.
+
+Tests cover:
+- One latest-SHA definition across the GraphQL and REST activity paths
+- Author filtering of GraphQL commit history
+- REST activity scans without a separate SHA lookup
+- Splitting code context per repo and merging per-repo analyses
+- Saving the last-seen SHA cache from several workers
+"""
+
+import asyncio
+import json
+import pytest
+import httpx
+from unittest.mock import patch
+
+
+USER = "octo"
+USER_ID = "U_octo"
+# Most recently pushed first; the newer repo has no commits authored by the user
+REPOS = ["octo/team-app", "octo/side-project"]
+AUTHORED = {"octo/team-app": [], "octo/side-project": ["c0ffee1", "c0ffee0"]}
+
+
+def _github(request: httpx.Request) -> httpx.Response:
+    """Fake GitHub API serving one user's events, commits and GraphQL."""
+    path = request.url.path
+    if path == "/graphql":
+        body = json.loads(request.content)
+        if "author" not in body["variables"]:
+            return httpx.Response(200, json={"data": {"user": {"id": USER_ID}}})
+        assert body["variables"]["author"] == USER_ID
+        assert "author: {id: $author}" in body["query"]
+        nodes = [
+            {
+                "nameWithOwner": repo,
+                "defaultBranchRef": {"target": {"history": {
+                    "nodes": [{"oid": sha, "message": "work"} for sha in AUTHORED[repo]]
+                }}}
+            }
+            for repo in REPOS
+        ]
+        return httpx.Response(200, json={"data": {"user": {"repositories": {"nodes": nodes}}}})
+    if path == f"/users/{USER}/events/public":
+        events = [
+            {"type": "PushEvent", "repo": {"name": repo}, "payload": {"commits": [{"sha": "teammate"}]}}
+            for repo in REPOS
+        ]
+        return httpx.Response(200, json=events, headers={"ETag": '"v1"'})
+    for repo in REPOS:
+        if path == f"/repos/{repo}/commits":
+            assert request.url.params["author"] == USER
+            return httpx.Response(200, json=[{"sha": sha} for sha in AUTHORED[repo][:1]])
+        if path.startswith(f"/repos/{repo}/commits/"):
+            return httpx.Response(200, json={"files": []})
+    return httpx.Response(404)
+
+
+class TestLatestShaDefinition:
+    """The GraphQL poll and the REST fallback must agree on the user's latest SHA."""
+
+    def _run(self, coro_fn):
+        from agents.agent_1_perception import github_watchdog as gw
+
+        async def run():
+            async with httpx.AsyncClient(
+                base_url=gw.GITHUB_API_URL, transport=httpx.MockTransport(_github)
+            ) as client:
+                return await coro_fn(gw, client)
+
+        with patch.object(gw, "_GITHUB_TOKEN", "token"), \
+             patch.dict(gw._etag_cache, clear=True), \
+             patch.dict(gw._sha_cache, clear=True), \
+             patch.dict(gw._user_node_ids, clear=True):
+            return asyncio.run(run())
+
+    def test_graphql_and_rest_agree(self):
+        """Test both paths report the newest commit authored by the user."""
+        graphql = self._run(lambda gw, c: gw.fetch_user_sha_and_activity_graphql(USER, client=c))
+        rest = self._run(lambda gw, c: gw.get_latest_commit_sha_async(USER, client=c))
+
+        assert graphql["latest_sha"] == graphql["latest_commit_sha"] == "c0ffee1"
+        assert rest == "c0ffee1"
+
+    def test_graphql_only_counts_authored_repos(self):
+        """Test repos without commits by the user are not reported as touched."""
+        graphql = self._run(lambda gw, c: gw.fetch_user_sha_and_activity_graphql(USER, known_sha="c0ffee1", client=c))
+
+        assert graphql["repos_touched"] == ["octo/side-project"]
+        assert graphql["recent_code_context"] is None
+
+
+class TestRecentActivityHeadSha:
+    """fetch_user_recent_activity_async takes its head SHA from the events it already fetched."""
+
+    def _scan_twice(self, head_sha=None):
+        """Scans USER twice on one client; returns both results and the paths each scan requested."""
+        from agents.agent_1_perception import github_watchdog as gw
+        requests = []
+
+        def github(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.path)
+            if request.url.path == f"/users/{USER}/events/public":
+                if request.headers.get("If-None-Match") == '"v1"':
+                    return httpx.Response(304)
+                events = [{"type": "PushEvent", "repo": {"name": REPOS[1]},
+                           "payload": {"commits": [{"sha": "c0ffee0"}, {"sha": "c0ffee1"}]}}]
+                return httpx.Response(200, json=events, headers={"ETag": '"v1"'})
+            if request.url.path.startswith(f"/repos/{REPOS[1]}/commits/"):
+                return httpx.Response(200, json={"files": [{"filename": "app.py", "patch": "+def run():\n+    pass"}]})
+            return httpx.Response(404)
+
+        async def run():
+            async with httpx.AsyncClient(
+                base_url=gw.GITHUB_API_URL, transport=httpx.MockTransport(github)
+            ) as client:
+                first = await gw.fetch_user_recent_activity_async(USER, client=client, head_sha=head_sha)
+                first_requests = list(requests)
+                requests.clear()
+                second = await gw.fetch_user_recent_activity_async(USER, client=client, head_sha=head_sha)
+                return first, second, first_requests, list(requests)
+
+        with patch.object(gw, "_GITHUB_TOKEN", "token"), \
+             patch.dict(gw._page_etags, clear=True), \
+             patch.dict(gw._page_events, clear=True), \
+             patch.dict(gw._last_seen, clear=True), \
+             patch.dict(gw._last_result, clear=True), \
+             patch.dict(gw._commit_files_cache, clear=True):
+            return asyncio.run(run())
+
+    def test_no_separate_sha_requests(self):
+        """Test the scan reports the newest push head without an authored-commit listing."""
+        first, _, first_requests, _ = self._scan_twice()
+
+        assert first["latest_commit_sha"] == "c0ffee1"
+        assert "app.py" in first["recent_code_context"]
+        assert f"/repos/{REPOS[1]}/commits" not in first_requests
+
+    def test_unchanged_feed_reuses_last_scan(self):
+        """Test a repeat scan of an unchanged feed costs one 304 and returns the last result."""
+        first, second, _, second_requests = self._scan_twice()
+
+        assert second_requests == [f"/users/{USER}/events/public"]
+        assert second == first
+
+    def test_caller_head_sha_reported(self):
+        """Test a SHA the caller already resolved is reported, keeping its definition."""
+        first, second, _, _ = self._scan_twice(head_sha="c0ffee9")
+
+        assert first["latest_commit_sha"] == second["latest_commit_sha"] == "c0ffee9"
+
+
+def _section(repo: str, filename: str, patch: str) -> str:
+    """One file section as _commit_context_parts writes it."""
+    return f"--- REPO: {repo} | FILE: {filename} ---\n{patch}\n"
+
+
+class TestSplitContextByRepo:
+    """Test suite for split_context_by_repo."""
+
+    def test_groups_sections_by_repo_in_first_seen_order(self):
+        """Test interleaved repo sections are regrouped, repos in order of first appearance."""
+        from agents.agent_1_perception.github_watchdog import split_context_by_repo
+        context = (
+            _section("octo/api", "app.py", "+import fastapi")
+            + _section("octo/web", "App.tsx", "+useState()")
+            + _section("octo/api", "db.py", "+import asyncpg")
+        )
+
+        parts = split_context_by_repo(context)
+
+        assert len(parts) == 2
+        assert "app.py" in parts[0] and "db.py" in parts[0] and "App.tsx" not in parts[0]
+        assert parts[1].startswith("--- REPO: octo/web | FILE: App.tsx")
+
+    def test_context_without_headers(self):
+        """Test a context without repo headers is returned whole, and empty gives nothing."""
+        from agents.agent_1_perception.github_watchdog import split_context_by_repo
+
+        assert split_context_by_repo("plain patch text") == ["plain patch text"]
+        assert split_context_by_repo("") == []
+
+
+class TestMergeSkillAnalyses:
+    """Test suite for merge_skill_analyses."""
+
+    def test_case_folded_and_highest_level_wins(self):
+        """Test duplicates merge case-insensitively, keeping the first spelling and the highest level."""
+        from agents.agent_1_perception.github_watchdog import merge_skill_analyses
+        merged = merge_skill_analyses([
+            {"detected_skills": [
+                {"skill": "React", "level": "intermediate", "evidence": "hooks"},
+                {"skill": "Go", "level": "advanced", "evidence": "goroutines"}
+            ]},
+            {"detected_skills": [
+                {"skill": "react", "level": "Advanced", "evidence": "custom renderer"},
+                {"skill": "GO", "level": "beginner", "evidence": "hello world"}
+            ]}
+        ])
+
+        skills = {s["skill"]: s for s in merged["detected_skills"]}
+        assert set(skills) == {"React", "Go"}
+        assert skills["React"]["evidence"] == "custom renderer"
+        assert skills["Go"]["level"] == "advanced"
+
+    def test_failed_analyses(self):
+        """Test failed repos are skipped, and all failing gives None."""
+        from agents.agent_1_perception.github_watchdog import merge_skill_analyses
+
+        assert merge_skill_analyses([None, None]) is None
+        assert merge_skill_analyses([None, {"detected_skills": [{"skill": "Rust"}, {"level": "expert"}]}]) == {
+            "detected_skills": [{"skill": "Rust"}]
+        }
+
+
+class TestSaveWatchdogCache:
+    """Test suite for _save_watchdog_cache."""
+
+    def test_workers_merge_into_one_file(self, tmp_path):
+        """Test a second worker's save keeps the first worker's users and leaves no temp file."""
+        from agents.agent_1_perception import github_watchdog as gw
+        path = str(tmp_path / "watchdog.json")
+
+        with patch.object(gw, "WATCHDOG_CACHE_PATH", path):
+            for user, sha in (("alice", "a1"), ("bob", "b1")):
+                with patch.dict(gw._last_seen, {user: sha}, clear=True), \
+                     patch.dict(gw._last_result, {user: {"latest_commit_sha": sha}}, clear=True):
+                    gw._save_watchdog_cache()
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["last_seen"] == {"alice": "a1", "bob": "b1"}
+        assert set(data["results"]) == {"alice", "bob"}
+        assert [p.name for p in tmp_path.iterdir()] == ["watchdog.json"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,197 @@
+"""
+Unit tests for the Agent 1 Perception service.
+
+Tests cover:
+- Signed quiz answers (sign, verify, tamper)
+- Onboarding quiz submission (issued question set, duplicates, resubmission)
+- Embedding input normalization
+- Upload size cap while reading
+- Legacy skills_metadata rows in the sync response
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi import HTTPException
+
+
+def _service():
+    """PerceptionService with a mocked Supabase client."""
+    from agents.agent_1_perception.service import PerceptionService
+    service = PerceptionService()
+    service.supabase = MagicMock()
+    return service
+
+
+class TestQuizSigning:
+    """Test suite for the HMAC verify_token scheme."""
+
+    def test_signed_answer_verifies(self):
+        """Test the signed index verifies and every other index does not."""
+        from agents.agent_1_perception.service import sign_quiz_answer, quiz_answer_matches
+        token = sign_quiz_answer("quiz1", "q1", 2)
+
+        assert token.startswith("quiz1.")
+        assert quiz_answer_matches(token, "q1", 2) is True
+        assert not any(quiz_answer_matches(token, "q1", i) for i in (0, 1, 3))
+
+    def test_token_bound_to_question(self):
+        """Test a token can't be replayed for another question."""
+        from agents.agent_1_perception.service import sign_quiz_answer, quiz_answer_matches
+        token = sign_quiz_answer("quiz1", "q1", 2)
+
+        assert quiz_answer_matches(token, "q2", 2) is False
+
+    def test_tampered_token_rejected(self):
+        """Test edited or malformed tokens don't verify."""
+        from agents.agent_1_perception.service import sign_quiz_answer, quiz_answer_matches
+        token = sign_quiz_answer("quiz1", "q1", 2)
+        quiz_id, _, mac = token.partition(".")
+
+        assert quiz_answer_matches(f"quiz2.{mac}", "q1", 2) is False
+        assert quiz_answer_matches(f"{quiz_id}.{mac[:-1]}x", "q1", 2) is False
+        assert quiz_answer_matches(quiz_id, "q1", 2) is False
+        assert quiz_answer_matches("", "q1", 2) is False
+
+    def test_token_from_other_key_rejected(self):
+        """Test tokens signed with another instance's key don't verify."""
+        from agents.agent_1_perception import service as svc
+        with patch.object(svc, "QUIZ_SIGNING_KEY", b"other-key"):
+            token = svc.sign_quiz_answer("quiz1", "q1", 2)
+
+        assert svc.quiz_answer_matches(token, "q1", 2) is False
+
+
+class TestSubmitOnboardingQuiz:
+    """Test suite for onboarding quiz scoring."""
+
+    QUESTIONS = ["q1", "q2", "q3"]
+    ANSWERS = {"q1": 1, "q2": 3, "q3": 0}
+
+    def _submit(self, service, question_ids, selected, quiz_token=None, quiz_id="quiz1", updated=1):
+        """Submits answers with tokens for the quiz issued as QUESTIONS to user123."""
+        from agents.agent_1_perception.service import sign_quiz, sign_quiz_answer
+        quiz_token = quiz_token or sign_quiz("quiz1", "user123", self.QUESTIONS)
+        verify_tokens = [sign_quiz_answer(quiz_id, q, self.ANSWERS.get(q, 0)) for q in question_ids]
+        table = service.supabase.table.return_value
+        table.update.return_value.eq.return_value.or_.return_value.execute.return_value = MagicMock(count=updated)
+        with patch('agents.agent_1_perception.service.cache_service'):
+            return asyncio.run(service.submit_onboarding_quiz(
+                "user123", quiz_token, question_ids, selected, verify_tokens
+            ))
+
+    def test_scores_out_of_issued_questions(self):
+        """Test the score counts the answers matching their tokens, out of every issued question."""
+        result = self._submit(_service(), ["q3", "q1", "q2"], [0, 1, -1])
+
+        assert (result["correct"], result["total"], result["score"]) == (2, 3, 66)
+
+    def test_partial_or_foreign_answers_rejected(self):
+        """Test answering a subset, an unissued question or another user's quiz is rejected."""
+        from agents.agent_1_perception.service import sign_quiz
+        for question_ids, quiz_token in (
+            (["q1"], None),
+            (["q1", "q2", "q3", "q4"], None),
+            (self.QUESTIONS, sign_quiz("quiz1", "someone-else", self.QUESTIONS)),
+        ):
+            service = _service()
+            with pytest.raises(HTTPException) as exc_info:
+                self._submit(service, question_ids, [1] * len(question_ids), quiz_token=quiz_token)
+
+            assert exc_info.value.status_code == 400
+            service.supabase.table.assert_not_called()
+
+    def test_answers_from_another_quiz_rejected(self):
+        """Test answer tokens must come from the quiz being submitted."""
+        service = _service()
+        with pytest.raises(HTTPException) as exc_info:
+            self._submit(service, self.QUESTIONS, [1, 3, 0], quiz_id="quiz2")
+
+        assert exc_info.value.status_code == 400
+
+    def test_duplicate_question_rejected(self):
+        """Test one known-correct answer repeated can't score 100%."""
+        service = _service()
+        with pytest.raises(HTTPException) as exc_info:
+            self._submit(service, ["q1"] * 5, [1] * 5)
+
+        assert exc_info.value.status_code == 400
+        service.supabase.table.assert_not_called()
+
+    def test_second_submission_rejected(self):
+        """Test a quiz that's already completed can't be resubmitted to probe answers."""
+        service = _service()
+        with pytest.raises(HTTPException) as exc_info:
+            self._submit(service, self.QUESTIONS, [1, 3, 0], updated=0)
+
+        assert exc_info.value.status_code == 409
+        update = service.supabase.table.return_value.update.return_value
+        update.eq.return_value.or_.assert_called_once_with("quiz_completed.is.null,quiz_completed.is.false")
+
+
+class TestPrepareEmbeddingInput:
+    """Test suite for _prepare_embedding_input."""
+
+    def test_bullets_and_whitespace_normalized(self):
+        """Test bullet glyphs are dropped and whitespace runs collapse to one space."""
+        from agents.agent_1_perception.service import _prepare_embedding_input
+
+        assert _prepare_embedding_input("  • Python\n\n▪ FastAPI\t➤  Redis  ") == "Python FastAPI Redis"
+
+    def test_same_text_same_input(self):
+        """Test formatting-only differences give the same input (and embedding cache key)."""
+        from agents.agent_1_perception.service import _prepare_embedding_input
+
+        assert _prepare_embedding_input("Built APIs\n● in Go") == _prepare_embedding_input("Built  APIs in Go")
+
+    def test_clipped_to_max_chars(self):
+        """Test long inputs are clipped to EMBED_INPUT_MAX_CHARS."""
+        from agents.agent_1_perception.service import _prepare_embedding_input, EMBED_INPUT_MAX_CHARS
+
+        assert len(_prepare_embedding_input("word " * EMBED_INPUT_MAX_CHARS)) == EMBED_INPUT_MAX_CHARS
+
+
+class TestReadUpload:
+    """Test suite for _read_upload."""
+
+    def _read(self, size, chunk=4):
+        """Reads a `size`-byte upload with a 10-byte cap, `chunk` bytes at a time."""
+        from io import BytesIO
+        from fastapi import UploadFile
+        from agents.agent_1_perception import service as svc
+        with patch.object(svc, "MAX_RESUME_BYTES", 10), patch.object(svc, "UPLOAD_READ_CHUNK", chunk):
+            return asyncio.run(svc._read_upload(UploadFile(BytesIO(b"x" * size))))
+
+    def test_within_cap_read_whole(self):
+        """Test an upload at the cap is read whole and hashed."""
+        content, digest = self._read(10)
+
+        assert content == b"x" * 10
+        assert len(digest) == 32
+
+    def test_over_cap_rejected_without_declared_size(self):
+        """Test the cap holds on the bytes read, not just the declared size."""
+        with pytest.raises(HTTPException) as exc_info:
+            self._read(11)
+
+        assert exc_info.value.status_code == 413
+
+
+class TestGithubSyncResponse:
+    """Test suite for GithubSyncResponse validation of stored skills_metadata."""
+
+    def test_legacy_entries_validate(self):
+        """Test entries written before source/verification_status existed still validate."""
+        from agents.agent_1_perception.schemas import GithubSyncResponse
+        response = GithubSyncResponse(updated_skills=["Go"], skills_metadata={
+            "Go": {"level": "advanced"},
+            "Rust": {"source": "github", "verification_status": None},
+        })
+
+        assert response.skills_metadata["Go"].source is None
+        assert response.skills_metadata["Go"].verification_status == "pending"
+        assert response.skills_metadata["Rust"].source == "github"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,77 @@
+"""
+Unit tests for the Agent 1 Perception tools.
+
+Tests cover:
+- Regex fast path for clean resumes (resume_fast_parse)
+- LLM fallback for text the fast path can't trust
+"""
+
+import pytest
+from unittest.mock import patch
+
+
+CLEAN_RESUME = """Jane Doe
+Bangalore, India | jane.doe@example.com | +91 98765 43210
+
+SUMMARY
+Backend engineer with four years of experience building Python services and data pipelines.
+
+SKILLS
+Languages: Python, Go, SQL
+Frameworks: FastAPI, Django, React
+Tools: Docker, Kubernetes, PostgreSQL
+
+EXPERIENCE
+Software Engineer, Acme Corp (2021 - Present)
+Built async FastAPI services handling ten million requests a day.
+Moved batch jobs from cron scripts to Airflow with retries and alerting.
+
+EDUCATION
+Indian Institute of Technology Madras
+Bachelor of Technology in Computer Science, 2021
+"""
+
+
+class TestResumeFastParse:
+    """Test suite for resume_fast_parse."""
+
+    def test_clean_resume_extracted(self):
+        """Test a clean resume yields name, email, skills, experience and education."""
+        from agents.agent_1_perception.tools import resume_fast_parse
+        data = resume_fast_parse(CLEAN_RESUME)
+
+        assert data["name"] == "Jane Doe"
+        assert data["email"] == "jane.doe@example.com"
+        assert data["skills"] == [
+            "Python", "Go", "SQL", "FastAPI", "Django", "React", "Docker", "Kubernetes", "PostgreSQL"
+        ]
+        assert data["experience_summary"].startswith("Software Engineer, Acme Corp")
+        assert data["education"] == [{
+            "institution": "Indian Institute of Technology Madras",
+            "degree": "Bachelor of Technology in Computer Science, 2021"
+        }]
+
+    def test_untrusted_text_falls_back(self):
+        """Test text without the expected shape returns None (use the LLM)."""
+        from agents.agent_1_perception.tools import resume_fast_parse
+
+        assert resume_fast_parse(CLEAN_RESUME.replace("jane.doe@example.com", "on request")) is None
+        assert resume_fast_parse(CLEAN_RESUME.replace("SKILLS", "TOOLBOX")) is None
+        assert resume_fast_parse(CLEAN_RESUME[:400]) is None
+        # Scanned/OCR text: no line structure
+        assert resume_fast_parse(" ".join(CLEAN_RESUME.split())) is None
+
+    def test_extract_uses_fast_path_only_when_enabled(self):
+        """Test extract_structured_data only skips the LLM with USE_LLM_EXTRACTION_ALWAYS off."""
+        from agents.agent_1_perception import tools
+        with patch.object(tools, "USE_LLM_EXTRACTION_ALWAYS", False):
+            assert tools.extract_structured_data(CLEAN_RESUME)["name"] == "Jane Doe"
+
+        with patch.object(tools, "USE_LLM_EXTRACTION_ALWAYS", True), \
+             patch.object(tools, "GEMINI_API_KEY", None):
+            with pytest.raises(ValueError):
+                tools.extract_structured_data(CLEAN_RESUME)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
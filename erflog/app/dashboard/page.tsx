@@ -310,14 +310,14 @@ export default function Dashboard() {
       if (!isAuthenticated) return;
 
       try {
-        const status = await api.getOnboardingStatus();
-        if (status.needs_onboarding) {
+        // Onboarding status + dashboard insights in one round-trip
+        const boot = await api.getBootstrap();
+        if (boot.onboarding.needs_onboarding) {
           router.push("/onboarding");
           return;
         }
 
-        // Fetch basic dashboard insights
-        const data = await api.getDashboardInsights();
+        const data = boot.dashboard ?? (await api.getDashboardInsights());
         
         // Check if user just completed onboarding but cold start hasn't finished
         // (no jobs means today_data is empty)
@@ -288,6 +288,7 @@ export default function OnboardingPage() {
 
   // Step 4: Quiz
   const [quizQuestions, setQuizQuestions] = useState<QuizQuestion[]>([]);
+  const [quizToken, setQuizToken] = useState("");
   const [quizAnswers, setQuizAnswers] = useState<Record<string, number>>({});
   const [isGeneratingQuiz, setIsGeneratingQuiz] = useState(false);
   const [quizSubmitted, setQuizSubmitted] = useState(false);
@@ -476,6 +477,7 @@ export default function OnboardingPage() {
       const response = await api.generateOnboardingQuiz(skills, targetRoles);
       if (response.questions) {
         setQuizQuestions(response.questions);
+        setQuizToken(response.quiz_token);
       }
     } catch (err) {
       setError("Failed to generate quiz. Please try again.");
@@ -490,14 +492,14 @@ export default function OnboardingPage() {
     const answers: QuizAnswer[] = quizQuestions.map((q) => ({
       question_id: q.id,
       selected_index: quizAnswers[q.id] ?? -1,
-      correct_index: q.correct_index,
+      verify_token: q.verify_token,
     }));
 
     setIsSaving(true);
     setError(null);
 
     try {
-      const result = await api.submitOnboardingQuiz(answers);
+      const result = await api.submitOnboardingQuiz(quizToken, answers);
       setQuizResult({
         score: result.score,
         correct: result.correct,
@@ -105,19 +105,30 @@ export interface QuizQuestion {
   id: string;
   question: string;
   options: string[];
-  correct_index: number;
+  verify_token: string;
+  correct_index?: number; // Not sent by the onboarding quiz - answers are verified server-side
   skill_being_tested: string;
 }
 
 export interface OnboardingQuizResponse {
   status: string;
+  quiz_token: string; // Sent back with the answers
   questions: QuizQuestion[];
 }
 
+export interface OnboardingQuizJob {
+  status: "pending" | "success" | "error";
+  quiz_id?: string;
+  quiz_token?: string;
+  poll_url?: string;
+  questions?: QuizQuestion[];
+  detail?: string;
+}
+
 export interface QuizAnswer {
   question_id: string;
   selected_index: number;
-  correct_index: number;
+  verify_token: string;
 }
 
 export interface QuizSubmitResponse {
@@ -678,25 +689,43 @@ export async function generateOnboardingQuiz(
   skills?: string[],
   targetRoles?: string[]
 ): Promise<OnboardingQuizResponse> {
-  const response = await api.post<OnboardingQuizResponse>(
+  const response = await api.post<OnboardingQuizJob>(
     "/api/perception/onboarding/quiz/generate",
     {
       skills,
       target_roles: targetRoles,
     }
   );
-  return response.data;
+  let job = response.data;
+
+  // Generation runs in the background - poll until the questions are ready
+  const deadline = Date.now() + 90_000;
+  while (job.status === "pending" && job.poll_url) {
+    if (Date.now() > deadline) {
+      throw new Error("Quiz generation timed out");
+    }
+    await new Promise((resolve) => setTimeout(resolve, 1500));
+    const poll = await api.get<OnboardingQuizJob>(job.poll_url);
+    job = poll.data;
+  }
+
+  if (job.status === "error") {
+    throw new Error(job.detail || "Failed to generate quiz");
+  }
+  return { status: job.status, quiz_token: job.quiz_token ?? "", questions: job.questions ?? [] };
 }
 
 /**
- * Submit onboarding quiz answers
+ * Submit onboarding quiz answers (every question of the quiz, with its quiz_token)
  */
 export async function submitOnboardingQuiz(
+  quizToken: string,
   answers: QuizAnswer[]
 ): Promise<QuizSubmitResponse & { trigger_cold_start?: boolean }> {
   const response = await api.post<QuizSubmitResponse & { trigger_cold_start?: boolean }>(
     "/api/perception/onboarding/quiz/submit",
     {
+      quiz_token: quizToken,
       answers,
     }
   );
@@ -717,6 +746,21 @@ export async function triggerColdStart(): Promise<{
   return response.data;
 }
 
+export interface BootstrapResponse {
+  status: string;
+  onboarding: OnboardingStatusResponse;
+  dashboard: DashboardInsightsResponse | null;
+  profile: SettingsProfile | null;
+}
+
+/**
+ * Onboarding status, dashboard and profile in a single request (used after login)
+ */
+export async function getBootstrap(): Promise<BootstrapResponse> {
+  const response = await api.get<BootstrapResponse>("/api/perception/bootstrap");
+  return response.data;
+}
+
 /**
  * Get dashboard insights
  */
@@ -978,18 +1022,29 @@ export async function updateProfile(
 
 /**
  * Upload new primary resume (replaces existing)
+ *
+ * The PDF goes straight to Supabase Storage through a signed upload URL;
+ * the backend is only asked to process it afterwards.
  */
 export async function updatePrimaryResume(file: File): Promise<{
   status: string;
   message: string;
   resume_url: string;
 }> {
-  const formData = new FormData();
-  formData.append("file", file);
+  const { data: signed } = await api.post<{
+    signed_url: string;
+    token: string;
+    path: string;
+  }>("/api/perception/settings/resume/presign");
+
+  const { error } = await supabase.storage
+    .from("Resume")
+    .uploadToSignedUrl(signed.path, signed.token, file, {
+      contentType: "application/pdf",
+    });
+  if (error) throw error;
 
-  const response = await api.put("/api/perception/settings/resume", formData, {
-    headers: { "Content-Type": "multipart/form-data" },
-  });
+  const response = await api.post("/api/perception/settings/resume/uploaded");
   return response.data;
 }
 